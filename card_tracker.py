@@ -0,0 +1,366 @@
+from card_types import COLORS, RANKS, COLOR_INDEX, RANK_INDEX, TYPE_COLOR, TYPE_RANK, WILD_TYPE, CARD_TYPES
+
+
+
+class TableTracker:
+    '''
+    Counts what everyone at the table can see, for every CardTracker in the game to share: the cards outside the discard pile, and
+    what each player probably doesn't have, as the game goes.
+
+    It's the only listener the trackers add to the game state (see GameState.addListener), so every play, draw and pass is counted
+    once, in constant time, however many players track the game. A reshuffle puts the discard pile back into the counts, one card type
+    at a time, so nothing ever rescans the piles or hands. The only thing it tells a CardTracker is when the tracker's own hand
+    changes, which also takes constant time.
+
+    It also keeps what each player drawing instead of playing says about their hand: they had no card of the top color,
+    none of its rank, and no wild card. If they play the card they drew, that adds to what was known about them. If they keep it,
+    only the last pass still holds, since the kept card only had to miss that top card. Being forced to draw cards (which could be
+    anything) drops everything known about them, and a card they play that contradicts it (say a human kept a card they could
+    have played) drops just that part. Everyone sees the same passes, so everyone infers the same things.
+    '''
+    def __init__(self):
+        '''
+        Initializes a table tracker. CardTracker.attach makes one for a game, the first time a tracker is attached to it.
+        '''
+        self.trackers = [] # The CardTrackers reading these counts
+
+        self.undiscarded = [0] * CARD_TYPES # How many of each card type are outside the discard pile: in the draw pile or a hand
+        self.undiscardedByColor = [0] * len(COLORS) # Undiscarded colored cards of each color index
+        self.undiscardedByRank = [0] * len(RANKS) # Undiscarded colored cards of each rank index
+        self.totalUndiscarded = 0
+        self.version = 0 # Incremented every time the undiscarded counts change, so trackers know when to work out their unseen counts
+        self.discardCounts = [0] * CARD_TYPES # How many of each card type are in the discard pile, to undo on a reshuffle
+
+        # What the players probably don't have, from drawing instead of playing.
+        self.lacksColors = {} # Maps a player to the set of color indexes they probably don't have
+        self.lacksRanks = {} # Maps a player to the set of ranks they probably don't have
+        self.lacksWilds = set() # Players who probably don't have a wild card
+        self.lastPass = None # (player, color index, rank) of the last pass, until we know whether they kept the card they drew
+        self.keeping = None # The player who drew instead of playing, until they play the card or the next turn starts
+
+    def ownTracker(self, player):
+        '''
+        Returns the player's CardTracker if it reads this table's counts, or None.
+        '''
+        tracker = player.tracker
+        return tracker if tracker is not None and tracker.table is self else None
+
+    def addUndiscarded(self, cardType, count):
+        '''
+        Adds count (which can be negative) cards of a type to the undiscarded counts.
+        '''
+        self.undiscarded[cardType] += count
+        self.totalUndiscarded += count
+        if cardType < WILD_TYPE:
+            self.undiscardedByColor[TYPE_COLOR[cardType]] += count
+            self.undiscardedByRank[cardType % len(RANKS)] += count
+        self.version += 1
+
+    def settle(self):
+        '''
+        Called when the next thing happens after a player drew instead of playing, without them playing the drawn card.
+        They kept a card that only had to miss the top card they passed on, so only that pass still holds.
+        '''
+        player, color, rank = self.lastPass
+        self.keeping = None
+        self.lastPass = None
+        self.lacksColors[player] = {color} if color is not None else set()
+        self.lacksRanks[player] = {rank} if rank is not None else set()
+        self.lacksWilds.add(player)
+
+    def forget(self, player):
+        '''
+        Drops everything inferred about a player's hand.
+        '''
+        self.lacksColors.pop(player, None)
+        self.lacksRanks.pop(player, None)
+        self.lacksWilds.discard(player)
+
+    def onRoundStart(self, gameState):
+        '''
+        Starts counting a new round. Every card in the game is undiscarded, however many decks it was made from.
+        '''
+        self.undiscarded = [0] * CARD_TYPES
+        self.undiscardedByColor = [0] * len(COLORS)
+        self.undiscardedByRank = [0] * len(RANKS)
+        self.totalUndiscarded = 0
+        self.discardCounts = [0] * CARD_TYPES
+        self.lacksColors = {}
+        self.lacksRanks = {}
+        self.lacksWilds = set()
+        self.lastPass = None
+        self.keeping = None
+
+        cards = gameState.drawPile.cards + gameState.discardPile.cards
+        for player in gameState.players:
+            cards += player.hand.cards
+        for card in cards:
+            self.addUndiscarded(card.cardType, 1)
+
+        for tracker in self.trackers:
+            tracker.countHand()
+
+    def onTopCard(self, card):
+        '''
+        The first card of the discard pile was turned over.
+        '''
+        cardType = card.cardType
+        self.discardCounts[cardType] += 1
+        self.addUndiscarded(cardType, -1)
+
+    def onCardDrawn(self, player, card, forced):
+        '''
+        A player drew a card. Their tracker sees it, and a forced draw means the inferences about them are stale.
+        '''
+        tracker = self.ownTracker(player)
+        if tracker is not None:
+            tracker.addOwn(card.cardType, 1)
+
+        if self.keeping is not None:
+            keeping, lastPass = self.keeping, self.lastPass
+            self.settle()
+            if keeping is player and not forced:
+                # Drawing until they can play (the draw to match house rule): the card before this one was kept, and so on.
+                self.keeping, self.lastPass = keeping, lastPass
+                return
+
+        if forced:
+            self.forget(player)
+        elif self.lastPass is not None and self.lastPass[0] is player:
+            self.keeping = player # Whether they play it says whether their hand still matches everything known about it
+
+    def onCardPlayed(self, player, card):
+        '''
+        A player played a card. Everyone sees it, and it drops any inference it contradicts.
+        '''
+        cardType = card.cardType
+        self.discardCounts[cardType] += 1
+        self.addUndiscarded(cardType, -1)
+        tracker = self.ownTracker(player)
+        if tracker is not None:
+            tracker.addOwn(cardType, -1)
+
+        if self.keeping is player:
+            self.keeping = None # They played the card they drew, so their hand is the one they passed with
+            self.lastPass = None
+            return
+        if self.keeping is not None:
+            self.settle()
+
+        if cardType >= WILD_TYPE:
+            self.lacksWilds.discard(player)
+        else:
+            if player in self.lacksColors:
+                self.lacksColors[player].discard(TYPE_COLOR[cardType])
+            if player in self.lacksRanks:
+                self.lacksRanks[player].discard(TYPE_RANK[cardType])
+
+    def onPassed(self, player, topCard):
+        '''
+        A player drew instead of playing on the top card, so they probably have nothing of its color or rank, and no wild card.
+        '''
+        if self.keeping is not None:
+            self.settle()
+
+        color = COLOR_INDEX[topCard.color] if topCard.color is not None else None
+        rank = topCard.rank if topCard.action != "Wild" and topCard.action != "Wild Draw Four" else None
+        if color is not None:
+            self.lacksColors.setdefault(player, set()).add(color)
+        if rank is not None:
+            self.lacksRanks.setdefault(player, set()).add(rank)
+        self.lacksWilds.add(player)
+        self.lastPass = (player, color, rank)
+
+    def onReshuffle(self, topCard):
+        '''
+        The discard pile, except the top card, was shuffled into the draw pile, so those cards are undiscarded again.
+        '''
+        topType = topCard.cardType
+        self.discardCounts[topType] -= 1
+        for cardType in range(CARD_TYPES):
+            count = self.discardCounts[cardType]
+            if count:
+                self.addUndiscarded(cardType, count)
+        self.discardCounts = [0] * CARD_TYPES
+        self.discardCounts[topType] = 1
+
+    def onHandsMoved(self, order):
+        '''
+        Hands moved between players (the 7-0 house rule): each player in order got the hand of the player before them.
+        What was known about a hand goes with it, and the trackers of the players whose hands moved count their new hand.
+        '''
+        if self.keeping is not None:
+            self.settle()
+
+        known = [(self.lacksColors.pop(player, None), self.lacksRanks.pop(player, None), player in self.lacksWilds) for player in order]
+        for player in order:
+            self.lacksWilds.discard(player)
+        for index, player in enumerate(order):
+            lacksColors, lacksRanks, lacksWilds = known[index - 1]
+            if lacksColors is not None:
+                self.lacksColors[player] = lacksColors
+            if lacksRanks is not None:
+                self.lacksRanks[player] = lacksRanks
+            if lacksWilds:
+                self.lacksWilds.add(player)
+
+            tracker = self.ownTracker(player)
+            if tracker is not None:
+                tracker.countHand()
+
+
+
+class CardTracker:
+    '''
+    Counts the cards one player (the observer) hasn't seen yet, and what the other players probably don't have, as the game goes.
+
+    Unseen cards are the ones in the draw pile and the other players' hands: every card in the game, minus the observer's own hand
+    and the discard pile. Everything but the observer's own hand is public, so it's counted once for the whole table by a shared
+    TableTracker, and the tracker itself only counts its own hand. Every play, draw and pass updates the table once, and only the
+    tracker of the player it happened to, so a game costs the same per turn however many players track it.
+    '''
+    def __init__(self, observer):
+        '''
+        Initializes a tracker for a player, and sets it as their .tracker.
+
+        :param observer: Player or ComputerPlayer object - The player whose view of the game is tracked.
+        '''
+        self.observer = observer
+        observer.tracker = self
+        self.table = None # The TableTracker counting the public cards, once attached
+
+        self.own = [0] * CARD_TYPES # How many of each card type are in the observer's hand
+        self.ownByColor = [0] * len(COLORS)
+        self.ownByRank = [0] * len(RANKS)
+        self.ownTotal = 0
+        self.version = 0 # Incremented every time the observer's hand counts change
+
+        self.unseenCache = [0] * CARD_TYPES
+        self.unseenKey = None # The (table version, our version) unseenCache was worked out at
+
+    def attach(self, gameState):
+        '''
+        Starts following a game state, through the game's TableTracker (made and added as a listener if it has none yet).
+        The tracker catches up at the next round's deal.
+
+        :param gameState: GameState object - The game state to follow.
+        '''
+        for listener in gameState.listeners:
+            if isinstance(listener, TableTracker):
+                table = listener
+                break
+        else:
+            table = TableTracker()
+            gameState.addListener(table)
+        self.table = table
+        table.trackers.append(self)
+
+    def addOwn(self, cardType, count):
+        '''
+        Adds count (which can be negative) cards of a type to the observer's hand counts.
+        '''
+        self.own[cardType] += count
+        self.ownTotal += count
+        if cardType < WILD_TYPE:
+            self.ownByColor[TYPE_COLOR[cardType]] += count
+            self.ownByRank[cardType % len(RANKS)] += count
+        self.version += 1
+
+    def countHand(self):
+        '''
+        Counts the observer's hand from scratch, at the deal and when hands move.
+        '''
+        self.own = [0] * CARD_TYPES
+        self.ownByColor = [0] * len(COLORS)
+        self.ownByRank = [0] * len(RANKS)
+        self.ownTotal = 0
+        for card in self.observer.hand.cards:
+            self.addOwn(card.cardType, 1)
+
+    @property
+    def unseen(self):
+        '''
+        Returns how many of each card type the observer hasn't seen, as a list indexed by card type. Don't change it.
+        '''
+        key = (self.table.version, self.version)
+        if key != self.unseenKey:
+            self.unseenCache = [undiscarded - own for undiscarded, own in zip(self.table.undiscarded, self.own)]
+            self.unseenKey = key
+        return self.unseenCache
+
+    @property
+    def totalUnseen(self):
+        '''
+        Returns how many cards the observer hasn't seen.
+        '''
+        return self.table.totalUndiscarded - self.ownTotal
+
+    @property
+    def lacksColors(self):
+        '''
+        Returns the map of each player to the set of color indexes they probably don't have.
+        '''
+        return self.table.lacksColors
+
+    @property
+    def lacksRanks(self):
+        '''
+        Returns the map of each player to the set of ranks they probably don't have.
+        '''
+        return self.table.lacksRanks
+
+    @property
+    def lacksWilds(self):
+        '''
+        Returns the set of players who probably don't have a wild card.
+        '''
+        return self.table.lacksWilds
+
+    def unseenOfType(self, cardType):
+        '''
+        Returns how many cards of a card type (see card_types) the observer hasn't seen.
+        '''
+        return self.table.undiscarded[cardType] - self.own[cardType]
+
+    def unseenOfColor(self, color):
+        '''
+        Returns how many colored cards of a color ("Red", ...) the observer hasn't seen. Wild cards have no color, so they aren't counted.
+        '''
+        color = COLOR_INDEX[color]
+        return self.table.undiscardedByColor[color] - self.ownByColor[color]
+
+    def unseenOfRank(self, rank):
+        '''
+        Returns how many cards of a rank (0 to 9, "Skip", "Reverse", "Draw Two", "Wild" or "Wild Draw Four") the observer hasn't seen.
+        '''
+        if rank == "Wild" or rank == "Wild Draw Four":
+            return self.unseenOfType(WILD_TYPE if rank == "Wild" else WILD_TYPE + 1)
+        rank = RANK_INDEX[rank]
+        return self.table.undiscardedByRank[rank] - self.ownByRank[rank]
+
+    def mayHoldColor(self, player, color):
+        '''
+        Returns False if a player probably has no cards of a color ("Red", ...), and True if they might.
+        '''
+        return COLOR_INDEX[color] not in self.table.lacksColors.get(player, ())
+
+    def mayHoldRank(self, player, rank):
+        '''
+        Returns False if a player probably has no cards of a rank, and True if they might.
+        '''
+        return rank not in self.table.lacksRanks.get(player, ())
+
+    def mayHoldWild(self, player):
+        '''
+        Returns False if a player probably has no wild cards, and True if they might.
+        '''
+        return player not in self.table.lacksWilds
+
+    def mayHold(self, player, cardType):
+        '''
+        Returns False if a player probably has no cards of a card type, and True if they might.
+        '''
+        if cardType >= WILD_TYPE:
+            return player not in self.table.lacksWilds
+        return (TYPE_COLOR[cardType] not in self.table.lacksColors.get(player, ())
+                and TYPE_RANK[cardType] not in self.table.lacksRanks.get(player, ()))
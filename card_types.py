@@ -0,0 +1,50 @@
+# Every card is one of 54 card types: the 13 ranks in each of the 4 colors, then the two wild cards.
+# Two cards of the same type are interchangeable, so code that reasons about cards (bots, solvers, encodings) works with types.
+
+COLORS = ["Red", "Yellow", "Blue", "Green"]
+RANKS = list(range(10)) + ["Skip", "Reverse", "Draw Two"] # Every rank a colored card can have
+WILDS = ["Wild", "Wild Draw Four"]
+
+COLOR_INDEX = {color: index for index, color in enumerate(COLORS)}
+RANK_INDEX = {rank: index for index, rank in enumerate(RANKS)}
+WILD_TYPE = len(COLORS) * len(RANKS) # 52
+WILD_DRAW_FOUR_TYPE = WILD_TYPE + 1 # 53
+CARD_TYPES = WILD_TYPE + len(WILDS) # 54
+
+# The color index (None for wild cards), rank, and points of each card type.
+TYPE_COLOR = [index // len(RANKS) for index in range(WILD_TYPE)] + [None, None]
+TYPE_RANK = [RANKS[index % len(RANKS)] for index in range(WILD_TYPE)] + WILDS
+TYPE_POINTS = [rank if isinstance(rank, int) else 20 for rank in TYPE_RANK[:WILD_TYPE]] + [50, 50]
+
+# How many cards of each type a deck has: one 0 and two of every other rank in each color, and four of each wild card.
+DECK_COUNTS = [1 if TYPE_RANK[index] == 0 else 2 for index in range(WILD_TYPE)] + [4, 4]
+
+
+
+def card_type(card):
+    '''
+    Returns the card type (0 to 53) of a card.
+
+    Parameters:
+        card (Card): The card.
+    '''
+    if card.action == "Wild":
+        return WILD_TYPE
+    if card.action == "Wild Draw Four":
+        return WILD_DRAW_FOUR_TYPE
+    return COLOR_INDEX[card.color] * len(RANKS) + RANK_INDEX[card.rank]
+
+
+
+def is_playable(cardType, topType, topColor):
+    '''
+    Returns whether a card type can be played on a top card, by the same rules as GameState.isCardPlayable.
+
+    Parameters:
+        cardType (int): The card type to play.
+        topType (int): The top card's type.
+        topColor (int): The top card's color index (the declared color, for wild cards), or None.
+    '''
+    if cardType >= WILD_TYPE:
+        return True
+    return TYPE_COLOR[cardType] == topColor or TYPE_RANK[cardType] == TYPE_RANK[topType]
@@ -0,0 +1,304 @@
+from card_types import (COLORS, TYPE_COLOR, TYPE_RANK, WILD_TYPE, WILD_DRAW_FOUR_TYPE, CARD_TYPES, DECK_COUNTS,
+                        card_type, is_playable)
+
+ENDGAME_HAND_SIZE = 3 # The solver takes over once every hand has this many cards or fewer
+ENDGAME_SAMPLES = 6 # How many ways of dealing the unseen cards to the opponents each decision is averaged over
+ENDGAME_MAX_DEPTH = 12 # The deepest the solver searches, in turns
+ENDGAME_NODE_LIMIT = 1500 # Positions the solver may search for a move (about a tenth of a second). It answers with the deepest search it finished
+ENDGAME_MEMO_SIZE = 200000 # Memo entries kept before the memo is cleared
+BLANK = -1 # A card drawn during the search. Its type isn't known, so the search never plays it
+
+
+
+class SearchTimeout(Exception):
+    '''
+    Raised inside the search when it has searched as many positions as it may.
+    '''
+
+
+
+class EndgameSolver:
+    '''
+    Chooses computer players' moves once every hand is small, by searching the rest of the round instead of guessing.
+
+    A computer player can't see the other hands, so each decision deals the unseen cards (the deck, minus its own hand and the discard pile)
+    into the opponents' hands several ways, searches each deal, and picks the move that wins most often on average.
+    The search is expectimax: every player picks the move that gives them the best chance of winning, and draws are chance nodes.
+    A drawn card is played straight away if it can be (like computer players do), and otherwise becomes a BLANK the search won't play.
+    Searches deepen one turn at a time until ENDGAME_NODE_LIMIT positions have been searched, and positions are memoized, so each
+    deeper search and each deal reuses what the others worked out. The memo starts empty every decision, and the limit counts positions
+    instead of seconds, so a decision depends only on the game and the player's rng, and a seeded game replays exactly.
+
+    Set GameState.endgameSolver to a solver to have every ComputerPlayer in the game use it.
+    '''
+    def __init__(self, handSize=ENDGAME_HAND_SIZE, samples=ENDGAME_SAMPLES, maxDepth=ENDGAME_MAX_DEPTH,
+                 nodeLimit=ENDGAME_NODE_LIMIT, memoSize=ENDGAME_MEMO_SIZE):
+        '''
+        Initializes an endgame solver.
+
+        :param handSize: int - The solver takes over once every hand has this many cards or fewer.
+        :param samples: int - How many deals of the unseen cards each decision is averaged over.
+        :param maxDepth: int - The deepest the solver searches, in turns.
+        :param nodeLimit: int - Positions the solver may search for a move.
+        :param memoSize: int - Memo entries kept before the memo is cleared.
+        '''
+        self.handSize = handSize
+        self.samples = samples
+        self.maxDepth = maxDepth
+        self.nodeLimit = nodeLimit
+        self.memoSize = memoSize
+
+        self.memo = {} # Maps a canonical endgame state to (depth searched, win chance of each seat)
+        self.pileIds = {} # Maps draw pile card counts to a small number, so memo keys don't hold the whole pile
+        self.nextPileId = 0 # Never reused, so clearing pileIds can't make two piles share an id
+        self.hits = 0 # How many positions came from the memo
+        self.nodes = 0 # How many positions were searched
+        self.nodeBudget = 0 # The node count at which the current decision stops searching
+
+    def applies(self, gameState):
+        '''
+        Returns whether the game is in an endgame the solver should take over.
+
+        :param gameState: GameState object - The current game state.
+        '''
+        if not gameState.rules.isDefault:
+            return False # The search plays by the standard rules
+        return all(len(player.hand.cards) <= self.handSize for player in gameState.players)
+
+    def chooseMove(self, gameState, player, playableCards):
+        '''
+        Returns the (card, color) move the solver picks for a player, like ComputerPlayer.chooseMove.
+
+        :param gameState: GameState object - The current game state. It must be the player's turn.
+        :param player: ComputerPlayer object - The player choosing a move.
+        :param playableCards: list - The cards in the player's hand that can be played.
+        '''
+        hand = [card_type(card) for card in player.hand.cards]
+        moves = self.rootMoves(hand, [card_type(card) for card in playableCards])
+        if len(moves) == 1:
+            return self.moveCard(player, playableCards, moves[0])
+
+        # Nothing is kept from earlier decisions (or games), which would make this one depend on what came before.
+        self.memo.clear()
+        self.pileIds.clear()
+
+        seat = gameState.currentPlayerIndex
+        deals = self.deal(gameState, seat, hand, player.rng)
+
+        self.nodeBudget = self.nodes + self.nodeLimit
+        bestMove = moves[0]
+        for depth in range(1, self.maxDepth + 1):
+            try:
+                totals = [0.0] * len(moves)
+                for hands, pileId, pile in deals:
+                    for index, (moveType, color) in enumerate(moves):
+                        value = self.play(hands, seat, moveType, color, gameState.direction, depth, pileId, pile)
+                        totals[index] += value[seat]
+            except SearchTimeout:
+                break # The last depth we finished is the best answer we have
+            bestMove = moves[max(range(len(moves)), key=totals.__getitem__)]
+
+        return self.moveCard(player, playableCards, bestMove)
+
+    def rootMoves(self, hand, playableTypes):
+        '''
+        Returns the distinct (card type, color index) moves a hand can make from its playable card types.
+        '''
+        moves = []
+        for cardType in sorted(set(playableTypes)):
+            if cardType >= WILD_TYPE:
+                rest = list(hand)
+                rest.remove(cardType)
+                moves += [(cardType, color) for color in self.wildColors(rest)]
+            else:
+                moves.append((cardType, None))
+        return moves
+
+    def moveCard(self, player, playableCards, move):
+        '''
+        Turns a (card type, color index) move back into a (card, color name) move for the game.
+        '''
+        moveType, color = move
+        for card in playableCards:
+            if card_type(card) == moveType:
+                return card, (COLORS[color] if color is not None else None)
+
+    def deal(self, gameState, seat, hand, rng):
+        '''
+        Returns ENDGAME_SAMPLES deals of the unseen cards, as (hands by seat, pile id, pile counts).
+
+        Unseen cards are the decks, minus the player's own hand and the discard pile. Each deal gives every opponent as many of them
+        as they hold, and the rest make up the draw pile. If the player has a CardTracker, its counts are used instead of scanning the
+        discard pile, and opponents are dealt cards they might hold (by what their passes gave away) before any others.
+        The unseen cards are shuffled with rng, the player's source of random choices.
+        '''
+        tracker = gameState.players[seat].tracker
+        if tracker is not None:
+            unseen = tracker.unseen
+        else:
+            decks = gameState.cardCount // sum(DECK_COUNTS) # Big tables play with several decks
+            unseen = [count * decks for count in DECK_COUNTS]
+            for cardType in hand:
+                unseen[cardType] -= 1
+            for card in gameState.discardPile.cards:
+                unseen[card_type(card)] -= 1
+        unseenCards = [cardType for cardType in range(CARD_TYPES) for _ in range(max(0, unseen[cardType]))]
+
+        deals = []
+        for _ in range(self.samples):
+            rng.shuffle(unseenCards)
+            hands = []
+            rest = unseenCards
+            for otherSeat, otherPlayer in enumerate(gameState.players):
+                if otherSeat == seat:
+                    hands.append(tuple(sorted(hand)))
+                    continue
+
+                size = len(otherPlayer.hand.cards)
+                if tracker is None:
+                    dealtCards, rest = rest[:size], rest[size:]
+                else:
+                    dealtCards, others = [], []
+                    for cardType in rest:
+                        if len(dealtCards) < size and tracker.mayHold(otherPlayer, cardType):
+                            dealtCards.append(cardType)
+                        else:
+                            others.append(cardType)
+                    missing = size - len(dealtCards)
+                    dealtCards += others[:missing] # Not enough cards they might hold, so they must hold some they probably don't
+                    rest = others[missing:]
+                hands.append(tuple(sorted(dealtCards)))
+
+            pile = [0] * CARD_TYPES
+            for cardType in rest:
+                pile[cardType] += 1
+            pile = tuple(pile)
+            pileId = self.pileIds.get(pile)
+            if pileId is None:
+                pileId = self.pileIds[pile] = self.nextPileId
+                self.nextPileId += 1
+            deals.append((tuple(hands), pileId, pile))
+        return deals
+
+    def wildColors(self, hand):
+        '''
+        Returns the color indexes worth choosing for a wild card: the colors left in the hand, or every color if there are none.
+        '''
+        colors = sorted(set(TYPE_COLOR[cardType] for cardType in hand if cardType != BLANK and cardType < WILD_TYPE))
+        return colors if colors else list(range(len(COLORS)))
+
+    def leafValue(self, hands):
+        '''
+        Returns each seat's estimated win chance when the search stops early: the fewer cards a hand has, the better its chances.
+        '''
+        weights = [1.0 / (len(hand) * len(hand)) for hand in hands]
+        total = sum(weights)
+        return tuple(weight / total for weight in weights)
+
+    def search(self, hands, mover, topType, topColor, direction, depth, pileId, pile):
+        '''
+        Returns each seat's win chance from a position, with mover about to take their turn.
+        '''
+        if depth <= 0:
+            return self.leafValue(hands)
+
+        key = (hands, mover, topType, topColor, direction, pileId)
+        entry = self.memo.get(key)
+        if entry is not None and entry[0] >= depth:
+            self.hits += 1
+            return entry[1]
+
+        self.nodes += 1
+        if self.nodes >= self.nodeBudget:
+            raise SearchTimeout()
+
+        hand = hands[mover]
+        playable = sorted(set(cardType for cardType in hand if cardType != BLANK and is_playable(cardType, topType, topColor)))
+
+        if playable:
+            best = None
+            for cardType in playable:
+                for color in self.moveColors(hand, cardType):
+                    value = self.play(hands, mover, cardType, color, direction, depth, pileId, pile)
+                    if best is None or value[mover] > best[mover]:
+                        best = value
+        else:
+            best = self.draw(hands, mover, topType, topColor, direction, depth, pileId, pile)
+
+        if len(self.memo) >= self.memoSize:
+            self.memo.clear()
+            self.pileIds.clear()
+        self.memo[key] = (depth, best)
+        return best
+
+    def moveColors(self, hand, cardType):
+        '''
+        Returns the color indexes to try when playing a card type from a hand: just None for colored cards.
+        '''
+        if cardType < WILD_TYPE:
+            return [None]
+        rest = list(hand)
+        rest.remove(cardType)
+        return self.wildColors(rest)
+
+    def draw(self, hands, mover, topType, topColor, direction, depth, pileId, pile):
+        '''
+        Returns each seat's win chance when mover has nothing to play and draws: the chance of each playable card (which is
+        played straight away), plus the chance of an unplayable one (a BLANK), after which play moves on.
+        '''
+        total = sum(pile)
+        nextSeat = (mover + direction) % len(hands)
+        if total == 0:
+            return self.search(hands, nextSeat, topType, topColor, direction, depth - 1, pileId, pile) # Nothing to draw
+
+        expected = [0.0] * len(hands)
+        unplayable = total
+        for cardType in range(CARD_TYPES):
+            count = pile[cardType]
+            if count == 0 or not is_playable(cardType, topType, topColor):
+                continue
+            unplayable -= count
+
+            drawnHands = hands[:mover] + (tuple(sorted(hands[mover] + (cardType,))),) + hands[mover + 1:]
+            best = None
+            for color in self.moveColors(drawnHands[mover], cardType):
+                value = self.play(drawnHands, mover, cardType, color, direction, depth, pileId, pile)
+                if best is None or value[mover] > best[mover]:
+                    best = value
+            for index in range(len(hands)):
+                expected[index] += best[index] * count / total
+
+        if unplayable > 0:
+            blankHands = hands[:mover] + ((BLANK,) + hands[mover],) + hands[mover + 1:]
+            value = self.search(blankHands, nextSeat, topType, topColor, direction, depth - 1, pileId, pile)
+            for index in range(len(hands)):
+                expected[index] += value[index] * unplayable / total
+
+        return tuple(expected)
+
+    def play(self, hands, mover, cardType, color, direction, depth, pileId, pile):
+        '''
+        Returns each seat's win chance after mover plays a card type (as color, for wild cards), applying its action like GameState.playCard.
+        '''
+        numPlayers = len(hands)
+        hand = list(hands[mover])
+        hand.remove(cardType)
+        if not hand:
+            return tuple(1.0 if index == mover else 0.0 for index in range(numPlayers)) # Mover won the round
+
+        hands = hands[:mover] + (tuple(hand),) + hands[mover + 1:]
+        topColor = color if cardType >= WILD_TYPE else TYPE_COLOR[cardType]
+        rank = TYPE_RANK[cardType]
+        nextSeat = (mover + direction) % numPlayers
+
+        if rank == "Skip":
+            nextSeat = (mover + 2 * direction) % numPlayers
+        elif rank == "Reverse":
+            direction = -direction
+            nextSeat = mover if numPlayers == 2 else (mover + direction) % numPlayers
+        elif rank == "Draw Two" or cardType == WILD_DRAW_FOUR_TYPE:
+            drawn = (BLANK, BLANK) if rank == "Draw Two" else (BLANK, BLANK, BLANK, BLANK)
+            hands = hands[:nextSeat] + (drawn + hands[nextSeat],) + hands[nextSeat + 1:]
+            nextSeat = (mover + 2 * direction) % numPlayers
+
+        return self.search(hands, nextSeat, cardType, topColor, direction, depth - 1, pileId, pile)
@@ -0,0 +1,230 @@
+import multiprocessing
+import threading
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import uno_env as ue
+
+# Commands the trainer gives the workers, through the shared command buffer.
+STEP = 0 # Step every environment with the actions in the shared action buffer
+RESET = 1 # Reset every environment, seeding each worker from the shared seed if it isn't -1
+CLOSE = 2 # Stop the worker
+
+WORKER_TIMEOUT = 60.0 # Seconds to wait at a barrier before deciding a worker (or the trainer) has died
+
+
+
+def buffer_specs(numEnvs):
+    '''
+    Returns the (name, shape, dtype) of every shared buffer, for numEnvs environments in total.
+
+    Parameters:
+        numEnvs (int): How many environments there are over all the workers.
+    '''
+    return [
+        ("observations", (numEnvs, ue.OBSERVATION_SIZE), np.float32),
+        ("actionMasks", (numEnvs, ue.NUM_ACTIONS), np.bool_),
+        ("rewards", (numEnvs,), np.float32),
+        ("terminated", (numEnvs,), np.bool_),
+        ("truncated", (numEnvs,), np.bool_),
+        ("actions", (numEnvs,), np.int64),
+        ("command", (2,), np.int64), # The command, and the seed for RESET
+    ]
+
+
+
+def attach_buffers(memoryNames, numEnvs):
+    '''
+    Attaches to the shared buffers made by SharedVectorEnv, and returns (memories, arrays) dictionaries keyed by buffer name.
+
+    Parameters:
+        memoryNames (dict): The name of each buffer's shared memory block, keyed by buffer name.
+        numEnvs (int): How many environments there are over all the workers.
+    '''
+    memories = {}
+    arrays = {}
+    for name, shape, dtype in buffer_specs(numEnvs):
+        memories[name] = shared_memory.SharedMemory(name=memoryNames[name])
+        arrays[name] = np.ndarray(shape, dtype=dtype, buffer=memories[name].buf)
+    return memories, arrays
+
+
+
+def run_worker(workerIndex, memoryNames, numEnvs, start, stop, numPlayers, startBarrier, doneBarrier):
+    '''
+    Runs a worker process. It owns the environments from start to stop, and steps them every time the trainer passes the start barrier.
+
+    Observations, masks, rewards and done flags are written straight into the worker's rows of the shared buffers,
+    and actions are read straight out of them, so nothing is pickled per step.
+
+    Parameters:
+        workerIndex (int): Which worker this is, used to give each worker its own seed.
+        memoryNames (dict): The name of each buffer's shared memory block, keyed by buffer name.
+        numEnvs (int): How many environments there are over all the workers.
+        start (int): The first environment this worker owns.
+        stop (int): One past the last environment this worker owns.
+        numPlayers (int): How many players each environment has, including the agent.
+        startBarrier (multiprocessing.Barrier): Passed once the trainer has given a command.
+        doneBarrier (multiprocessing.Barrier): Passed once every worker has carried the command out.
+    '''
+    memories, arrays = attach_buffers(memoryNames, numEnvs)
+    try:
+        vectorEnv = ue.UnoVectorEnv(
+            stop - start, numPlayers,
+            observations=arrays["observations"][start:stop],
+            actionMasks=arrays["actionMasks"][start:stop],
+            rewards=arrays["rewards"][start:stop],
+            terminated=arrays["terminated"][start:stop],
+            truncated=arrays["truncated"][start:stop],
+        )
+        actions = arrays["actions"][start:stop]
+        command = arrays["command"]
+
+        while True:
+            startBarrier.wait(WORKER_TIMEOUT)
+            if command[0] == CLOSE:
+                return
+
+            try:
+                if command[0] == RESET:
+                    if command[1] != -1:
+                        vectorEnv.reset(int(command[1]) * 1000003 + workerIndex) # Every worker gets its own random stream and shuffles
+                    else:
+                        vectorEnv.reset()
+                else:
+                    vectorEnv.step(actions)
+            except BaseException:
+                doneBarrier.abort() # The trainer would otherwise wait for us forever
+                raise
+
+            doneBarrier.wait(WORKER_TIMEOUT)
+    except threading.BrokenBarrierError:
+        return # The trainer went away, or another worker failed
+    finally:
+        for memory in memories.values():
+            memory.close()
+
+
+
+class SharedVectorEnv:
+    '''
+    Steps environments spread over worker processes, through shared memory instead of pipes.
+
+    Each worker owns a slice of the environments, as its own UnoVectorEnv, and writes into that slice of the shared buffers.
+    A step is the trainer writing actions into the shared action buffer and passing the start barrier,
+    then every worker stepping its slice and passing the done barrier. Nothing is pickled after the workers start.
+
+    Like UnoVectorEnv, the same buffers are returned every step, so copy anything you want to keep past the next step.
+    Call .close when done (or use it in a with statement), so the workers stop and the shared memory is freed.
+    '''
+    def __init__(self, numWorkers, envsPerWorker, numPlayers=4, context=None):
+        '''
+        Initializes the shared buffers, and starts the workers.
+
+        :param numWorkers: int - How many worker processes to start.
+        :param envsPerWorker: int - How many environments each worker owns.
+        :param numPlayers: int - How many players each environment has, including the agent.
+        :param context: multiprocessing context - The context to start workers with. multiprocessing's default if None.
+        '''
+        context = multiprocessing.get_context() if context is None else context
+        self.numEnvs = numWorkers * envsPerWorker
+        self.closed = False
+
+        self.memories = {}
+        arrays = {}
+        for name, shape, dtype in buffer_specs(self.numEnvs):
+            size = max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+            self.memories[name] = shared_memory.SharedMemory(create=True, size=size)
+            arrays[name] = np.ndarray(shape, dtype=dtype, buffer=self.memories[name].buf)
+            arrays[name].fill(0)
+
+        self.observations = arrays["observations"]
+        self.actionMasks = arrays["actionMasks"]
+        self.rewards = arrays["rewards"]
+        self.terminated = arrays["terminated"]
+        self.truncated = arrays["truncated"]
+        self.actions = arrays["actions"]
+        self.command = arrays["command"]
+
+        # Every worker and the trainer meet at each barrier, twice a step.
+        self.startBarrier = context.Barrier(numWorkers + 1)
+        self.doneBarrier = context.Barrier(numWorkers + 1)
+
+        memoryNames = {name: memory.name for name, memory in self.memories.items()}
+        self.workers = []
+        for workerIndex in range(numWorkers):
+            start = workerIndex * envsPerWorker
+            args = (workerIndex, memoryNames, self.numEnvs, start, start + envsPerWorker, numPlayers, self.startBarrier, self.doneBarrier)
+            worker = context.Process(target=run_worker, args=args, name=f"uno-env-worker-{workerIndex}", daemon=True)
+            worker.start()
+            self.workers.append(worker)
+
+    def run(self, command, seed=-1):
+        '''
+        Gives every worker a command, and waits for all of them to carry it out.
+        '''
+        if self.closed:
+            raise RuntimeError("The environment is closed.")
+
+        self.command[0] = command
+        self.command[1] = seed
+        try:
+            self.startBarrier.wait(WORKER_TIMEOUT)
+            self.doneBarrier.wait(WORKER_TIMEOUT)
+        except threading.BrokenBarrierError:
+            self.close()
+            raise RuntimeError("An environment worker failed or stopped responding.") from None
+
+    def reset(self, seed=None):
+        '''
+        Resets every environment, and returns the observations.
+
+        :param seed: int - Seeds every worker's random module and shuffles (differently for each worker) first, if given.
+        '''
+        self.run(RESET, -1 if seed is None else seed)
+        return self.observations
+
+    def step(self, actions):
+        '''
+        Steps every environment with its action. Returns (observations, rewards, terminated, truncated), and the masks are in .actionMasks.
+
+        :param actions: sequence of int - One action per environment, each allowed by its row of .actionMasks.
+        '''
+        self.actions[:] = actions
+        self.run(STEP)
+        return self.observations, self.rewards, self.terminated, self.truncated
+
+    def close(self):
+        '''
+        Stops the workers, and frees the shared memory.
+        '''
+        if self.closed:
+            return
+        self.closed = True
+
+        if not self.startBarrier.broken:
+            self.command[0] = CLOSE
+            try:
+                self.startBarrier.wait(WORKER_TIMEOUT)
+            except threading.BrokenBarrierError:
+                pass
+        self.startBarrier.abort()
+        self.doneBarrier.abort()
+
+        for worker in self.workers:
+            worker.join(WORKER_TIMEOUT)
+            if worker.is_alive():
+                worker.terminate()
+
+        # The arrays are views of the shared memory, so they have to go before it can be closed.
+        self.observations = self.actionMasks = self.rewards = self.terminated = self.truncated = self.actions = self.command = None
+        for memory in self.memories.values():
+            memory.close()
+            memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,4 +1,13 @@
+import math
+import random
+
 import objects as obj
+import card_tracker as ct
+import endgame as eg
+import probability_oracle as po
+
+CARDS_PER_DECK = 108
+MAX_DEALT_SHARE = 0.7 # The most of the deck the first deal can use up, so there's still a draw pile to play from
 
 def game_loop(gameState):
     '''
@@ -6,21 +15,32 @@ def game_loop(gameState):
 
     Initializes the game state, sets up rounds, handles play, and scores rounds.
     Continues looping through rounds until a player wins the game.
+    If the game state has a results store, the game and each of its rounds are recorded in it.
     '''
+    if gameState.resultsStore is not None:
+        gameState.resultsStore.startGame(gameState)
+
     while not gameState.hasWinner: # Create game loop that runs until there is a winner
         setup_round(gameState)
         play_round(gameState)
         score_round(gameState)
         gameState.checkWinner() # Checks for winner and sets hasWinner to True if one is found
         gameState.nextRound() # Proceeds to next round if there is no winner
+
+    if gameState.resultsStore is not None:
+        gameState.resultsStore.finishGame(gameState) # Only queued here, so the popup doesn't wait on the disk
     
     gameState.userInterface.pygameWrapper.textPopUp([f"{gameState.gameWinner.name} has won the game in {gameState.round} rounds!"])
 
 
 
-def create_deck():
+def create_deck(numDecks=1):
     '''
     Creates an UNO deck by initializing each Card with a color, rank, and/ or action.
+    Big tables shuffle several decks together, so there's a deck's worth of every card for each of them.
+
+    Parameters:
+        numDecks (int): How many 108 card decks to make.
     '''
     colors = ["Blue", "Green", "Red", "Yellow"]
     ranks = list(range(10))
@@ -29,39 +49,88 @@ def create_deck():
 
     deck = []
 
-    for color in colors:
-        deck.append(obj.Card(color, 0)) # Creates a single 0 card for each color
-        for rank in ranks[1:]:
-            deck.append(obj.Card(color, rank)) # Creates two copies of each rank for each color
-            deck.append(obj.Card(color, rank))
-    
-    for color in colors:
-        for action in actions:
-            deck.append(obj.Card(color, action, action)) # Creates two copies of each action for each color
-            deck.append(obj.Card(color, action, action))
-    
-    for wild in wilds:
-        for _ in range(4):
-            deck.append(obj.Card(None, wild, wild)) # Creates four copies of each wild action
+    for _ in range(numDecks):
+        for color in colors:
+            deck.append(obj.Card(color, 0)) # Creates a single 0 card for each color
+            for rank in ranks[1:]:
+                deck.append(obj.Card(color, rank)) # Creates two copies of each rank for each color
+                deck.append(obj.Card(color, rank))
+        
+        for color in colors:
+            for action in actions:
+                deck.append(obj.Card(color, action, action)) # Creates two copies of each action for each color
+                deck.append(obj.Card(color, action, action))
+        
+        for wild in wilds:
+            for _ in range(4):
+                deck.append(obj.Card(None, wild, wild)) # Creates four copies of each wild action
     
     return deck
 
 
 
+def decks_needed(numPlayers):
+    '''
+    Returns how many decks a table needs, so dealing every player a hand leaves a draw pile to play from.
+    One deck is enough for up to 10 players, like the rules say.
+
+    Parameters:
+        numPlayers (int): How many players are at the table.
+    '''
+    return max(1, math.ceil(numPlayers * obj.HAND_SIZE / (CARDS_PER_DECK * MAX_DEALT_SHARE)))
+
+
+
+def seed_game(gameState, seed=None):
+    '''
+    Seeds the shuffles (and computer players' choices) of a game, and keeps the seed in gameState.seed, so its results say how to replay it.
+
+    Parameters:
+        gameState (GameState): The game, before its first round.
+        seed (int): The seed, or None to pick one at random.
+    '''
+    if seed is None:
+        seed = random.randrange(2**32)
+    random.seed(seed)
+    gameState.seed = seed
+
+
+
+def equip_computers(gameState):
+    '''
+    Has a game's computer players count the cards they've seen and play by the odds, and search out endgames once every hand
+    is down to a few cards: the game gets an endgame solver and a probability oracle, and every computer player a card tracker.
+
+    Parameters:
+        gameState (GameState): The game, once its players are seated.
+    '''
+    computers = [player for player in gameState.players if type(player) is obj.ComputerPlayer]
+    if not computers:
+        return
+    gameState.endgameSolver = eg.EndgameSolver()
+    gameState.probabilityOracle = po.ProbabilityOracle()
+    for player in computers:
+        ct.CardTracker(player).attach(gameState)
+
+
+
 def setup_round(gameState):
     '''
     Sets up a new round in the game.
 
-    Shuffles the draw pile, assigns the dealer, deals cards to players, and sets the top card on the discard pile.
+    Shuffles the draw pile, deals cards to players, and sets the top card on the discard pile.
 
     Parameters:
         gameState (GameState): The current game state object.
     '''
+    if gameState.dealSeed is not None:
+        gameState.drawPile.replayDeal(gameState.dealSeed, gameState.round) # The same deck order as every other game with this seed
     gameState.drawPile.shuffleInitial()
     # gameState.setDealer() Excluding this function since we choose the dealer manually in the application
-    gameState.drawPile.shuffleInitial()
+    # Without setDealer putting cards back, shuffling a second time here would only cost time, so the deck is shuffled once.
     gameState.dealCards()
     gameState.setTopCard()
+    gameState.userInterface.showState(gameState)
 
 
 
@@ -76,16 +145,42 @@ def play_round(gameState):
     '''
     while not gameState.roundWon:
         currentPlayer = gameState.players[gameState.currentPlayerIndex]
-        print(f"The current player is {currentPlayer.name}.\nPlayer Index: {gameState.currentPlayerIndex}")
+        gameState.log(f"The current player is {currentPlayer.name}.\nPlayer Index: {gameState.currentPlayerIndex}")
         take_turn(currentPlayer, gameState)
+        gameState.userInterface.showState(gameState) # Lets the user interface show what just happened
         if currentPlayer.hand.isEmpty():
             gameState.roundWinner = currentPlayer
             gameState.roundWon = True
-    
+        elif gameState.rules.jumpIn:
+            take_jump_ins(gameState)
+
     gameState.userInterface.pygameWrapper.textPopUp([f"{gameState.roundWinner.name} has won the round!"])
 
 
 
+def take_jump_ins(gameState):
+    '''
+    Lets players jump in on the top card with the jump-in house rule, until nobody does or someone goes out.
+
+    Parameters:
+        gameState (GameState): The current game state object.
+    '''
+    while True:
+        jump = gameState.findJumpIn()
+        if jump is None:
+            return
+
+        seat, card = jump
+        player = gameState.players[seat]
+        gameState.jumpIn(seat, card)
+        gameState.userInterface.showState(gameState)
+        if player.hand.isEmpty():
+            gameState.roundWinner = player
+            gameState.roundWon = True
+            return
+
+
+
 def score_round(gameState):
     '''
     Handles scoring logic at the end of the round and resets the round winner.
@@ -99,7 +194,10 @@ def score_round(gameState):
         for card in player.hand.cards:
             scoredPoints += card.points
     
-    gameState.roundWinner.points = scoredPoints
+    gameState.roundWinner.points += scoredPoints # Points add up over rounds until someone reaches 500
+
+    if gameState.resultsStore is not None:
+        gameState.resultsStore.recordRound(gameState, scoredPoints)
 
     gameState.userInterface.pygameWrapper.textPopUp([f"{gameState.roundWinner.name} scored {gameState.roundWinner.points} points!"])
 
@@ -116,58 +214,95 @@ def take_turn(player, gameState):
         gameState (GameState): The current game state object.
     '''
 
-    playableCards = [card for card in player.hand.cards if gameState.isCardPlayable(card)]
+    playableCards = gameState.playableCards(player)
+
+    if gameState.telemetry is not None:
+        gameState.telemetry.startTurn(gameState, player, playableCards)
 
     if type(player) is obj.Player: # Checks if the player is a Player object
 
-        while True:
-            userInput = gameState.userInterface.interfaceUser(player)
+        if gameState.speculator is not None:
+            gameState.speculator.start(gameState, player) # Works out the next AI turns while the player thinks
 
-            if isinstance(userInput, obj.Card) and userInput in playableCards:
-                gameState.playCard(player, userInput)
-                return
-            
-            else:
-                match userInput:
+        try:
+            take_human_turn(player, gameState, playableCards)
+        finally:
+            if gameState.speculator is not None:
+                gameState.speculator.stop() # The player has committed, so the game state is about to change
+
+    elif type(player) is obj.ComputerPlayer: # Checks if the player is a ComputerPlayer object
+
+        if len(playableCards) > 0:
+            move = None
+            if gameState.speculator is not None:
+                move = gameState.speculator.lookup(gameState, player) # The move may have been worked out already
+            if move is None:
+                move = player.chooseMove(gameState, playableCards)
+            card, color = move
+            gameState.playCard(player, card, color=color)
+        
+        elif gameState.pendingDraw:
+            gameState.takePendingDraw(player) # Nothing to stack, so they draw everything stacked up
+
+        else:
+            drawnCard = gameState.drawForTurn(player)
+            gameState.log(f"{player.name} has drawn a card!")
+            gameState.log(f"{player.name} hand size is now {len(player.hand.cards)}\n")
 
-                    case 0:
-                        player.callUno()
-                        print("Uno pressed!")
+            if drawnCard is not None and gameState.isCardPlayable(drawnCard):
+                gameState.playCard(player, drawnCard)
+            else:
+                gameState.nextPlayer()
 
-                    case 1:
-                        player.drawCard(gameState.drawPile, gameState.discardPile)
-                        print(f"{player.name} has drawn a card!")
-                        print(f"{player.name} hand size is now {len(player.hand.cards)}\n")
+    else:
+        "Error: Turn not taken"
 
-                        drawnCard = player.hand.cards[-1]
+    if gameState.telemetry is not None:
+        gameState.telemetry.finishTurn(gameState)
 
-                        willPlayCard = gameState.userInterface.promptPlayCard(drawnCard)
 
-                        if willPlayCard and gameState.isCardPlayable(drawnCard):
-                            gameState.playCard(player, drawnCard)
-                            return
 
-                        gameState.nextPlayer()
-                        return
+def take_human_turn(player, gameState, playableCards):
+    '''
+    Executes a human player's turn through the user interface.
 
-    elif type(player) is obj.ComputerPlayer: # Checks if the player is a ComputerPlayer object
+    Parameters:
+        player (Player): The player whose turn it is.
+        gameState (GameState): The current game state object.
+        playableCards (list): The cards in the player's hand that can be played.
+    '''
+    while True:
+        userInput = gameState.userInterface.interfaceUser(player)
 
-        if len(playableCards) > 0:
-            gameState.playCard(player, None, playableCards)
+        if isinstance(userInput, obj.Card) and userInput in playableCards:
+            gameState.playCard(player, userInput)
             return
         
         else:
-            player.drawCard(gameState.drawPile, gameState.discardPile)
-            print(f"{player.name} has drawn a card!")
-            print(f"{player.name} hand size is now {len(player.hand.cards)}\n")
+            match userInput:
 
-            drawnCard = player.hand.cards[-1]
+                case 0:
+                    player.callUno()
+                    gameState.log("Uno pressed!")
 
-            if gameState.isCardPlayable(drawnCard):
-                gameState.playCard(player, drawnCard, playableCards)
-                return
+                case 1:
+                    if gameState.pendingDraw:
+                        gameState.takePendingDraw(player) # Drawing instead of stacking takes everything stacked up
+                        return
 
-            gameState.nextPlayer()
+                    drawnCard = gameState.drawForTurn(player)
+                    gameState.log(f"{player.name} has drawn a card!")
+                    gameState.log(f"{player.name} hand size is now {len(player.hand.cards)}\n")
 
-    else:
-        "Error: Turn not taken"
\ No newline at end of file
+                    if drawnCard is None:
+                        gameState.nextPlayer() # There was nothing to draw
+                        return
+
+                    willPlayCard = gameState.userInterface.promptPlayCard(drawnCard)
+
+                    if willPlayCard and gameState.isCardPlayable(drawnCard):
+                        gameState.playCard(player, drawnCard)
+                        return
+
+                    gameState.nextPlayer()
+                    return
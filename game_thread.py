@@ -0,0 +1,393 @@
+import collections
+import queue
+import threading
+import time
+
+import pygame
+
+import objects as obj
+import game_logic as gl
+import user_interface as ui
+
+# Messages the game sends to the renderer. Each one is a (kind, payload) tuple.
+SNAPSHOT = "snapshot" # payload: a GameState.snapshot() to render
+REQUEST = "request" # payload: (method name, args) the user interface should run, whose result is sent back
+DONE = "done" # payload: None, the game is over
+ERROR = "error" # payload: the exception that stopped the game
+MESSAGE = "message" # payload: a list of strings to show without waiting for the user (spectator mode only)
+
+# Messages the renderer sends to a spectated game.
+SPEED = "speed" # payload: the new speed multiplier, or None to run unthrottled
+STOP = "stop" # payload: None, stop spectating
+
+SPECTATOR_SPEEDS = [1, 2, 4, 8, 16, 64, None] # Speed multipliers to step through. None runs as fast as the game can go
+SPECTATOR_TURN_TIME = 0.5 # Seconds a turn is shown for at 1x
+SPECTATOR_FRAME_TIME = 1 / ui.FRAME_RATE # Seconds between snapshots when turns go by faster than frames
+SPECTATOR_RATE_WINDOW = 1.0 # Seconds of history the turns/games per second readout averages over
+
+
+
+class RemoteUserInterface:
+    '''
+    Stands in for the UserInterface on the game's worker thread.
+
+    Every call the game makes is sent over a queue to the main thread, which runs it on the real UserInterface.
+    Calls that need an answer (like asking the user for a card) wait for the main thread's reply.
+    '''
+    def __init__(self, toRenderer, toEngine):
+        '''
+        Initializes a remote user interface with the given queues.
+
+        :param toRenderer: queue.Queue - Messages from the game to the main thread.
+        :param toEngine: queue.Queue - Replies from the main thread to the game.
+        '''
+        self.toRenderer = toRenderer
+        self.toEngine = toEngine
+        self.pygameWrapper = RemotePygameWrapper(self) # The game also calls userInterface.pygameWrapper.textPopUp
+        self.engineTime = 0.0 # Seconds the game has spent working, rather than waiting on the main thread
+        self.resumed = time.perf_counter() # When the game last went back to work
+
+    def pause(self):
+        '''
+        Marks the game as waiting, adding the time since it went back to work to engineTime.
+        '''
+        self.engineTime += time.perf_counter() - self.resumed
+
+    def resume(self):
+        '''
+        Marks the game as working again.
+        '''
+        self.resumed = time.perf_counter()
+
+    def request(self, name, *args):
+        '''
+        Asks the main thread to run a method of the user interface and waits for its result.
+        '''
+        self.pause()
+        self.toRenderer.put((REQUEST, (name, args)))
+        result = self.toEngine.get()
+        self.resume()
+        return result
+
+    def interfaceUser(self, player):
+        '''
+        Lets the user take their turn. See UserInterface.interfaceUser.
+        '''
+        return self.request("interfaceUser", player)
+
+    def promptPlayCard(self, card):
+        '''
+        Asks the user if they want to play a drawn card. See UserInterface.promptPlayCard.
+        '''
+        return self.request("promptPlayCard", card)
+
+    def chooseColor(self, prompt):
+        '''
+        Asks the user to choose a color. See UserInterface.chooseColor.
+        '''
+        return self.request("chooseColor", prompt)
+
+    def choosePlayer(self, prompt, names):
+        '''
+        Asks the user to choose a player. See UserInterface.choosePlayer.
+        '''
+        return self.request("choosePlayer", prompt, names)
+
+    def showState(self, gameState):
+        '''
+        Sends a snapshot of the game to be rendered. The game does not wait for it to be shown.
+        '''
+        self.pause()
+        snapshot = gameState.snapshot()
+        snapshot["engineTime"] = self.engineTime
+        self.toRenderer.put((SNAPSHOT, snapshot))
+        self.resume()
+
+
+
+class RemotePygameWrapper:
+    '''
+    Stands in for the PygameWrapper on the game's worker thread, so popups are shown by the main thread.
+    '''
+    def __init__(self, remoteUserInterface):
+        self.remoteUserInterface = remoteUserInterface
+
+    def textPopUp(self, prompts):
+        '''
+        Shows a list of strings to the user and waits for them to close it. See PygameWrapper.textPopUp.
+        '''
+        return self.remoteUserInterface.request("textPopUp", prompts)
+
+
+
+class StopSpectating(Exception):
+    '''
+    Raised on the game's thread to stop a spectated game partway through.
+    '''
+
+
+
+class SpectatorUserInterface(RemoteUserInterface):
+    '''
+    Stands in for the UserInterface on the game's worker thread when only computer players are playing.
+
+    Nobody has to answer anything, so the game never waits on the main thread. Instead, it paces itself to the chosen speed
+    after every turn. When turns go by faster than frames, snapshots are only sent once a frame, so rendering never slows the game.
+    '''
+    def __init__(self, toRenderer, toEngine, speed=SPECTATOR_SPEEDS[0]):
+        '''
+        Initializes a spectator user interface with the given queues and speed.
+
+        :param toRenderer: queue.Queue - Messages from the game to the main thread.
+        :param toEngine: queue.Queue - Speed changes and stop requests from the main thread.
+        :param speed: int or None - The speed multiplier, or None to run unthrottled.
+        '''
+        super().__init__(toRenderer, toEngine)
+        self.pygameWrapper = SpectatorPygameWrapper(self)
+        self.setSpeed(speed)
+        self.turns = 0 # Turns played over every spectated game
+        self.games = 0 # Games finished
+        self.lastSnapshot = 0.0 # When the last snapshot was sent, from time.perf_counter
+
+    def setSpeed(self, speed):
+        '''
+        Sets how long each turn is shown for, from a speed multiplier (None for no waiting at all).
+        '''
+        self.turnTime = 0.0 if speed is None else SPECTATOR_TURN_TIME / speed
+
+    def handleControl(self, message):
+        '''
+        Handles a message from the main thread, raising StopSpectating if it asks us to stop.
+        '''
+        kind, payload = message
+        if kind == SPEED:
+            self.setSpeed(payload)
+        elif kind == STOP:
+            raise StopSpectating()
+
+    def showState(self, gameState):
+        '''
+        Sends a snapshot of the game to be rendered, if one is due, and then waits out the rest of the turn at the current speed.
+        '''
+        self.pause()
+        self.turns += 1
+
+        now = time.perf_counter()
+        if self.turnTime >= SPECTATOR_FRAME_TIME or now - self.lastSnapshot >= SPECTATOR_FRAME_TIME:
+            self.lastSnapshot = now
+            snapshot = gameState.snapshot()
+            snapshot["engineTime"] = self.engineTime
+            snapshot["turns"] = self.turns
+            snapshot["games"] = self.games
+            self.toRenderer.put((SNAPSHOT, snapshot))
+
+        # Waiting on the queue instead of sleeping means a speed change or stop takes effect right away.
+        deadline = now + self.turnTime
+        while True:
+            try:
+                remaining = deadline - time.perf_counter()
+                if remaining > 0:
+                    message = self.toEngine.get(timeout=remaining)
+                else:
+                    message = self.toEngine.get_nowait()
+            except queue.Empty:
+                self.resume()
+                return
+            self.handleControl(message)
+
+
+
+class SpectatorPygameWrapper:
+    '''
+    Stands in for the PygameWrapper on a spectated game's worker thread. Popups are shown as a message, and never wait.
+    '''
+    def __init__(self, spectatorUserInterface):
+        self.spectatorUserInterface = spectatorUserInterface
+
+    def textPopUp(self, prompts):
+        '''
+        Sends a list of strings to be shown under the game, without waiting for anyone to close it.
+        '''
+        self.spectatorUserInterface.toRenderer.put((MESSAGE, prompts))
+
+
+
+def run_engine(gameState, toRenderer):
+    '''
+    Runs the game on the worker thread, and tells the main thread when it is done or if it failed.
+
+    Parameters:
+        gameState (GameState): The game state, whose userInterface is a RemoteUserInterface.
+        toRenderer (queue.Queue): Messages from the game to the main thread.
+    '''
+    try:
+        gl.game_loop(gameState)
+    except BaseException as error: # Anything that stops the game has to reach the main thread, or it would wait forever
+        toRenderer.put((ERROR, error))
+    else:
+        toRenderer.put((DONE, None))
+
+
+
+def run_threaded_game(gameState, userInterface):
+    '''
+    Plays a game with the game logic on a worker thread, while the main thread only renders and collects input.
+
+    The main thread renders the latest snapshot every frame, so the window keeps responding while the game works.
+    When the game needs the user, the main thread runs that request on the real user interface and sends back the result.
+
+    Parameters:
+        gameState (GameState): The game state, with its players already set.
+        userInterface (UserInterface): The user interface to render with. It must only be used on this (the main) thread.
+    '''
+    toRenderer = queue.Queue()
+    toEngine = queue.Queue()
+    gameState.userInterface = RemoteUserInterface(toRenderer, toEngine)
+
+    engine = threading.Thread(target=run_engine, args=(gameState, toRenderer), name="uno-engine", daemon=True)
+    engine.start()
+
+    pygameWrapper = userInterface.pygameWrapper
+    snapshot = None
+
+    while True:
+        pygameWrapper.updateInput() # Ticks the frame clock, so we render at a steady rate
+
+        # Handle everything the game sent since the last frame.
+        while True:
+            try:
+                kind, payload = toRenderer.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == SNAPSHOT:
+                snapshot = payload # Only the newest snapshot matters
+                pygameWrapper.perfOverlay.reportEngineTime(payload["engineTime"])
+            elif kind == REQUEST:
+                name, args = payload
+                target = pygameWrapper if name == "textPopUp" else userInterface
+                toEngine.put(getattr(target, name)(*args))
+            elif kind == DONE:
+                engine.join()
+                return
+            elif kind == ERROR:
+                engine.join()
+                raise payload
+
+        userInterface.renderState(snapshot)
+        pygameWrapper.present()
+
+
+
+def run_spectator_engine(gameState, toRenderer):
+    '''
+    Plays games between the same computer players on the worker thread, one after another, until told to stop.
+
+    Parameters:
+        gameState (GameState): The first game's state, whose userInterface is a SpectatorUserInterface.
+        toRenderer (queue.Queue): Messages from the game to the main thread.
+    '''
+    userInterface = gameState.userInterface
+    try:
+        while True:
+            gl.game_loop(gameState)
+            userInterface.games += 1
+
+            # The next game starts with a fresh deck, and the same players back at zero points.
+            players = gameState.players
+            for player in players:
+                player.points = 0
+            previous = gameState
+            gameState = obj.GameState(gl.create_deck(gl.decks_needed(len(players))), userInterface, previous.rules)
+            gameState.players = players
+            gameState.verbose = previous.verbose
+            gameState.endgameSolver = previous.endgameSolver
+            gameState.probabilityOracle = previous.probabilityOracle
+            gameState.listeners = previous.listeners # Card trackers start over at the first deal
+            gameState.resultsStore = previous.resultsStore
+            gameState.telemetry = previous.telemetry
+            if previous.seed is not None:
+                gl.seed_game(gameState) # A new seed for each game, so each one's results say how to replay it
+    except StopSpectating:
+        toRenderer.put((DONE, None))
+    except BaseException as error:
+        toRenderer.put((ERROR, error))
+
+
+
+def run_spectator(gameState, userInterface):
+    '''
+    Shows games between computer players live, at a speed the user picks, until they press escape.
+
+    The left and right arrow keys step through SPECTATOR_SPEEDS. The game runs on a worker thread and only waits on its own pacing,
+    so at the highest speeds it goes about as fast as it would without a window, while the main thread shows one snapshot a frame.
+
+    Parameters:
+        gameState (GameState): The game state, with its (computer) players already set.
+        userInterface (UserInterface): The user interface to render with. It must only be used on this (the main) thread.
+    '''
+    toRenderer = queue.Queue()
+    toEngine = queue.Queue()
+    speedIndex = 0
+    gameState.userInterface = SpectatorUserInterface(toRenderer, toEngine, SPECTATOR_SPEEDS[speedIndex])
+    gameState.verbose = False # Printing every turn would slow the game down far more than rendering does
+
+    engine = threading.Thread(target=run_spectator_engine, args=(gameState, toRenderer), name="uno-engine", daemon=True)
+    engine.start()
+
+    pygameWrapper = userInterface.pygameWrapper
+    snapshot = None
+    message = ""
+    history = collections.deque() # (time, turns, games) from recent snapshots, for the per second readout
+
+    while True:
+        for event in pygameWrapper.updateInput():
+            if event.type != pygame.KEYDOWN:
+                continue
+            if event.key == pygame.K_ESCAPE:
+                toEngine.put((STOP, None))
+            elif event.key in (pygame.K_RIGHT, pygame.K_UP) and speedIndex < len(SPECTATOR_SPEEDS) - 1:
+                speedIndex += 1
+                toEngine.put((SPEED, SPECTATOR_SPEEDS[speedIndex]))
+            elif event.key in (pygame.K_LEFT, pygame.K_DOWN) and speedIndex > 0:
+                speedIndex -= 1
+                toEngine.put((SPEED, SPECTATOR_SPEEDS[speedIndex]))
+
+        while True:
+            try:
+                kind, payload = toRenderer.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == SNAPSHOT:
+                snapshot = payload # Any older snapshots this frame are skipped
+                pygameWrapper.perfOverlay.reportEngineTime(payload["engineTime"])
+            elif kind == MESSAGE:
+                message = " ".join(payload)
+            elif kind == DONE:
+                engine.join()
+                return
+            elif kind == ERROR:
+                engine.join()
+                raise payload
+
+        turnsPerSecond = 0.0
+        gamesPerSecond = 0.0
+        if snapshot is not None:
+            now = time.perf_counter()
+            if not history or history[-1][1] != snapshot["turns"]:
+                history.append((now, snapshot["turns"], snapshot["games"]))
+            while len(history) > 2 and now - history[0][0] > SPECTATOR_RATE_WINDOW:
+                history.popleft()
+            if len(history) > 1 and now > history[0][0]:
+                elapsed = now - history[0][0]
+                turnsPerSecond = (history[-1][1] - history[0][1]) / elapsed
+                gamesPerSecond = (history[-1][2] - history[0][2]) / elapsed
+
+        speed = SPECTATOR_SPEEDS[speedIndex]
+        speedLabel = "unthrottled" if speed is None else f"{speed}x"
+        gamesPlayed = 0 if snapshot is None else snapshot["games"]
+
+        userInterface.renderState(snapshot)
+        userInterface.renderSpectatorHud(speedLabel, turnsPerSecond, gamesPerSecond, gamesPlayed, message)
+        pygameWrapper.present()
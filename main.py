@@ -1,6 +1,9 @@
 import objects as o
 import game_logic as gl
 import user_interface as ui
+import game_thread as gt
+import speculation as sp
+import results_store as rs
 import pygame
 
 def main():
@@ -11,11 +14,30 @@ def main():
     userInterface = ui.UserInterface(pygameWrapper, gameState.discardPile, gameState.drawPile)
     menu = ui.Menu(pygameWrapper)
     gameState.players = menu.mainMenu()
-
-    gameState.userInterface = userInterface
-
-    gl.game_loop(gameState)
-
+    gameState.rules = menu.houseRules # Whatever house rules were picked in the settings menu
+    gameState.useDeck(gl.create_deck(gl.decks_needed(len(gameState.players)))) # Big tables shuffle in more decks
+
+    # In games with both humans and computers, the computers' turns are worked out while the humans think.
+    hasHumans = any(type(player) is o.Player for player in gameState.players)
+    hasComputers = any(type(player) is o.ComputerPlayer for player in gameState.players)
+    if hasHumans and hasComputers:
+        gameState.speculator = sp.Speculator()
+
+    # Computers count the cards they've seen and play by the odds, and search out endgames once every hand is down to a few cards.
+    gl.equip_computers(gameState)
+
+    # Every game played is recorded, so results outlast the popups.
+    gameState.resultsStore = rs.ResultsStore()
+    gl.seed_game(gameState)
+
+    # The game runs on its own thread, while this one renders and handles input.
+    # Tables with only computers are shown live instead, game after game, at a speed the user picks.
+    if hasComputers and not hasHumans:
+        gt.run_spectator(gameState, userInterface)
+    else:
+        gt.run_threaded_game(gameState, userInterface)
+
+    gameState.resultsStore.close() # Writes whatever results are still queued
     pygame.quit()
 
 
@@ -1,17 +1,27 @@
+import copy
 import random
 
+import rules
+from card_types import COLORS, COLOR_INDEX, TYPE_POINTS, WILD_TYPE, CARD_TYPES, card_type
+
+WILD_SAVING_PENALTY = 0.25 # How much a computer player choosing by the odds holds back a wild card, since it can be played any time
+HAND_SIZE = 7 # Cards dealt to each player
+SNAPSHOT_SEATS = 20 # Most players a snapshot shows, around the current player, so big tables don't cost more to render
+
 class GameState:
     '''
     Represents the state of the game.
     '''
-    def __init__(self, deck, userInterface=None):
+    def __init__(self, deck, userInterface=None, ruleSet=rules.DEFAULT_RULES):
         '''
         Initializes a game state with the given attributes.
 
-        :param deck: list - A list containing 108 Card objects.
+        :param deck: list - A list of Card objects: 108 for each deck shuffled together (see game_logic.create_deck).
+        :param ruleSet: RuleSet object - The rules to play by, with any house rules.
         '''
         self.discardPile = DiscardPile()
         self.drawPile = DrawPile(deck)
+        self.cardCount = len(deck) # Every card in the game, wherever it is
         self.players = []
         self.currentPlayerIndex = 0
         self.dealer = None
@@ -22,6 +32,22 @@ class GameState:
         self.hasWinner = False
         self.gameWinner = None
         self.userInterface = userInterface
+        self.speculator = None # A Speculator, if AI turns should be worked out while human players think
+        self.endgameSolver = None # An EndgameSolver, if computer players should search out endgames instead of guessing
+        self.probabilityOracle = None # A ProbabilityOracle, if computer players with card trackers should choose moves by the odds
+        self.listeners = [] # Objects told about every deal, draw, play, pass and reshuffle, like a CardTracker's TableTracker
+        self.holders = [{} for _ in range(CARD_TYPES)] # For each card type, how many of it each player holds, so jump-ins are found without looking at every hand
+        self.seats = {} # Maps each player to their seat, as of the last deal
+        self.rules = ruleSet
+        self.pendingDraw = 0 # Cards stacked up for the current player to draw, with the stacking house rule
+        self.pendingType = None # The card type of the last draw card stacked
+        self.lastPlayer = None # Who played the top card
+        self.resultsStore = None # A ResultsStore, if the game's results should be saved
+        self.resultsId = None # The game's key in the results store while it's being recorded. Its id is given out once it's written
+        self.telemetry = None # A TurnRecorder, if features of every turn should be recorded
+        self.dealSeed = None # If set, every round is dealt from this seed (see DrawPile.replayDeal), to compare strategies on the same deals
+        self.seed = None # The seed the game's shuffles came from, if it was seeded, so its results can say how to replay it
+        self.verbose = True # Whether to print what happens in the game
 
     def addPlayer(self, player):
         '''
@@ -34,6 +60,103 @@ class GameState:
         else:
             raise ValueError("Players must have a Player or ComputerPlayer object type.")
         
+    def useDeck(self, deck):
+        '''
+        Replaces the draw pile with a new deck, like a bigger one once we know how many players there are. Call it before the first deal.
+
+        :param deck: list - A list of Card objects (see game_logic.create_deck).
+        '''
+        self.drawPile.cards = deck
+        self.cardCount = len(deck)
+
+    def addListener(self, listener):
+        '''
+        Adds a listener to tell about what happens with the cards. A listener has these methods, which are called as things happen:
+            onRoundStart(gameState) - A round is about to be dealt. Every card is in the draw pile.
+            onTopCard(card) - A card was turned over from the draw pile to start the discard pile.
+            onCardDrawn(player, card, forced) - A player drew a card. Forced is False only when they drew instead of playing.
+            onCardPlayed(player, card) - A player played a card onto the discard pile.
+            onPassed(player, topCard) - A player drew instead of playing on the top card.
+            onReshuffle(topCard) - The discard pile, except its top card, was shuffled back into the draw pile.
+            onHandsMoved(order) - Hands moved between players (7-0): each player in order got the hand of the player before them.
+
+        :param listener: object - The listener.
+        '''
+        self.listeners.append(listener)
+
+    def removeListener(self, listener):
+        '''
+        Stops telling a listener about what happens with the cards.
+
+        :param listener: object - A listener added with addListener.
+        '''
+        self.listeners.remove(listener)
+
+    def drawCard(self, player, forced=True):
+        '''
+        Has a player draw a card, and tells the listeners. Returns the drawn card, or None if there was nothing to draw.
+
+        :param player: Player or ComputerPlayer object - The player drawing.
+        :param forced: bool - False when the player is drawing instead of playing, and True for dealing and draw cards.
+        '''
+        reshuffled = self.drawPile.isEmpty() and len(self.discardPile.cards) > 1 # Drawing will shuffle the discard pile back in
+        card = player.drawCard(self.drawPile, self.discardPile)
+        if card is None:
+            return None
+
+        for listener in self.listeners:
+            if reshuffled:
+                listener.onReshuffle(self.discardPile.topCard)
+            listener.onCardDrawn(player, card, forced)
+        return card
+
+    def drawForTurn(self, player):
+        '''
+        Has a player draw instead of playing: one card, or with the draw to match house rule, until they draw one they can play.
+        Returns the last card drawn, or None if there was nothing to draw.
+
+        :param player: Player or ComputerPlayer object - The player drawing.
+        '''
+        self.playerPassed(player)
+        card = self.drawCard(player, forced=False)
+        while self.rules.drawToMatch and card is not None and not self.isCardPlayable(card):
+            card = self.drawCard(player, forced=False)
+        return card
+
+    def takePendingDraw(self, player):
+        '''
+        Has a player who can't (or won't) stack draw every card stacked up for them, which ends their turn.
+
+        :param player: Player or ComputerPlayer object - The player whose turn it is.
+        '''
+        self.log(f"{player.name} draws {self.pendingDraw} cards!")
+        for _ in range(self.pendingDraw):
+            self.drawCard(player)
+        self.pendingDraw = 0
+        self.pendingType = None
+        self.nextPlayer()
+
+    def moveHands(self, order):
+        '''
+        Moves hands around a list of players: each player gets the hand of the player before them, and the first gets the last's.
+
+        :param order: list - The players whose hands move.
+        '''
+        hands = [player.hand.cards for player in order]
+        for index, player in enumerate(order):
+            player.hand.replaceCards(hands[index - 1])
+        for listener in self.listeners:
+            listener.onHandsMoved(order)
+
+    def playerPassed(self, player):
+        '''
+        Tells the listeners that a player is drawing instead of playing on the top card. Call it right before they draw.
+
+        :param player: Player or ComputerPlayer object - The player passing.
+        '''
+        for listener in self.listeners:
+            listener.onPassed(player, self.discardPile.topCard)
+
     def setDealer(self):
         '''
         Determines which player is the dealer at the start of the game and sets the current player to the left of the dealer to begin play.
@@ -56,10 +179,33 @@ class GameState:
     def dealCards(self):
         '''
         Deals seven cards to each player at the start of the game.
+
+        Each hand is dealt as one slice off the top of the draw pile, in the order drawing them one at a time would have,
+        so dealing a big table doesn't take a draw per card.
         '''
+        for listener in self.listeners:
+            listener.onRoundStart(self)
+
+        self.seats = {}
+        for seat, player in enumerate(self.players):
+            self.seats[player] = seat
+            player.hand.joinGame(self.holders, player)
+
+        cards = self.drawPile.cards
         for player in self.players:
-            while len(player.hand.cards) < 7:
-                player.drawCard(self.drawPile, self.discardPile)
+            count = HAND_SIZE - len(player.hand.cards)
+            if count <= 0:
+                continue
+            if count > len(cards):
+                raise ValueError(f"There aren't enough cards to deal {len(self.players)} players. Use more decks.")
+
+            dealtCards = cards[-count:]
+            del cards[-count:]
+            dealtCards.reverse() # The top card is the end of the list, and it's dealt first
+            player.hand.addCards(dealtCards)
+            for listener in self.listeners:
+                for card in dealtCards:
+                    listener.onCardDrawn(player, card, True)
 
     def setTopCard(self):
         '''
@@ -67,29 +213,29 @@ class GameState:
         '''
         card = self.drawPile.draw(self.discardPile)
 
-        while card.action == "Wild" or card.action == "Wild Draw Four":
-            print(f"A Wild was drawn for top card, drawing again...")
+        while card.cardType >= WILD_TYPE:
+            self.log("A Wild was drawn for top card, drawing again...")
             self.drawPile.addCardToBottom(card) 
             card = self.drawPile.draw(self.discardPile)
-        
-        if card.action == "Draw Two":
-            print(f"The top card is a {card.color} Draw Two\n")
-            self.drawTwo()
 
-        elif card.action == "Reverse":
-            print(f"The top card is a {card.color} Reverse.\n")
+        self.log(f"The top card is a {card.color} {card.rank}.\n")
+        effect = self.rules.effects[card.cardType]
+        if effect == rules.DRAW_TWO:
+            self.drawTwo() # A Draw Two to start is always drawn, even with stacking
+
+        elif effect == rules.REVERSE:
             self.reverseDirection()
             self.nextPlayer()
 
-        elif card.action == "Skip":
-            print(f"The top card is a {card.color} Skip.\n")
+        elif effect == rules.SKIP:
             self.skip()
 
-        elif card.action is None:
-            print(f"The top card is a {card.color} {card.rank}.\n")
+        else: # Numbers, including the 7s and 0s of the 7-0 house rule, do nothing to start
             self.nextPlayer()
 
         self.discardPile.addCard(card)
+        for listener in self.listeners:
+            listener.onTopCard(card)
 
     def checkWinner(self):
         '''
@@ -98,10 +244,10 @@ class GameState:
         for player in self.players:
             if player.points >= 500:
                 self.hasWinner = True
-                self.winner = player
+                self.gameWinner = player
                 return True
-            else:
-                return False
+
+        return False
 
     def nextRound(self):
         '''
@@ -109,10 +255,69 @@ class GameState:
         '''
         self.round += 1
         self.roundWon = False
+        self.pendingDraw = 0
+        self.pendingType = None
         for player in self.players:
             player.resetHand(self.drawPile)
         discardPileCards = self.discardPile.removeAllCards()
         self.drawPile.cards += discardPileCards
+        self.drawPile.forgetWildColors()
+
+    def log(self, message):
+        '''
+        Prints a message about what is happening in the game, unless the game state is quiet.
+
+        :param message: str - The message to print.
+        '''
+        if self.verbose:
+            print(message)
+
+    def copy(self):
+        '''
+        Returns a copy of the game state that can be played out without changing this one.
+
+        The copy is quiet and has no user interface or speculator, so it can be played on another thread.
+        '''
+        memo = {id(self.userInterface): None, id(self.speculator): None} # Maps these to None instead of copying them
+        memo[id(self.resultsStore)] = None # Played out copies aren't real games, so they're never recorded
+        memo[id(self.telemetry)] = None
+        memo[id(self.endgameSolver)] = self.endgameSolver # The copy shares our solver. Decisions never overlap, and each starts from an empty memo
+        memo[id(self.probabilityOracle)] = self.probabilityOracle # And our oracle's cache
+        memo[id(self.rules)] = self.rules # Rule sets never change once made, so there's no need to copy their tables
+
+        # Players and piles that use the random module get a random.Random of the copy's own, starting where the module is now.
+        # The copy then makes the same random choices the game would, and playing it out (maybe on another thread) never
+        # draws from the game's random stream.
+        if self.drawPile.rng is random or any(type(player) is ComputerPlayer and player.rng is random for player in self.players):
+            stream = random.Random()
+            stream.setstate(random.getstate()) # Copies of copies already have their own, so only the game's thread ever reads this
+            memo[id(random)] = stream
+        clone = copy.deepcopy(self, memo)
+        clone.verbose = False
+        return clone
+
+    def snapshot(self):
+        '''
+        Returns a copy of the public state of the game for rendering.
+
+        The copy is only made of strings, numbers, and tuples, so it can be handed to another thread while the game keeps changing.
+        At big tables it only has the SNAPSHOT_SEATS players around the current player, starting at seat "firstSeat".
+        '''
+        topCard = self.discardPile.topCard
+        numPlayers = len(self.players)
+        firstSeat = max(0, min(self.currentPlayerIndex - SNAPSHOT_SEATS // 2, numPlayers - SNAPSHOT_SEATS))
+        shown = self.players[firstSeat:firstSeat + SNAPSHOT_SEATS]
+
+        return {
+            "round": self.round,
+            "currentPlayerIndex": self.currentPlayerIndex,
+            "direction": self.direction,
+            "topCard": (topCard.color, topCard.rank) if topCard is not None else None,
+            "drawPileSize": len(self.drawPile.cards),
+            "numPlayers": numPlayers,
+            "firstSeat": firstSeat,
+            "players": tuple((player.name, len(player.hand.cards), player.points) for player in shown),
+        }
 
     def isCardPlayable(self, card):
         '''
@@ -120,6 +325,9 @@ class GameState:
 
         :param card: Card object - Represents a card.
         '''
+        if self.pendingDraw:
+            return self.rules.stackOn[self.pendingType][card.cardType] # Only a card that stacks gets out of drawing
+
         topCard = self.discardPile.topCard
 
         if card.color == topCard.color or card.rank == topCard.rank or card.action == "Wild" or card.action == "Wild Draw Four":
@@ -127,75 +335,169 @@ class GameState:
         
         return False
     
-    def playCard(self, player, card=None, playableCards=None):
+    def playableCards(self, player):
         '''
-        Placeholder for a player playing a card from their hand.
+        Returns the cards in a player's hand that can be played, by the same rules as isCardPlayable, in one pass over the hand.
+
+        :param player: Player or ComputerPlayer object - The player.
+        '''
+        if self.pendingDraw:
+            stacks = self.rules.stackOn[self.pendingType]
+            return [card for card in player.hand.cards if stacks[card.cardType]]
+
+        topCard = self.discardPile.topCard
+        color = topCard.color
+        rank = topCard.rank
+        return [card for card in player.hand.cards if card.color == color or card.rank == rank or card.cardType >= WILD_TYPE]
+
+    def playCard(self, player, card=None, playableCards=None, color=None):
+        '''
+        Plays a card from a player's hand onto the discard pile and applies its action.
+
+        :param player: Player or ComputerPlayer object - The player playing the card.
+        :param card: Card object - The card to play. If None, the player chooses one of playableCards.
+        :param playableCards: list - The cards the player is able to play.
+        :param color: str - The color to change a wild card to. If None, the player is asked for one.
         '''
-        if type(player) is ComputerPlayer:
-            colors = []
-            for card in player.hand.cards:
-                if card.color is not None:
-                    colors.append(card.color)
-        
         if isinstance(playableCards, list) and card is None:
-            card = random.choice(playableCards)
+            card, color = player.chooseMove(self, playableCards)
 
-        if card.action is not None:
+        # What the card does comes from the rules' table, and is carried out by the handler at that index of EFFECTS.
+        effect = self.rules.effects[card.cardType]
+        if effect == rules.WILD or effect == rules.WILD_DRAW_FOUR:
+            if color is None:
+                color = self.chooseColor(player, f"A {card.action} card was played. Choose a color:")
+            card.changeColor(color)
+        self.log(f"{player.name} played a {card.color} {card.rank} card.")
 
-            if card.action == "Wild":
+        cardToPlay = player.hand.removeCard(card)
+        self.discardPile.addCard(cardToPlay)
+        self.lastPlayer = player
+        for listener in self.listeners:
+            listener.onCardPlayed(player, cardToPlay)
 
-                if type(player) is Player:
-                    color = self.userInterface.chooseColor("A Wild card was played. Choose a color:")
-                elif type(player) is ComputerPlayer:
-                    if len(colors) > 0:
-                        color = random.choice(colors)
-                    else:
-                        color = random.choice(["Red", "Yellow", "Blue", "Green"])
+        self.EFFECTS[effect](self, player, card)
+        self.log(f"{player.name}'s hand size is now {len(player.hand.cards)}\n")
 
-                card.changeColor(color)
-                print(f"{player.name} played a Wild card.")
+        if len(self.players) == 2 and effect == rules.REVERSE:
+            return
+        
+        self.nextPlayer()
 
-            elif card.action == "Skip":
-                self.skip()
-                print(f"{player.name} played a Skip card.")
+        if type(player) is ComputerPlayer:
+            return card
 
-            elif card.action == "Reverse":
-                self.reverseDirection()
-                print(f"{player.name} played a Reverse card.")
+    def chooseColor(self, player, prompt):
+        '''
+        Asks a player which color a wild card they played should become.
 
-            elif card.action == "Draw Two":
-                self.drawTwo()
-                print(f"{player.name} played a Draw Two card.")
+        :param player: Player or ComputerPlayer object - The player who played the wild card.
+        :param prompt: str - The prompt shown to a human player.
+        '''
+        if type(player) is ComputerPlayer:
+            return player.chooseColor()
+        return self.userInterface.chooseColor(prompt)
 
-            elif card.action == "Wild Draw Four":
-                self.drawFour()
+    def playNumber(self, player, card):
+        '''
+        Carries out a card with no effect. See playCard.
+        '''
 
-                if type(player) is Player:
-                    color = self.userInterface.chooseColor("A Wild Draw Four card was played. Choose a color:")
-                elif type(player) is ComputerPlayer:
-                    if len(colors) > 0:
-                        color = random.choice(colors)
-                    else:
-                        color = random.choice(["Red", "Yellow", "Blue", "Green"])
+    def playSkip(self, player, card):
+        '''
+        Carries out a Skip card. See playCard.
+        '''
+        self.skip()
 
-                card.changeColor(color)
-                print(f"{player.name} played a Wild Draw Four card.")
+    def playReverse(self, player, card):
+        '''
+        Carries out a Reverse card. See playCard.
+        '''
+        self.reverseDirection()
 
+    def playDrawCard(self, player, card):
+        '''
+        Carries out a Draw Two or Wild Draw Four card: the next player draws and is skipped, or with stacking, the draw is
+        stacked up for the next player, who has to stack on it or draw it all. See playCard.
+        '''
+        penalty = self.rules.drawPenalty[card.cardType]
+        if self.rules.stacking:
+            self.pendingDraw += penalty
+            self.pendingType = card.cardType
+            self.log(f"{self.pendingDraw} cards are stacked up for the next player.")
+        elif penalty == 2:
+            self.drawTwo()
         else:
-            print(f"{player.name} played a {card.color} {card.rank} card.")
+            self.drawFour()
 
-        cardToPlay = player.hand.removeCard(card)
-        self.discardPile.addCard(cardToPlay)
+    def playSwapHands(self, player, card):
+        '''
+        Carries out a 7 with the 7-0 house rule: the player swaps hands with another player. See playCard.
+        '''
+        if player.hand.isEmpty():
+            return # Going out on a 7 wins the round, so there's no hand to swap
+        target = self.chooseSwapTarget(player)
+        self.log(f"{player.name} swapped hands with {target.name}.")
+        self.moveHands([player, target])
 
-        print(f"{player.name}'s hand size is now {len(player.hand.cards)}\n")
+    def playRotateHands(self, player, card):
+        '''
+        Carries out a 0 with the 7-0 house rule: every hand moves on to the next player, in the direction of play. See playCard.
+        '''
+        if player.hand.isEmpty():
+            return # Going out on a 0 wins the round, so nothing moves
+        seat = self.currentPlayerIndex # The player who played the 0 is always the current player, even after jumping in
+        order = [self.players[(seat + offset * self.direction) % len(self.players)] for offset in range(len(self.players))]
+        self.log("Every hand moved on to the next player.")
+        self.moveHands(order)
 
-        if len(self.players) == 2 and card.action == "Reverse":
-            return
-        
-        self.nextPlayer()
+    def chooseSwapTarget(self, player):
+        '''
+        Asks a player who they want to swap hands with, for the 7-0 house rule.
 
+        :param player: Player or ComputerPlayer object - The player who played the 7.
+        '''
+        others = [otherPlayer for otherPlayer in self.players if otherPlayer is not player]
         if type(player) is ComputerPlayer:
-            return card
+            return player.chooseSwapTarget(others)
+        names = [otherPlayer.name for otherPlayer in others]
+        return others[self.userInterface.choosePlayer("Choose a player to swap hands with:", names)]
+
+    def findJumpIn(self):
+        '''
+        Returns the (seat, card) of the first player, in turn order, who jumps in on the top card with the jump-in house rule,
+        or None if nobody does. Nobody can jump in on a card of their own, or on cards stacked up for the player whose turn it is.
+        '''
+        topCard = self.discardPile.topCard
+        if not self.rules.canJumpIn[topCard.cardType] or self.pendingDraw:
+            return None
+
+        # Only the players holding the top card's type are looked at, nearest in turn order first, so big tables cost no more.
+        numPlayers = len(self.players)
+        offsets = {}
+        for player in self.holders[topCard.cardType]:
+            offsets[player] = (self.seats[player] - self.currentPlayerIndex) * self.direction % numPlayers
+        for player in sorted(offsets, key=offsets.__getitem__):
+            if offsets[player] == 0 or player is self.lastPlayer:
+                continue
+            for card in player.hand.cards:
+                if card.cardType == topCard.cardType and card.color == topCard.color:
+                    if type(player) is ComputerPlayer or self.userInterface.promptPlayCard(card):
+                        return self.seats[player], card
+                    break
+        return None
+
+    def jumpIn(self, seat, card):
+        '''
+        Plays a card out of turn with the jump-in house rule. Play carries on from the player who jumped in.
+
+        :param seat: int - The seat of the player jumping in, as found by findJumpIn.
+        :param card: Card object - Their card just like the top card.
+        '''
+        player = self.players[seat]
+        self.log(f"{player.name} jumped in!")
+        self.currentPlayerIndex = seat
+        self.playCard(player, card)
 
     def reverseDirection(self):
         '''
@@ -208,8 +510,8 @@ class GameState:
         The player ahead of the current player draws two cards and is skipped.
         '''
         playerAffected = self.players[(self.currentPlayerIndex + self.direction) % len(self.players)]
-        playerAffected.drawCard(self.drawPile, self.discardPile)
-        playerAffected.drawCard(self.drawPile, self.discardPile)
+        self.drawCard(playerAffected)
+        self.drawCard(playerAffected)
         self.skip()
 
     def drawFour(self):
@@ -218,7 +520,7 @@ class GameState:
         '''
         playerAffected = self.players[(self.currentPlayerIndex + self.direction) % len(self.players)]
         for _ in range(4):
-            playerAffected.drawCard(self.drawPile, self.discardPile)
+            self.drawCard(playerAffected)
         self.skip()
 
     def skip(self):
@@ -226,7 +528,7 @@ class GameState:
         Skips the next player in turn order.
         '''
         self.currentPlayerIndex = (self.currentPlayerIndex + self.direction) % len(self.players)
-        print(f"Player skipped. Current player index is now: {self.currentPlayerIndex}")
+        self.log(f"Player skipped. Current player index is now: {self.currentPlayerIndex}")
 
     def nextPlayer(self):
         '''
@@ -250,8 +552,21 @@ class GameState:
         #                           a % b    =     a - b * floor(a/b)
 
         self.currentPlayerIndex = (self.currentPlayerIndex + self.direction) % len(self.players)
-        print(f"Next turn. Current player index is now: {self.currentPlayerIndex}")
+        self.log(f"Next turn. Current player index is now: {self.currentPlayerIndex}")
+
+
 
+# The handler for each effect in rules, indexed by effect, so playing a card is a table lookup instead of a chain of ifs.
+GameState.EFFECTS = [
+    GameState.playNumber, # rules.NUMBER
+    GameState.playSkip, # rules.SKIP
+    GameState.playReverse, # rules.REVERSE
+    GameState.playDrawCard, # rules.DRAW_TWO
+    GameState.playNumber, # rules.WILD, whose color is chosen before it's played
+    GameState.playDrawCard, # rules.WILD_DRAW_FOUR
+    GameState.playSwapHands, # rules.SWAP_HANDS
+    GameState.playRotateHands, # rules.ROTATE_HANDS
+]
 
 
 class Player:
@@ -269,6 +584,8 @@ class Player:
         self.points = 0
         self.hand = Hand()
         self.hasUno = False
+        self.tracker = None # A CardTracker following the game from this player's seat, if they have one
+        self.cardsDrawn = 0 # Cards drawn from the draw pile over the whole game, not counting the deal
 
     @property
     def name(self):
@@ -289,11 +606,16 @@ class Player:
 
     def drawCard(self, drawPile, discardPile):
         '''
-        Draws a card from the draw pile and stores it in the player's hand.
+        Draws a card from the draw pile and stores it in the player's hand. Returns the card, or None if there was nothing to draw.
+
+        Use GameState.drawCard instead during a game, so the game state's listeners hear about it.
         '''
-        if not drawPile.isEmpty():
+        if not drawPile.isEmpty() or len(discardPile.cards) > 1: # An empty draw pile is reshuffled from the discard pile
             card = drawPile.draw(discardPile)
             self.hand.addCard(card)
+            self.cardsDrawn += 1
+            return card
+        return None
 
     def callUno(self):
         '''
@@ -317,6 +639,95 @@ class ComputerPlayer(Player):
     '''
     Represents a computer player in the UNO game.
     '''   
+    def __init__(self, name, playsOdds=True, searchesEndgames=True, wildSavingPenalty=WILD_SAVING_PENALTY):
+        '''
+        Initializes a computer player with the given attributes. The flags let bots with different strategies share a table.
+
+        :param name: str - The name of the player.
+        :param playsOdds: bool - Whether to choose moves by the odds, when the game has a probability oracle and this player has a tracker.
+        :param searchesEndgames: bool - Whether to search out endgames, when the game has an endgame solver.
+        :param wildSavingPenalty: float - How much choosing by the odds holds back wild cards.
+        '''
+        super().__init__(name)
+        self.rng = random # Where random choices come from. Replayed deals give each seat its own seeded random.Random
+        self.playsOdds = playsOdds
+        self.searchesEndgames = searchesEndgames
+        self.wildSavingPenalty = wildSavingPenalty
+
+    def chooseMove(self, gameState, playableCards):
+        '''
+        Chooses which card to play and, for wild cards, which color to change it to.
+
+        Returns a (card, color) tuple, where color is None unless the card is a wild card.
+
+        :param gameState: GameState object - The current game state.
+        :param playableCards: list - The cards in this player's hand that can be played.
+        '''
+        solver = gameState.endgameSolver
+        if solver is not None and self.searchesEndgames and solver.applies(gameState):
+            return solver.chooseMove(gameState, self, playableCards)
+
+        oracle = gameState.probabilityOracle
+        if oracle is not None and self.playsOdds and self.tracker is not None:
+            return self.chooseMoveByOdds(gameState, oracle, playableCards)
+
+        card = self.rng.choice(playableCards)
+        color = None
+        if card.action == "Wild" or card.action == "Wild Draw Four":
+            color = self.chooseColor()
+        return card, color
+
+    def chooseMoveByOdds(self, gameState, oracle, playableCards):
+        '''
+        Chooses the move that gives whoever plays next the lowest chance of being able to play, by this player's card tracker.
+        Wild cards are held back unless they're much better, and ties go to the card worth the most points, to get rid of it.
+
+        Returns a (card, color) tuple, like chooseMove.
+
+        :param gameState: GameState object - The current game state.
+        :param oracle: ProbabilityOracle object - The oracle to ask.
+        :param playableCards: list - The cards in this player's hand that can be played.
+        '''
+        seat = gameState.currentPlayerIndex
+        bestMove = None
+        bestScore = None
+        for card in playableCards:
+            cardType = card_type(card)
+            if cardType >= WILD_TYPE:
+                colors = [otherCard.color for otherCard in self.hand.cards if otherCard is not card and card_type(otherCard) < WILD_TYPE]
+                colors = sorted(set(colors)) if colors else COLORS # Only colors we can follow up on, if we have any
+            else:
+                colors = [card.color]
+
+            nextSeat = oracle.nextSeat(gameState, seat, cardType)
+            for color in colors:
+                risk = 0.0
+                if nextSeat != seat:
+                    risk = oracle.canPlayChance(self.tracker, gameState.players[nextSeat], cardType, COLOR_INDEX[color])
+                if cardType >= WILD_TYPE:
+                    risk += self.wildSavingPenalty
+                score = (risk, -TYPE_POINTS[cardType])
+                if bestScore is None or score < bestScore:
+                    bestScore = score
+                    bestMove = (card, color if cardType >= WILD_TYPE else None)
+        return bestMove
+
+    def chooseSwapTarget(self, others):
+        '''
+        Chooses who to swap hands with for the 7-0 house rule: whoever has the fewest cards.
+
+        :param others: list - The other players.
+        '''
+        return min(others, key=lambda otherPlayer: len(otherPlayer.hand.cards))
+
+    def chooseColor(self):
+        '''
+        Chooses a color for a wild card, picking randomly from the colors in this player's hand.
+        '''
+        colors = [card.color for card in self.hand.cards if card.color is not None]
+        if len(colors) > 0:
+            return self.rng.choice(colors)
+        return self.rng.choice(["Red", "Yellow", "Blue", "Green"])
 
 
 
@@ -326,12 +737,45 @@ class Hand:
     '''
     def __init__(self):
         self.cards = []
+        self.version = 0 # Incremented every time the hand changes, so views of the hand can tell when to update
+        self.holders = None # The game's count of who holds each card type (see GameState.holders), once the hand is dealt into a game
+        self.owner = None # Who holds the hand, in holders
+
+    def joinGame(self, holders, owner):
+        '''
+        Starts keeping a game's count of who holds each card type up to date with this hand.
+
+        :param holders: list - The game's GameState.holders.
+        :param owner: Player or ComputerPlayer object - The player holding the hand.
+        '''
+        if self.holders is holders and self.owner is owner:
+            return
+        self.hold(self.cards, -1) # Out of any game it was in before
+        self.holders = holders
+        self.owner = owner
+        self.hold(self.cards, 1)
+
+    def hold(self, cards, count):
+        '''
+        Adds count (1 or -1) of each card to the owner's counts in holders, if the hand is in a game.
+        '''
+        if self.holders is None:
+            return
+        for card in cards:
+            counts = self.holders[card.cardType]
+            held = counts.get(self.owner, 0) + count
+            if held:
+                counts[self.owner] = held
+            else:
+                del counts[self.owner]
 
     def addCard(self, card):
         '''
         Adds a card to the player's hand.
         '''
         self.cards.append(card)
+        self.version += 1
+        self.hold((card,), 1)
 
     def removeCard(self, card):
         '''
@@ -339,14 +783,35 @@ class Hand:
         '''
         if card in self.cards:
             self.cards.remove(card)
+            self.version += 1
+            self.hold((card,), -1)
             return card
     
+    def addCards(self, cards):
+        '''
+        Adds a list of cards to the player's hand at once.
+        '''
+        self.cards += cards
+        self.version += 1
+        self.hold(cards, 1)
+
+    def replaceCards(self, cards):
+        '''
+        Replaces every card in the hand with a list of cards, which the hand takes ownership of.
+        '''
+        self.hold(self.cards, -1)
+        self.cards = cards
+        self.version += 1
+        self.hold(cards, 1)
+
     def removeAllCards(self):
         '''
         Removes all cards from the hand and returns them.
         '''
         cards = self.cards
-        self.cards.clear()
+        self.cards = [] # A new list, since the old one is what we return
+        self.version += 1
+        self.hold(cards, -1)
         return cards
 
     def isEmpty(self):
@@ -373,6 +838,7 @@ class Card:
         self.rank = rank
         self.action = action
         self.points = self.assignPoints()
+        self.cardType = card_type(self) # Which of the 54 card types it is (see card_types), to look it up in tables
 
     def assignPoints(self):
         '''
@@ -422,7 +888,7 @@ class DiscardPile:
         Removes all of the cards in the discard pile and returns them.
         '''
         cards = self.cards
-        self.cards.clear()
+        self.cards = [] # A new list, since the old one is what we return
         return cards
 
     def removeAllButTopCard(self):
@@ -431,7 +897,7 @@ class DiscardPile:
         '''
         topCard = self.cards[-1]
         restOfCards = self.cards[:-1]
-        self.cards = topCard
+        self.cards = [topCard]
         return restOfCards
 
 
@@ -446,9 +912,10 @@ class DrawPile:
         '''
         Initializes a draw pile with the given attribute.
 
-        :param cards: list - A list containing 108 Card objects.
+        :param cards: list - A list of Card objects: 108 for each deck shuffled together.
         '''
         self.cards = cards # The top most card is represented by the last card in the list and vice versa
+        self.rng = random # What shuffles the pile: anything with a shuffle method, like a ShufflePool. Replayed deals use a seeded random.Random (see replayDeal)
 
     def isEmpty(self):
         '''
@@ -478,15 +945,35 @@ class DrawPile:
             self.reshuffle(discardPile)
             return self.cards.pop()
     
+    def forgetWildColors(self):
+        '''
+        Makes every wild card in the pile colorless again, forgetting the color it was played as.
+        '''
+        for card in self.cards:
+            if card.action == "Wild" or card.action == "Wild Draw Four":
+                card.changeColor(None)
+
+    def replayDeal(self, seed, roundNumber):
+        '''
+        Puts the pile in a fixed order and seeds its shuffles for a round, so every game with the same seed gets the same
+        shuffled deck in that round, however the rounds before it went. Call it before shuffleInitial.
+
+        :param seed: int - The deal's seed.
+        :param roundNumber: int - The round about to be dealt.
+        '''
+        self.cards.sort(key=lambda card: (card.cardType, card.color or "")) # Cards go back in whatever order the last round left them
+        self.rng = random.Random(f"{seed}/{roundNumber}")
+
     def shuffleInitial(self):
         '''
         Shuffle the draw pile at the beginning of the game.
         '''
-        random.shuffle(self.cards)
+        self.rng.shuffle(self.cards)
 
     def reshuffle(self, discardPile):
         '''
         Shuffles the draw pile once all cards have been drawn.
         '''
         self.cards = discardPile.removeAllButTopCard()
-        random.shuffle(self.cards)
\ No newline at end of file
+        self.forgetWildColors()
+        self.rng.shuffle(self.cards)
\ No newline at end of file
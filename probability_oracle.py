@@ -0,0 +1,173 @@
+from card_types import COLOR_INDEX, TYPE_COLOR, TYPE_RANK, TYPE_POINTS, WILD_TYPE, WILD_DRAW_FOUR_TYPE, card_type, is_playable
+
+ORACLE_CACHE_SIZE = 50000 # Answers kept before the cache is cleared
+
+
+
+def none_chance(population, successes, draws):
+    '''
+    Returns the chance that draws cards taken at random from population cards include none of the successes cards (hypergeometric).
+
+    Parameters:
+        population (int): How many cards there are to take from.
+        successes (int): How many of them count.
+        draws (int): How many cards are taken.
+    '''
+    if draws <= 0 or successes <= 0:
+        return 1.0
+    if draws > population - successes:
+        return 0.0 # There aren't enough other cards to fill the hand
+
+    chance = 1.0
+    for index in range(draws):
+        chance *= (population - successes - index) / (population - index)
+    return chance
+
+
+
+class ProbabilityOracle:
+    '''
+    Answers questions about the cards a player can't see, from their CardTracker's unseen counts, with hypergeometric math.
+
+    Every unseen card is as likely as any other to be the next draw, and another player's hand is as likely to be any set of the unseen
+    cards they might hold (by what the tracker inferred from their passes). Answers are cached by the unseen count vector and the
+    question, so asking again in the same position (or a later one with the same counts) is a lookup.
+
+    Set GameState.probabilityOracle to an oracle to have every ComputerPlayer with a tracker use it to choose moves.
+    '''
+    def __init__(self, cacheSize=ORACLE_CACHE_SIZE):
+        '''
+        Initializes an oracle.
+
+        :param cacheSize: int - Answers kept before the cache is cleared.
+        '''
+        self.cacheSize = cacheSize
+        self.cache = {} # Maps (question, unseen counts, arguments) to the answer
+        self.hits = 0
+        self.misses = 0
+
+    def cached(self, key, compute, *args):
+        '''
+        Returns the cached answer for a key, or works it out with compute(*args) and caches it.
+        '''
+        answer = self.cache.get(key)
+        if answer is not None:
+            self.hits += 1
+            return answer
+
+        self.misses += 1
+        answer = compute(*args)
+        if len(self.cache) >= self.cacheSize:
+            self.cache.clear()
+        self.cache[key] = answer
+        return answer
+
+    def playableDrawChance(self, tracker, topCard):
+        '''
+        Returns the chance that the next card drawn can be played on a top card.
+
+        :param tracker: CardTracker object - The tracker of the player asking.
+        :param topCard: Card object - The top card of the discard pile.
+        '''
+        topColor = COLOR_INDEX[topCard.color] if topCard.color is not None else None
+        counts = tuple(tracker.unseen)
+        return self.cached(("draw", counts, card_type(topCard), topColor), self.computePlayableDraw, counts, card_type(topCard), topColor)
+
+    def computePlayableDraw(self, counts, topType, topColor):
+        '''
+        Works out playableDrawChance from the unseen counts.
+        '''
+        total = sum(counts)
+        if total == 0:
+            return 0.0
+        playable = sum(count for cardType, count in enumerate(counts) if count and is_playable(cardType, topType, topColor))
+        return playable / total
+
+    def holdsColorChance(self, tracker, player, color):
+        '''
+        Returns the chance that another player holds at least one card of a color.
+
+        :param tracker: CardTracker object - The tracker of the player asking.
+        :param player: Player or ComputerPlayer object - The player whose hand is in question.
+        :param color: str - The color ("Red", ...).
+        '''
+        return self.holdsChance(tracker, player, ("color", COLOR_INDEX[color]))
+
+    def canPlayChance(self, tracker, player, topType, topColor):
+        '''
+        Returns the chance that another player holds a card they can play on a top card.
+
+        :param tracker: CardTracker object - The tracker of the player asking.
+        :param player: Player or ComputerPlayer object - The player whose hand is in question.
+        :param topType: int - The top card's type (see card_types).
+        :param topColor: int - The top card's color index (the declared color, for wild cards).
+        '''
+        return self.holdsChance(tracker, player, ("play", topType, topColor))
+
+    def holdsChance(self, tracker, player, question):
+        '''
+        Returns the chance that a player's hand has at least one card that answers a question: ("color", color index),
+        or ("play", top type, top color index).
+        '''
+        counts = tuple(tracker.unseen)
+        lacks = (frozenset(tracker.lacksColors.get(player, ())), frozenset(tracker.lacksRanks.get(player, ())), player in tracker.lacksWilds)
+        return self.cached((question, counts, len(player.hand.cards), lacks), self.computeHolds, question, counts, len(player.hand.cards), lacks)
+
+    def computeHolds(self, question, counts, handSize, lacks):
+        '''
+        Works out holdsChance from the unseen counts: the hand is handSize of the unseen cards the player doesn't probably lack.
+        '''
+        lacksColors, lacksRanks, lacksWilds = lacks
+        population = 0
+        successes = 0
+        for cardType, count in enumerate(counts):
+            if count == 0:
+                continue
+            if cardType >= WILD_TYPE:
+                if lacksWilds:
+                    continue
+            elif TYPE_COLOR[cardType] in lacksColors or TYPE_RANK[cardType] in lacksRanks:
+                continue
+
+            population += count
+            if question[0] == "color":
+                matches = TYPE_COLOR[cardType] == question[1]
+            else:
+                matches = is_playable(cardType, question[1], question[2])
+            if matches:
+                successes += count
+        return 1.0 - none_chance(population, successes, handSize)
+
+    def expectedPointsLeft(self, tracker, gameState):
+        '''
+        Returns how many points the other players' hands are expected to be worth, which is what the player asking scores if they win.
+
+        :param tracker: CardTracker object - The tracker of the player asking.
+        :param gameState: GameState object - The current game state.
+        '''
+        counts = tuple(tracker.unseen)
+        # Every card is in a pile or a hand, so the other hands hold the rest, without going round a big table to add them up.
+        cardsHeld = gameState.cardCount - len(gameState.drawPile.cards) - len(gameState.discardPile.cards) - len(tracker.observer.hand.cards)
+        return cardsHeld * self.cached(("points", counts), self.computeMeanPoints, counts)
+
+    def computeMeanPoints(self, counts):
+        '''
+        Works out the average points of an unseen card from the unseen counts.
+        '''
+        total = sum(counts)
+        if total == 0:
+            return 0.0
+        return sum(count * TYPE_POINTS[cardType] for cardType, count in enumerate(counts)) / total
+
+    def nextSeat(self, gameState, seat, cardType):
+        '''
+        Returns the seat that moves next after the player in a seat plays a card type, the way GameState.playCard moves play on.
+        '''
+        numPlayers = len(gameState.players)
+        direction = gameState.direction
+        rank = TYPE_RANK[cardType]
+        if rank == "Skip" or rank == "Draw Two" or cardType == WILD_DRAW_FOUR_TYPE:
+            return (seat + 2 * direction) % numPlayers
+        if rank == "Reverse":
+            return seat if numPlayers == 2 else (seat - direction) % numPlayers
+        return (seat + direction) % numPlayers
@@ -0,0 +1,277 @@
+import math
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy") # No window is needed, so this runs on machines without a display
+
+import random
+import sys
+import time
+
+import pygame
+
+import objects as obj
+import game_logic as gl
+import user_interface as ui
+
+BENCHMARK_WIDTH = 800 # The canvas (and window) size to benchmark at. They're the same, so mouse positions need no scaling
+BENCHMARK_HEIGHT = 600
+BENCHMARK_FRAMES = 100000 # How many frames a phase can keep numbers for. Far more than any phase runs for
+HAND_SIZES = [7, 30, 100] # The synthetic hands the turn screen is benchmarked with
+HOVER_PASSES = 3 # How many times the mouse sweeps back and forth over the things on a screen
+DRAG_STEPS = 30 # How many frames a drag takes to get where it's going
+SEED = 0 # Seeds the synthetic hands, so every run benchmarks the same thing
+
+
+
+def motion(pos, held=False):
+    '''
+    Returns a mouse motion event to the given position, with the left button held or not.
+    '''
+    return pygame.event.Event(pygame.MOUSEMOTION, pos=pos, rel=(0, 0), buttons=(int(held), 0, 0))
+
+
+def press(pos):
+    '''
+    Returns a left mouse button down event at the given position.
+    '''
+    return pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1)
+
+
+def release(pos):
+    '''
+    Returns a left mouse button up event at the given position.
+    '''
+    return pygame.event.Event(pygame.MOUSEBUTTONUP, pos=pos, button=1)
+
+
+def key(keyCode, text=""):
+    '''
+    Returns a key down event for the given key, which types the given text.
+    '''
+    return pygame.event.Event(pygame.KEYDOWN, key=keyCode, unicode=text, mod=0, scancode=0)
+
+
+def center(clickable):
+    '''
+    Returns the center of a clickable, as a tuple of ints.
+    '''
+    return (int(clickable.rectangle.centerx), int(clickable.rectangle.centery))
+
+
+def sweep(positions):
+    '''
+    Yields one frame per position, moving the mouse back and forth over every position HOVER_PASSES times.
+    '''
+    for sweepPass in range(HOVER_PASSES):
+        ordered = positions if sweepPass % 2 == 0 else positions[::-1]
+        for pos in ordered:
+            yield [motion(pos)]
+
+
+def click(pos):
+    '''
+    Yields the frames of a click at the given position: moving there, pressing, and releasing.
+    '''
+    yield [motion(pos)]
+    yield [press(pos)]
+    yield [release(pos)]
+
+
+def drag(start, end):
+    '''
+    Yields the frames of dragging from start to end with the left button held, in DRAG_STEPS frames. The button is never released.
+    '''
+    yield [motion(start)]
+    yield [press(start)]
+    for step in range(1, DRAG_STEPS + 1):
+        x = start[0] + (end[0] - start[0]) * step // DRAG_STEPS
+        y = start[1] + (end[1] - start[1]) * step // DRAG_STEPS
+        yield [motion((x, y), held=True)]
+    yield [motion(end, held=True)]
+
+
+def type_text(text):
+    '''
+    Yields the frames of typing text into a .typingPrompt, one letter a frame, and then pressing enter.
+    '''
+    for letter in text:
+        yield [key(pygame.key.key_code(letter), letter)]
+    yield [key(pygame.K_RETURN, "\r")]
+
+
+
+class ScriptedPygameWrapper(ui.PygameWrapper):
+    '''
+    A PygameWrapper that never waits between frames, and posts scripted input to pygame's event queue at the start of every frame.
+
+    The script is a generator of lists of events, one list a frame, so later frames can be worked out from where things are on screen.
+    Posting real events means the benchmark goes through the same input handling as the game.
+    '''
+    def __init__(self, screenWidth, screenHeight):
+        super().__init__(screenWidth, screenHeight)
+        self.frameLength = 0 # Run frames as fast as they can go
+        self.script = iter(())
+
+    def setScript(self, script):
+        '''
+        Sets the generator of per-frame event lists to play from the next frame on.
+        '''
+        self.script = iter(script)
+
+    def updateInput(self):
+        '''
+        Posts the next frame of the script, then reads input like usual. See PygameWrapper.updateInput.
+        '''
+        for event in next(self.script, []):
+            pygame.event.post(event)
+        return super().updateInput()
+
+
+
+class RenderBenchmark:
+    '''
+    Benchmarks the menus and the turn screen with scripted input, under the dummy video driver.
+
+    Each phase gets its own PerfOverlay to record into, so its frames per second, frame times and surface allocations are kept apart.
+    '''
+    def __init__(self):
+        self.pygameWrapper = ScriptedPygameWrapper(BENCHMARK_WIDTH, BENCHMARK_HEIGHT)
+        self.menu = ui.Menu(self.pygameWrapper)
+
+        self.gameState = obj.GameState(gl.create_deck())
+        self.userInterface = ui.UserInterface(self.pygameWrapper, self.gameState.discardPile, self.gameState.drawPile)
+        self.gameState.discardPile.addCard(obj.Card("Red", 5))
+
+        self.results = [] # (phase name, stats) for every phase, in the order they ran
+        self.phaseName = None
+        self.phaseStart = 0.0
+
+    def beginPhase(self, name):
+        '''
+        Ends the current phase (if any), and starts recording a new one.
+        '''
+        self.endPhase()
+        self.phaseName = name
+        self.phaseStart = time.perf_counter()
+        self.pygameWrapper.perfOverlay = ui.PerfOverlay(self.pygameWrapper, BENCHMARK_FRAMES)
+
+    def endPhase(self):
+        '''
+        Ends the current phase, and saves its numbers to .results.
+        '''
+        if self.phaseName is None:
+            return
+
+        elapsed = time.perf_counter() - self.phaseStart
+        overlay = self.pygameWrapper.perfOverlay
+        frames = len(overlay.frameLengths)
+        sortedTimes = sorted(overlay.renderTimes)
+        stats = {
+            "frames": frames,
+            "fps": frames / elapsed if elapsed > 0 else 0.0,
+            "p50": overlay.percentile(sortedTimes, 50) if frames else 0.0,
+            "p95": overlay.percentile(sortedTimes, 95) if frames else 0.0,
+            "surfaces": sum(overlay.allocations) / frames if frames else 0.0,
+        }
+        self.results.append((self.phaseName, stats))
+        self.phaseName = None
+
+    def menuScript(self):
+        '''
+        Yields the main menu, settings menu and new game menu frames: hovering over everything, and setting up all 10 player slots.
+        '''
+        menu = self.menu
+
+        self.beginPhase("main menu")
+        yield from sweep([center(clickable) for clickable, pos in menu.mainMenuLayout])
+        yield from click(center(menu.settingsButton))
+
+        self.beginPhase("settings menu")
+        yield from sweep([center(clickable) for clickable, pos in menu.settingsMenuLayout])
+        yield from click(center(menu.backButton))
+
+        yield from click(center(menu.startNewGame))
+
+        self.beginPhase("new game menu, 10 players")
+        yield from sweep([center(clickable) for clickable in menu.newGameClickables])
+        for index, player in enumerate(menu.players):
+            choice = menu.robotChoice if index % 2 == 0 else menu.playerChoice
+            yield from drag(center(player), center(choice))
+            yield [release(center(choice))]
+        yield from click(center(menu.startNewGame))
+
+        self.beginPhase("new game prompts")
+        for index in range(len(menu.players)):
+            yield from type_text(f"Player {index + 1}")
+        yield from type_text("1")
+
+    def turnScript(self, handSize):
+        '''
+        Yields the frames of a turn with a hand of handSize cards: hovering over the hand, paging through it, and dragging a card to the discard pile.
+        '''
+        userInterface = self.userInterface
+
+        self.beginPhase(f"turn, {handSize} cards")
+        yield [release(center(userInterface.discardClick))] # Let go of the card the last turn dropped
+        yield from sweep([(int(x), int(y)) for x, y in userInterface.cardSlots])
+
+        pages = (handSize - 1) // userInterface.cardsPerRender
+        for page in range(pages):
+            yield from click(center(userInterface.rightArrow))
+        for page in range(pages):
+            yield from click(center(userInterface.leftArrow))
+
+        yield from drag(center(userInterface.cards[0]), center(userInterface.discardClick))
+
+    def syntheticPlayer(self, handSize, rng):
+        '''
+        Returns a player with a hand of handSize different random cards, from as many decks as it takes to have that many.
+        '''
+        player = obj.Player(f"Benchmark {handSize}")
+        deck = gl.create_deck(math.ceil(handSize / gl.CARDS_PER_DECK))
+        player.hand.addCards(rng.sample(deck, handSize))
+        return player
+
+    def run(self):
+        '''
+        Runs every phase of the benchmark, and returns the results.
+        '''
+        self.pygameWrapper.setScript(self.menuScript())
+        players = self.menu.mainMenu()
+        self.endPhase()
+        assert len(players) == len(self.menu.players), "The scripted new game menu did not set up every player"
+
+        rng = random.Random(SEED)
+        for handSize in HAND_SIZES:
+            player = self.syntheticPlayer(handSize, rng)
+            self.pygameWrapper.setScript(self.turnScript(handSize))
+            playedCard = self.userInterface.interfaceUser(player)
+            self.endPhase()
+            assert playedCard in player.hand.cards, "The scripted drag did not play a card"
+
+        return self.results
+
+
+
+def print_results(results):
+    '''
+    Prints a table of benchmark results.
+
+    Parameters:
+        results (list): (phase name, stats) tuples, from RenderBenchmark.run.
+    '''
+    print(f"{'phase':<28}{'frames':>8}{'fps':>10}{'p50 ms':>9}{'p95 ms':>9}{'surfaces/frame':>16}")
+    for name, stats in results:
+        print(f"{name:<28}{stats['frames']:>8}{stats['fps']:>10.1f}{stats['p50']:>9.2f}{stats['p95']:>9.2f}{stats['surfaces']:>16.2f}")
+
+
+
+def main():
+    benchmark = RenderBenchmark()
+    print_results(benchmark.run())
+    pygame.quit()
+    return 0
+
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,224 @@
+import queue
+import sqlite3
+import threading
+import time
+
+import objects as obj
+
+RESULTS_PATH = "results.db" # Where main keeps the results of every game played
+RESULTS_BATCH_SIZE = 256 # Most games the writer puts in one transaction
+
+# The game sends the writer thread one record per finished game: (game row, seat rows, round rows). Seat and round rows start
+# with the game's id, which SQLite only gives out when the writer inserts the game row, so they're queued without it.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    seed INTEGER,
+    players INTEGER NOT NULL,
+    rules TEXT NOT NULL,
+    rounds INTEGER NOT NULL,
+    winner_seat INTEGER NOT NULL,
+    seconds REAL NOT NULL,
+    engine_seconds REAL,
+    finished_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS seats (
+    game INTEGER NOT NULL,
+    seat INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    strategy TEXT NOT NULL,
+    points INTEGER NOT NULL,
+    won INTEGER NOT NULL,
+    PRIMARY KEY (game, seat)
+);
+CREATE TABLE IF NOT EXISTS rounds (
+    game INTEGER NOT NULL,
+    round INTEGER NOT NULL,
+    winner_seat INTEGER NOT NULL,
+    points INTEGER NOT NULL,
+    PRIMARY KEY (game, round)
+);
+CREATE INDEX IF NOT EXISTS seats_by_strategy ON seats (strategy, won);
+CREATE INDEX IF NOT EXISTS seats_by_seat ON seats (seat, won);
+"""
+
+INSERT_GAME = "INSERT INTO games VALUES (NULL, ?, ?, ?, ?, ?, ?, ?, ?)" # SQLite picks the id, so stores sharing a file never clash
+INSERT_SEAT = "INSERT INTO seats VALUES (?, ?, ?, ?, ?, ?)"
+INSERT_ROUND = "INSERT INTO rounds VALUES (?, ?, ?, ?)"
+
+
+
+def strategy_name(player, gameState):
+    '''
+    Returns the name of how a player chooses their moves, for grouping results by strategy.
+
+    Parameters:
+        player (Player or ComputerPlayer): The player.
+        gameState (GameState): The game they're playing.
+    '''
+    if type(player) is obj.Player:
+        return "human"
+
+    playsOdds = player.playsOdds and gameState.probabilityOracle is not None and player.tracker is not None
+    name = "odds" if playsOdds else "random"
+    if player.searchesEndgames and gameState.endgameSolver is not None:
+        name += "+endgame"
+    return name
+
+
+
+class ResultsStore:
+    '''
+    Records every finished game and round in a SQLite database.
+
+    The game never waits on the disk: recording only puts rows on a queue, and a writer thread with its own connection writes them
+    in batches, one transaction per batch. The database is in WAL mode, so it can be read (by winRates, or any other connection)
+    while the writer is writing. Game ids are given out by SQLite as each game is written, so any number of stores (in any number
+    of processes) can record into the same file.
+
+    Set GameState.resultsStore to a store to have game_logic.game_loop record the game. Call close when done, which writes
+    whatever is still queued.
+    '''
+    def __init__(self, path=RESULTS_PATH, batchSize=RESULTS_BATCH_SIZE):
+        '''
+        Opens (or creates) a results database, and starts its writer thread.
+
+        :param path: str - The database file.
+        :param batchSize: int - Most games the writer puts in one transaction.
+        '''
+        self.path = path
+        self.batchSize = batchSize
+
+        connection = self.connect()
+        with connection:
+            connection.executescript(SCHEMA)
+        connection.close()
+
+        self.records = queue.Queue()
+        self.idLock = threading.Lock() # Games can be played on more than one thread
+        self.nextKey = 1 # Keys for the games being recorded. They're only this store's, and never written
+        self.started = {} # Maps the key of a game being recorded to when it started, and its engine time then
+        self.rounds = {} # Maps the key of a game being recorded to its finished rounds' rows, without the game id
+        self.error = None # The exception that stopped the writer, if one did
+        self.writer = threading.Thread(target=self.write, name="uno-results", daemon=True)
+        self.writer.start()
+
+    def connect(self):
+        '''
+        Returns a new connection to the database, in WAL mode.
+        '''
+        connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL") # WAL is still safe from corruption without syncing every transaction
+        return connection
+
+    def startGame(self, gameState):
+        '''
+        Starts recording a game, and sets its gameState.resultsId to the key it's recorded under until it's written.
+
+        :param gameState: GameState object - The game, before its first round.
+        '''
+        with self.idLock:
+            gameState.resultsId = self.nextKey
+            self.nextKey += 1
+        engineTime = getattr(gameState.userInterface, "engineTime", None) # Games on a worker thread time their own work
+        self.started[gameState.resultsId] = (time.perf_counter(), engineTime)
+        self.rounds[gameState.resultsId] = []
+
+    def recordRound(self, gameState, points):
+        '''
+        Records a finished round. Call it once the winner's points are added up, before the round winner is reset.
+
+        :param gameState: GameState object - The game.
+        :param points: int - The points the round winner scored.
+        '''
+        winnerSeat = gameState.players.index(gameState.roundWinner)
+        self.rounds[gameState.resultsId].append((gameState.round, winnerSeat, points)) # Queued with the game, once it has an id
+
+    def finishGame(self, gameState):
+        '''
+        Records a finished game, and how each seat did in it.
+
+        :param gameState: GameState object - The game, once it has a winner.
+        '''
+        key = gameState.resultsId
+        started, engineTime = self.started.pop(key)
+        seconds = time.perf_counter() - started
+        engineSeconds = None
+        if engineTime is not None:
+            engineSeconds = gameState.userInterface.engineTime - engineTime
+
+        winnerSeat = gameState.players.index(gameState.gameWinner)
+        seatRows = [(seat, player.name, strategy_name(player, gameState), player.points, int(seat == winnerSeat))
+                    for seat, player in enumerate(gameState.players)]
+        rounds = gameState.round - 1 # game_loop moves on to the next round even after the last one
+        gameRow = (gameState.seed, len(gameState.players), gameState.rules.describe(), rounds, winnerSeat,
+                   seconds, engineSeconds, time.time())
+        self.records.put((gameRow, seatRows, self.rounds.pop(key)))
+
+    def write(self):
+        '''
+        The writer thread: waits for records, and writes everything queued, up to batchSize games a transaction.
+        Each game's row goes in first, and its seats and rounds are written with the id SQLite gave it. A None record stops it.
+        '''
+        connection = self.connect()
+        running = True
+        while running:
+            batch = [self.records.get()]
+            while len(batch) < self.batchSize:
+                try:
+                    batch.append(self.records.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                with connection: # One transaction for the whole batch
+                    for record in batch:
+                        if record is None:
+                            running = False
+                            continue
+                        gameRow, seatRows, roundRows = record
+                        gameId = connection.execute(INSERT_GAME, gameRow).lastrowid
+                        connection.executemany(INSERT_SEAT, [(gameId,) + row for row in seatRows])
+                        connection.executemany(INSERT_ROUND, [(gameId,) + row for row in roundRows])
+            except sqlite3.Error as error:
+                self.error = error # Recording is best effort, so the game carries on. flush and close raise it
+            finally:
+                for _ in batch:
+                    self.records.task_done()
+        connection.close()
+
+    def flush(self):
+        '''
+        Waits until everything recorded so far is written.
+        '''
+        self.records.join()
+        if self.error is not None:
+            raise self.error
+
+    def close(self):
+        '''
+        Writes everything still queued, and stops the writer thread.
+        '''
+        self.records.put(None)
+        self.writer.join()
+        if self.error is not None:
+            raise self.error
+
+    def winRates(self, groupBy="strategy"):
+        '''
+        Returns a list of (group, games, win rate) for every strategy or seat, from everything written so far.
+
+        :param groupBy: str - "strategy" or "seat". Both are indexed, so this stays quick with lots of games.
+        '''
+        if groupBy not in ("strategy", "seat"):
+            raise ValueError("Win rates can only be grouped by strategy or seat.")
+
+        self.flush()
+        connection = self.connect()
+        try:
+            query = f"SELECT {groupBy}, COUNT(*), AVG(won) FROM seats GROUP BY {groupBy} ORDER BY {groupBy}"
+            return connection.execute(query).fetchall()
+        finally:
+            connection.close()
@@ -0,0 +1,107 @@
+from card_types import TYPE_RANK, WILD_TYPE, WILD_DRAW_FOUR_TYPE, CARD_TYPES
+
+# What playing a card does. GameState.playCard looks the effect up by card type, and calls the handler at that index of GameState.EFFECTS.
+NUMBER = 0 # Nothing, play moves on
+SKIP = 1
+REVERSE = 2
+DRAW_TWO = 3
+WILD = 4
+WILD_DRAW_FOUR = 5
+SWAP_HANDS = 6 # 7-0: the player swaps hands with another player
+ROTATE_HANDS = 7 # 7-0: every hand moves on to the next player, in the direction of play
+
+HOUSE_RULE_LETTERS = {"s": "stacking", "7": "sevenZero", "j": "jumpIn", "d": "drawToMatch"} # For typing house rules in the settings menu
+
+
+
+class RuleSet:
+    '''
+    The rules a game is played by: the standard rules, plus any house rules that are turned on.
+
+    The rules are compiled into tables indexed by card type when the rule set is made, so the game never checks which
+    house rules are on while it plays. It just looks up what a card does, how many cards it makes the next player draw,
+    and what can be stacked on it.
+    '''
+    def __init__(self, stacking=False, sevenZero=False, jumpIn=False, drawToMatch=False):
+        '''
+        Initializes a rule set, and compiles its tables.
+
+        :param stacking: bool - A player hit by a Draw Two or Wild Draw Four can play another one instead of drawing,
+            passing the total on to the next player. A Draw Two can go on a Draw Two, and a Wild Draw Four on either.
+        :param sevenZero: bool - Playing a 7 swaps hands with another player, and playing a 0 passes every hand on.
+        :param jumpIn: bool - A player holding a card just like the top card (same color and rank) can play it out of turn,
+            and play carries on from them.
+        :param drawToMatch: bool - A player who can't play keeps drawing until they draw a card they can play.
+        '''
+        self.stacking = stacking
+        self.sevenZero = sevenZero
+        self.jumpIn = jumpIn
+        self.drawToMatch = drawToMatch
+        self.compile()
+
+    @classmethod
+    def fromLetters(cls, letters):
+        '''
+        Returns a rule set with the house rules in HOUSE_RULE_LETTERS whose letters are in a string turned on.
+
+        :param letters: str - Letters typed by the user. Anything that isn't a house rule letter is ignored.
+        '''
+        letters = letters.lower()
+        return cls(**{name: letter in letters for letter, name in HOUSE_RULE_LETTERS.items()})
+
+    def compile(self):
+        '''
+        Builds the lookup tables the game plays by.
+        '''
+        self.effects = [NUMBER] * CARD_TYPES # What each card type does when played
+        self.drawPenalty = [0] * CARD_TYPES # How many cards each card type makes the next player draw
+        for cardType in range(CARD_TYPES):
+            rank = TYPE_RANK[cardType]
+            if rank == "Skip":
+                self.effects[cardType] = SKIP
+            elif rank == "Reverse":
+                self.effects[cardType] = REVERSE
+            elif rank == "Draw Two":
+                self.effects[cardType] = DRAW_TWO
+                self.drawPenalty[cardType] = 2
+            elif self.sevenZero and rank == 7:
+                self.effects[cardType] = SWAP_HANDS
+            elif self.sevenZero and rank == 0:
+                self.effects[cardType] = ROTATE_HANDS
+        self.effects[WILD_TYPE] = WILD
+        self.effects[WILD_DRAW_FOUR_TYPE] = WILD_DRAW_FOUR
+        self.drawPenalty[WILD_DRAW_FOUR_TYPE] = 4
+
+        # stackOn[pending type][card type] says whether a card type can be played on a pending draw left by the pending type.
+        # Without stacking nothing can, and a draw card is drawn straight away, so the game never has a pending draw to look at.
+        self.stackOn = [[False] * CARD_TYPES for _ in range(CARD_TYPES)]
+        if self.stacking:
+            drawTwoTypes = [cardType for cardType in range(WILD_TYPE) if TYPE_RANK[cardType] == "Draw Two"]
+            for pendingType in drawTwoTypes:
+                for cardType in drawTwoTypes + [WILD_DRAW_FOUR_TYPE]:
+                    self.stackOn[pendingType][cardType] = True
+            self.stackOn[WILD_DRAW_FOUR_TYPE][WILD_DRAW_FOUR_TYPE] = True
+
+        # Only colored cards can be jumped in with, since two wild cards aren't alike once one has been given a color.
+        self.canJumpIn = [self.jumpIn and cardType < WILD_TYPE for cardType in range(CARD_TYPES)]
+
+        self.isDefault = not (self.stacking or self.sevenZero or self.jumpIn or self.drawToMatch)
+
+    def describe(self):
+        '''
+        Returns the names of the house rules that are on, for showing to the user.
+        '''
+        names = []
+        if self.stacking:
+            names.append("stacking")
+        if self.sevenZero:
+            names.append("7-0")
+        if self.jumpIn:
+            names.append("jump-in")
+        if self.drawToMatch:
+            names.append("draw to match")
+        return ", ".join(names) if names else "none"
+
+
+
+DEFAULT_RULES = RuleSet() # The standard rules, with no house rules
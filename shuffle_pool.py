@@ -0,0 +1,98 @@
+from operator import itemgetter
+
+import numpy as np
+
+SHUFFLE_FIRST_BATCH = 16 # Permutations made the first time a recurring pile size is pooled
+SHUFFLE_MAX_BATCH = 4096 # The most permutations made at once for a pile size. Batches double up to this as a size keeps coming up
+SHUFFLE_RECURRING = 4 # How many times a pile size is shuffled before it's pooled. Sizes that come up less are shuffled one at a time
+SHUFFLE_MAX_POOLED = 1 << 20 # The most permutation entries kept over every pool (4 MB of int32s)
+
+
+
+class ShufflePool:
+    '''
+    Shuffles lists with permutations made in bulk by NumPy, instead of random.shuffle's one Python level swap at a time.
+
+    Lengths that keep coming up (like a full deck) get their permutations made a batch at a time, with one vectorized call, and kept
+    in a pool as an int32 array. Shuffling a list takes the next row and applies it with a single gather. Lengths seen only a few
+    times (like the odd sized discard piles a reshuffle puts back) get one permutation made on the spot instead, so they're never
+    pooled. Batches double as a length keeps coming up, but every pool together holds at most maxPooled entries: a batch that
+    wouldn't fit is made smaller, and the pools of other lengths are dropped to make room.
+
+    A pool has a shuffle method like the random module's, so it can be a DrawPile's rng. It's seedable: the same seed, and the same
+    list lengths shuffled in the same order, give the same shuffles.
+    '''
+    def __init__(self, seed=None, firstBatch=SHUFFLE_FIRST_BATCH, maxBatch=SHUFFLE_MAX_BATCH, recurring=SHUFFLE_RECURRING,
+                 maxPooled=SHUFFLE_MAX_POOLED):
+        '''
+        Initializes a shuffle pool.
+
+        :param seed: int - Seeds the permutations. None seeds them from the operating system.
+        :param firstBatch: int - Permutations made the first time a length is pooled.
+        :param maxBatch: int - The most permutations made at once for a length.
+        :param recurring: int - How many times a length is shuffled before it's pooled.
+        :param maxPooled: int - The most permutation entries kept over every pool.
+        '''
+        self.firstBatch = firstBatch
+        self.maxBatch = maxBatch
+        self.recurring = recurring
+        self.maxPooled = maxPooled
+        self.seed(seed)
+
+    def seed(self, seed=None):
+        '''
+        Reseeds the pool, and forgets every permutation made so far.
+
+        :param seed: int - The new seed (or a list of ints, like [seed, index]), or None to seed from the operating system.
+        '''
+        self.generator = np.random.default_rng(seed)
+        self.seen = {} # Maps a list length to how many times it's been shuffled, until it's pooled
+        self.pools = {} # Maps a pooled list length to [its permutations, the next row to use, the size of the next batch]
+        self.pooled = 0 # Permutation entries kept over every pool
+
+    def refill(self, length, pool):
+        '''
+        Makes a new batch of permutations of a length for its pool, keeping every pool together within maxPooled entries.
+        '''
+        batch = max(1, min(pool[2], self.maxPooled // length))
+        self.pooled -= pool[0].size
+        if self.pooled + batch * length > self.maxPooled:
+            for otherLength in [otherLength for otherLength in self.pools if otherLength != length]:
+                self.pooled -= self.pools.pop(otherLength)[0].size
+
+        order = np.arange(length, dtype=np.int32)
+        pool[0] = self.generator.permuted(np.broadcast_to(order, (batch, length)), axis=1) # Each row shuffled on its own
+        pool[1] = 0
+        pool[2] = min(pool[2] * 2, self.maxBatch)
+        self.pooled += pool[0].size
+
+    def permutation(self, length):
+        '''
+        Returns a random order of the indexes of a list of a length, from its pool if it's a length that keeps coming up.
+        '''
+        pool = self.pools.get(length)
+        if pool is None:
+            seen = self.seen.get(length, 0) + 1
+            if seen < self.recurring:
+                self.seen[length] = seen
+                return self.generator.permutation(length)
+            del self.seen[length]
+            pool = self.pools[length] = [np.empty((0, length), dtype=np.int32), 0, self.firstBatch]
+
+        if pool[1] == len(pool[0]):
+            self.refill(length, pool)
+        permutation = pool[0][pool[1]]
+        pool[1] += 1
+        return permutation
+
+    def shuffle(self, cards):
+        '''
+        Shuffles a list in place.
+
+        :param cards: list - The list to shuffle.
+        '''
+        length = len(cards)
+        if length < 2:
+            return # itemgetter of one index returns the item instead of a tuple, and there's nothing to shuffle anyway
+
+        cards[:] = itemgetter(*self.permutation(length).tolist())(cards)
@@ -0,0 +1,187 @@
+import threading
+
+import objects as obj
+import game_logic as gl
+import rules
+
+SPECULATION_DEPTH = 3 # How many computer turns after a human's move are worked out ahead of time
+COLORS = ["Red", "Yellow", "Blue", "Green"]
+
+
+
+def decision_key(gameState, player):
+    '''
+    Returns a key describing everything a computer player's decision can depend on.
+
+    Two game states with the same key give the same choices, so a decision worked out on a copy of the game can be reused on the real one.
+
+    Parameters:
+        gameState (GameState): The game state the decision is made in.
+        player (ComputerPlayer): The player making the decision.
+    '''
+    topCard = gameState.discardPile.topCard
+    return (
+        gameState.currentPlayerIndex,
+        gameState.direction,
+        (topCard.color, topCard.rank),
+        len(gameState.drawPile.cards),
+        tuple((card.color, card.rank) for card in player.hand.cards),
+        tuple(len(otherPlayer.hand.cards) for otherPlayer in gameState.players),
+        gameState.pendingDraw,
+    )
+
+
+
+class Speculator:
+    '''
+    Works out computer players' turns while a human player is still deciding on their move.
+
+    When a human's turn starts, a background thread plays every move the human could make on a copy of the game,
+    followed by the computer players that come after them, and caches the decisions those computer players make.
+    Once the human commits, the computer players look up their decision instead of working it out again.
+    '''
+    def __init__(self, depth=SPECULATION_DEPTH):
+        '''
+        Initializes a speculator.
+
+        :param depth: int - How many computer turns after the human's move to work out.
+        '''
+        self.depth = depth
+        self.cache = {} # Maps a decision key to the (hand index, color) the computer player chose
+        self.lock = threading.Lock()
+        self.stopEvent = threading.Event()
+        self.worker = None
+        self.hits = 0 # How many computer turns used a cached decision
+        self.misses = 0 # How many computer turns had to decide on the spot
+
+    def start(self, gameState, human):
+        '''
+        Starts working out computer turns for every move the human could make.
+
+        The game state is copied here, on the game's thread, so the background thread never touches the real game.
+
+        :param gameState: GameState object - The current game state.
+        :param human: Player object - The human whose turn it is.
+        '''
+        self.stop()
+        with self.lock:
+            self.cache = {} # Anything left over is from an earlier turn, and can never be used
+
+        if not any(type(player) is obj.ComputerPlayer for player in gameState.players):
+            return
+
+        baseState = gameState.copy()
+        self.stopEvent.clear()
+        self.worker = threading.Thread(target=self.speculate, args=(baseState,), name="uno-speculator", daemon=True)
+        self.worker.start()
+
+    def stop(self):
+        '''
+        Stops working out computer turns. Called once the human has committed to a move.
+        '''
+        if self.worker is not None:
+            self.stopEvent.set()
+            self.worker.join()
+            self.worker = None
+
+    def lookup(self, gameState, player):
+        '''
+        Returns the (card, color) move a computer player was worked out to make in this exact game state, or None.
+
+        :param gameState: GameState object - The current game state.
+        :param player: ComputerPlayer object - The player whose turn it is.
+        '''
+        with self.lock:
+            move = self.cache.pop(decision_key(gameState, player), None)
+
+        if move is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        handIndex, color = move
+        return player.hand.cards[handIndex], color
+
+    def humanMoves(self, gameState):
+        '''
+        Returns every move the current (human) player could make, as (kind, hand index, color) tuples.
+
+        A kind of "play" plays the card at hand index, and a kind of "draw" draws a card and plays it if hand index is not None.
+        Wild cards are tried with every color.
+        '''
+        human = gameState.players[gameState.currentPlayerIndex]
+        moves = []
+
+        for handIndex, card in enumerate(human.hand.cards):
+            if gameState.rules.effects[card.cardType] == rules.SWAP_HANDS:
+                continue # Who the human would swap with can't be guessed
+            if gameState.isCardPlayable(card):
+                for color in self.colorsFor(card):
+                    moves.append(("play", handIndex, color))
+
+        moves.append(("draw", None, None)) # Draw, and keep the drawn card
+        if not gameState.drawPile.isEmpty() and not gameState.pendingDraw and not gameState.rules.drawToMatch:
+            drawnCard = gameState.drawPile.cards[-1] # The draw pile's order is already set, so we know what would be drawn
+            if gameState.isCardPlayable(drawnCard):
+                for color in self.colorsFor(drawnCard):
+                    moves.append(("draw", len(human.hand.cards), color)) # Draw, and play the drawn card
+
+        return moves
+
+    def colorsFor(self, card):
+        '''
+        Returns the colors a card could be played as: every color for wild cards, and just None for anything else.
+        '''
+        if card.action == "Wild" or card.action == "Wild Draw Four":
+            return COLORS
+        return [None]
+
+    def speculate(self, baseState):
+        '''
+        Plays out every human move on a copy of the game, and then the computer turns after it. Runs on the background thread.
+        '''
+        for kind, handIndex, color in self.humanMoves(baseState):
+            if self.stopEvent.is_set():
+                return
+
+            gameState = baseState.copy()
+            human = gameState.players[gameState.currentPlayerIndex]
+
+            if kind == "play":
+                gameState.playCard(human, human.hand.cards[handIndex], color=color)
+            elif gameState.pendingDraw:
+                gameState.takePendingDraw(human)
+            else:
+                gameState.drawForTurn(human)
+                if handIndex is not None:
+                    gameState.playCard(human, human.hand.cards[handIndex], color=color)
+                else:
+                    gameState.nextPlayer()
+
+            if not human.hand.isEmpty():
+                self.speculateComputerTurns(gameState)
+
+    def speculateComputerTurns(self, gameState):
+        '''
+        Plays the computer turns that follow a human move, caching every decision made along the way.
+        '''
+        for _ in range(self.depth):
+            if self.stopEvent.is_set():
+                return
+
+            player = gameState.players[gameState.currentPlayerIndex]
+            if type(player) is not obj.ComputerPlayer:
+                return # It's a human's turn again, and we can't guess what they will do
+
+            playableCards = gameState.playableCards(player)
+            if len(playableCards) > 0:
+                key = decision_key(gameState, player)
+                card, color = player.chooseMove(gameState, playableCards)
+                with self.lock:
+                    self.cache[key] = (player.hand.cards.index(card), color)
+                gameState.playCard(player, card, color=color)
+            else:
+                gl.take_turn(player, gameState) # Drawing involves no decision, so there is nothing to cache
+
+            if player.hand.isEmpty():
+                return # The round is over
@@ -0,0 +1,94 @@
+import random
+import sys
+import time
+
+import objects as obj
+import game_logic as gl
+import shuffle_pool as sp
+
+TABLE_SIZES = [4, 10, 50, 200] # The seat counts to benchmark, each with as many decks as game_logic.decks_needed says
+BENCHMARK_TURNS = 20000 # Turns played at each table size. Rounds are dealt again as they end, until this many turns are played
+SEED = 0 # Seeds the shuffles, so every run benchmarks the same games
+
+
+
+def play_table(numPlayers, turns, rng):
+    '''
+    Plays computer players' turns at a table until turns turns are played, and returns its numbers.
+    The players are set up like a real game's, with game_logic.equip_computers.
+
+    Parameters:
+        numPlayers (int): How many computer players sit at the table.
+        turns (int): How many turns to play.
+        rng (random.Random): Seeds the shuffles.
+    '''
+    numDecks = gl.decks_needed(numPlayers)
+    gameState = obj.GameState(gl.create_deck(numDecks))
+    gameState.verbose = False
+    gameState.players = [obj.ComputerPlayer(f"Computer {seat + 1}") for seat in range(numPlayers)]
+    gl.equip_computers(gameState) # Trackers, oracle and endgame solver, like main sets up for computer players
+    gameState.drawPile.rng = sp.ShufflePool(rng.randrange(2**32))
+
+    dealTime = 0.0
+    turnTime = 0.0
+    deals = 0
+    played = 0
+    while played < turns:
+        # Every card goes back in the draw pile before each deal, like at the start of a game.
+        for player in gameState.players:
+            gameState.drawPile.cards += player.hand.removeAllCards()
+        gameState.drawPile.cards += gameState.discardPile.removeAllCards()
+        gameState.currentPlayerIndex = 0
+        gameState.direction = 1
+
+        start = time.perf_counter()
+        gameState.drawPile.shuffleInitial()
+        gameState.dealCards()
+        gameState.setTopCard()
+        dealTime += time.perf_counter() - start
+        deals += 1
+
+        start = time.perf_counter()
+        while played < turns:
+            player = gameState.players[gameState.currentPlayerIndex]
+            gl.take_turn(player, gameState)
+            played += 1
+            if player.hand.isEmpty():
+                break
+        turnTime += time.perf_counter() - start
+
+    return {
+        "decks": numDecks,
+        "deals": deals,
+        "dealMs": dealTime / deals * 1000,
+        "turnsPerSecond": played / turnTime,
+        "turnUs": turnTime / played * 1000000,
+    }
+
+
+
+def print_results(results):
+    '''
+    Prints a table of benchmark results.
+
+    Parameters:
+        results (list): (seats, stats) tuples, from play_table.
+    '''
+    print(f"{'seats':>6}{'decks':>7}{'deals':>7}{'deal ms':>10}{'turns/s':>11}{'us/turn':>10}")
+    for seats, stats in results:
+        print(f"{seats:>6}{stats['decks']:>7}{stats['deals']:>7}{stats['dealMs']:>10.3f}{stats['turnsPerSecond']:>11.0f}{stats['turnUs']:>10.2f}")
+
+
+
+def main():
+    results = []
+    for numPlayers in TABLE_SIZES:
+        random.seed(SEED) # Computer players choose with the random module
+        results.append((numPlayers, play_table(numPlayers, BENCHMARK_TURNS, random.Random(SEED))))
+    print_results(results)
+    return 0
+
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+import csv
+import os
+
+import numpy as np
+
+from card_types import COLOR_INDEX, WILD_TYPE
+
+TELEMETRY_CHUNK_ROWS = 65536 # Turns buffered before they're written out as a chunk
+
+# The columns recorded for every turn, and their types. Every column is a fixed size number, so chunks are flat arrays with no Python objects.
+TURN_COLUMNS = [
+    ("game", np.uint32), # Counts up from 0 for each game the recorder sees
+    ("round", np.uint16),
+    ("seat", np.uint16), # The seat of the player taking the turn
+    ("players", np.uint16),
+    ("handSize", np.uint16), # The player's hand size, when the turn started
+    ("nextHandSize", np.uint16), # The hand size of the player next in the direction of play, when the turn started
+    ("drawPileSize", np.uint16),
+    ("topType", np.uint8), # The top card's type (see card_types), when the turn started
+    ("topColor", np.int8), # The top card's color index (the declared color, for wild cards), or -1
+    ("legalMoves", np.uint16), # How many cards in the hand could be played
+    ("moveType", np.int16), # The type of the card played, or -1 if none was
+    ("played", np.bool_),
+    ("drew", np.bool_),
+    ("cardsDrawn", np.uint16),
+    ("declaredColor", np.int8), # The color index declared for a wild card played, or -1
+]
+
+
+
+def npz_shards(directory, prefix="turns"):
+    '''
+    A writer for TurnRecorder that saves each chunk it's sent as a numbered .npz shard of column arrays in a directory.
+    Load one into pandas with pandas.DataFrame(dict(numpy.load(path))).
+
+    Parameters:
+        directory (str): Where the shards go. It's made if it doesn't exist.
+        prefix (str): The start of each shard's file name.
+    '''
+    os.makedirs(directory, exist_ok=True)
+    shard = 0
+    while True:
+        columns = yield
+        np.savez(os.path.join(directory, f"{prefix}-{shard:06d}.npz"), **columns)
+        shard += 1
+
+
+
+def csv_rows(path):
+    '''
+    A writer for TurnRecorder that appends each chunk it's sent to one CSV file, with a header line first.
+
+    Parameters:
+        path (str): The CSV file.
+    '''
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow([name for name, _ in TURN_COLUMNS])
+        while True:
+            columns = yield
+            table = np.column_stack([columns[name].astype(np.int64) for name, _ in TURN_COLUMNS]) # Bools go out as 0 and 1
+            np.savetxt(file, table, fmt="%d", delimiter=",")
+
+
+
+class TurnRecorder:
+    '''
+    Records features of every turn game_logic.take_turn plays into fixed type NumPy column buffers (see TURN_COLUMNS).
+
+    When the buffers fill up, they're sent as one chunk to a writer: a generator (like npz_shards or csv_rows) that takes
+    a dict of column arrays with each send. The buffers are then reused, so memory stays the same size however many turns are played.
+
+    Set GameState.telemetry to a recorder to have take_turn record every turn. Call close when done, which writes the last chunk.
+    '''
+    def __init__(self, writer, chunkRows=TELEMETRY_CHUNK_ROWS):
+        '''
+        Initializes a recorder, and starts its writer.
+
+        :param writer: generator - Takes each chunk, as a dict of column name to array.
+        :param chunkRows: int - Turns buffered before they're written out.
+        '''
+        self.writer = writer
+        next(self.writer) # Runs the writer up to its first yield, so it's ready for a chunk
+        self.chunkRows = chunkRows
+        self.columns = {name: np.empty(chunkRows, dtype=dtype) for name, dtype in TURN_COLUMNS}
+        self.rows = 0 # Rows of the buffers filled so far
+        self.turns = 0 # Turns recorded, over every chunk
+        self.game = -1
+        self.lastGame = None # The game state of the last turn, to tell when a new game starts
+        self.turn = None # What we knew at the start of the turn being played: (player, top card, cards they had drawn)
+
+    def startTurn(self, gameState, player, playableCards):
+        '''
+        Records what a turn starts with. Call finishTurn once the player has moved.
+
+        :param gameState: GameState object - The game.
+        :param player: Player or ComputerPlayer object - The player whose turn it is.
+        :param playableCards: list - The cards they can play.
+        '''
+        if gameState is not self.lastGame:
+            self.game += 1
+            self.lastGame = gameState
+
+        row = self.rows
+        columns = self.columns
+        topCard = gameState.discardPile.topCard
+        seat = gameState.currentPlayerIndex
+        numPlayers = len(gameState.players)
+        columns["game"][row] = self.game
+        columns["round"][row] = gameState.round
+        columns["seat"][row] = seat
+        columns["players"][row] = numPlayers
+        columns["handSize"][row] = len(player.hand.cards)
+        columns["nextHandSize"][row] = len(gameState.players[(seat + gameState.direction) % numPlayers].hand.cards)
+        columns["drawPileSize"][row] = len(gameState.drawPile.cards)
+        columns["topType"][row] = topCard.cardType
+        columns["topColor"][row] = COLOR_INDEX[topCard.color] if topCard.color is not None else -1
+        columns["legalMoves"][row] = len(playableCards)
+        self.turn = (player, topCard, player.cardsDrawn)
+
+    def finishTurn(self, gameState):
+        '''
+        Records how the turn started by startTurn went: what was played, and what was drawn.
+
+        :param gameState: GameState object - The game, right after the player moved.
+        '''
+        player, topCard, cardsDrawn = self.turn
+        self.turn = None
+        row = self.rows
+        columns = self.columns
+
+        newTopCard = gameState.discardPile.topCard
+        played = newTopCard is not topCard and gameState.lastPlayer is player
+        drawn = player.cardsDrawn - cardsDrawn
+        columns["moveType"][row] = newTopCard.cardType if played else -1
+        columns["played"][row] = played
+        columns["drew"][row] = drawn > 0
+        columns["cardsDrawn"][row] = drawn
+        wild = played and newTopCard.cardType >= WILD_TYPE
+        columns["declaredColor"][row] = COLOR_INDEX[newTopCard.color] if wild and newTopCard.color is not None else -1
+
+        self.rows += 1
+        self.turns += 1
+        if self.rows == self.chunkRows:
+            self.flush()
+
+    def flush(self):
+        '''
+        Sends the turns buffered so far to the writer, as one chunk.
+        '''
+        if self.rows == 0:
+            return
+        self.writer.send({name: column[:self.rows] for name, column in self.columns.items()})
+        self.rows = 0
+
+    def close(self):
+        '''
+        Writes the last chunk, and closes the writer.
+        '''
+        self.flush()
+        self.writer.close()
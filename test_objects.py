@@ -0,0 +1,62 @@
+import random
+
+import game_logic as gl
+import objects as obj
+import speculation as sp
+
+
+
+def seated_game(playsOdds=True):
+    '''
+    Returns a game with a human and two computer players, dealt and ready for its first turn.
+    '''
+    gameState = obj.GameState(gl.create_deck())
+    gameState.verbose = False
+    gameState.players = [obj.Player("Human"), obj.ComputerPlayer("Computer 1", playsOdds), obj.ComputerPlayer("Computer 2", playsOdds)]
+    gl.equip_computers(gameState)
+    gl.seed_game(gameState, 1)
+    gameState.drawPile.shuffleInitial()
+    gameState.dealCards()
+    gameState.setTopCard()
+    return gameState
+
+
+
+def test_copy_seated_game():
+    gameState = seated_game()
+    clone = gameState.copy()
+
+    assert clone is not gameState
+    assert [player.name for player in clone.players] == [player.name for player in gameState.players]
+    assert all(copied is not player for copied, player in zip(clone.players, gameState.players))
+    assert [len(player.hand.cards) for player in clone.players] == [len(player.hand.cards) for player in gameState.players]
+    assert clone.players[1].tracker.observer is clone.players[1]
+
+
+
+def test_speculator_starts_on_mixed_table():
+    gameState = seated_game()
+    speculator = sp.Speculator()
+    speculator.start(gameState, gameState.players[0])
+    speculator.stop()
+
+
+
+def test_speculation_leaves_random_alone():
+    gameState = seated_game(playsOdds=False) # Choosing at random, so speculating draws random numbers
+    state = random.getstate()
+    speculator = sp.Speculator()
+    speculator.start(gameState, gameState.players[0])
+    speculator.worker.join() # Let it work out everything it can
+    speculator.stop()
+    assert random.getstate() == state
+
+
+
+def test_copy_makes_the_same_choices():
+    gameState = seated_game()
+    clone = gameState.copy()
+    computer = gameState.players[1]
+    copied = clone.players[1]
+    assert copied.rng is not random and copied.rng is clone.drawPile.rng
+    assert [copied.chooseColor() for _ in range(20)] == [computer.chooseColor() for _ in range(20)]
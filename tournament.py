@@ -0,0 +1,548 @@
+import argparse
+import concurrent.futures
+import itertools
+import math
+import os
+import random
+import sys
+
+import objects as obj
+import game_logic as gl
+import card_tracker as ct
+import endgame as eg
+import probability_oracle as po
+
+ELO_START = 1500.0 # Every bot's rating before its first game
+ELO_K = 16.0 # How far one game moves a rating
+GAMES_PER_TASK = 2 # Games a worker plays per matchup it's given. Seats swap every game, so each task is seat balanced
+MIN_PAIR_GAMES = 20 # Games a pair plays before it can be settled
+MAX_PAIR_GAMES = 400 # Games a pair plays at most, even if it never settles
+PAIR_TOLERANCE = 0.05 # A pair is settled once its win rate is known to within this much, even if it's near even
+CONFIDENCE_Z = 1.96 # How many standard errors a win rate must be from even to call the pair (95%)
+SEED = 0 # Seeds every game, so the same seed gives the same standings
+DEALS_PER_TASK = 8 # Deals a worker plays per task in a comparison
+COMPARISON_DEALS = 1000 # Deals a comparison plays by default
+SPRT_MAX_DEALS = 100000 # Deals a comparison with a sequential test plays by default, if the test never decides
+SPRT_WIN_RATE0 = 0.5 # The sequential test's null hypothesis: the first bot wins this often (they're even)
+SPRT_WIN_RATE1 = 0.55 # Its alternative: the first bot wins this often
+SPRT_ALPHA = 0.05 # The chance of deciding the first bot is better when they're even
+SPRT_BETA = 0.05 # The chance of deciding the first bot is no better when it is
+
+_oracle = None # Each worker process keeps one oracle, so its cache carries over from game to game. Its answers never depend on earlier games
+
+
+
+class BotConfig:
+    '''
+    Describes a computer player taking part in a tournament: its name and how it chooses moves.
+    '''
+    def __init__(self, name, playsOdds=False, searchesEndgames=False, wildSavingPenalty=obj.WILD_SAVING_PENALTY):
+        '''
+        Initializes a bot configuration. See ComputerPlayer for what the settings do.
+
+        :param name: str - A name that's unique in the pool.
+        :param playsOdds: bool - Whether the bot counts cards and chooses moves by the odds.
+        :param searchesEndgames: bool - Whether the bot searches out endgames.
+        :param wildSavingPenalty: float - How much the bot holds back wild cards, when choosing by the odds.
+        '''
+        self.name = name
+        self.playsOdds = playsOdds
+        self.searchesEndgames = searchesEndgames
+        self.wildSavingPenalty = wildSavingPenalty
+
+    def makePlayer(self):
+        '''
+        Returns a new ComputerPlayer that plays like this configuration.
+        '''
+        return obj.ComputerPlayer(self.name, self.playsOdds, self.searchesEndgames, self.wildSavingPenalty)
+
+
+
+class QuietUserInterface:
+    '''
+    Stands in for the UserInterface in games nobody watches, like a tournament's. Every game has only computer players,
+    so the only calls the game makes are to show what happened, which do nothing here.
+    '''
+    def __init__(self):
+        self.pygameWrapper = self # The game also calls userInterface.pygameWrapper.textPopUp
+
+    def showState(self, gameState):
+        pass
+
+    def textPopUp(self, lines):
+        pass
+
+
+
+def play_game(seated, seed, replayDeal=False):
+    '''
+    Plays a game between bots, and returns the seat of the winner.
+
+    Parameters:
+        seated (tuple): The BotConfig in each seat.
+        seed (int): Seeds the game.
+        replayDeal (bool): Whether to deal from the seed (see DrawPile.replayDeal), and give each seat its own random choices
+            seeded from it, so every game with this seed has the same cards and the same luck in each seat whoever sits there.
+    '''
+    global _oracle
+    if _oracle is None:
+        _oracle = po.ProbabilityOracle()
+
+    gameState = obj.GameState(gl.create_deck(), QuietUserInterface())
+    gameState.verbose = False
+    gameState.players = [config.makePlayer() for config in seated]
+    for player, config in zip(gameState.players, seated):
+        if config.playsOdds:
+            ct.CardTracker(player).attach(gameState)
+    if any(config.playsOdds for config in seated):
+        gameState.probabilityOracle = _oracle
+    if any(config.searchesEndgames for config in seated):
+        gameState.endgameSolver = eg.EndgameSolver() # A fresh one every game, so nothing a game searched can reach the next one
+
+    gl.seed_game(gameState, seed)
+    if replayDeal:
+        gameState.dealSeed = seed
+        for seat, player in enumerate(gameState.players):
+            player.rng = random.Random(f"{seed}/seat {seat}")
+    gl.game_loop(gameState)
+    return gameState.players.index(gameState.gameWinner)
+
+
+
+def play_match(configs, seed, games):
+    '''
+    Plays games between two bots, swapping seats every game, and returns whether the first bot won each one, in the order they
+    were played. This runs in a worker process.
+
+    Parameters:
+        configs (tuple): The two BotConfigs.
+        seed (int): Seeds the first game. Each game after it is seeded one higher.
+        games (int): How many games to play.
+    '''
+    results = []
+    for game in range(games):
+        seated = configs if game % 2 == 0 else configs[::-1]
+        results.append(seated[play_game(seated, seed + game)] is configs[0])
+    return results
+
+
+
+def play_deals(configs, seeds, duplicate):
+    '''
+    Plays each deal twice, once with each bot in the first seat, and returns how many of each pair of games the first bot won
+    (0, 1 or 2). This runs in a worker process.
+
+    Parameters:
+        configs (tuple): The two BotConfigs.
+        seeds (list): A seed for each deal.
+        duplicate (bool): Whether both games of a deal get the same cards and the same luck in each seat. If not, the second
+            game is an independent one, for comparison.
+    '''
+    results = []
+    for seed in seeds:
+        wins = 0
+        if play_game(configs, seed, duplicate) == 0:
+            wins += 1
+        secondSeed = seed if duplicate else seed + 2**31 # Independent games never share a seed
+        if play_game(configs[::-1], secondSeed, duplicate) == 1:
+            wins += 1
+        results.append(wins)
+    return results
+
+
+
+class Tournament:
+    '''
+    Ranks a pool of bots by Elo rating, from heads-up games played on a pool of worker processes.
+
+    Every pair of bots is a matchup. Workers are kept busy with matchups, and each pair's games are counted as they come back.
+    Once a pair has played enough to say which bot is better (or that they're too close to tell apart), it's settled and
+    not scheduled again, so the games go to the pairs that are still uncertain instead of being spread evenly over every pair.
+
+    The same seed gives the same standings, however many workers there are and whatever order their games finish in. Each pair
+    seeds its tasks from its own random stream, its games count in the order they were scheduled, games scheduled after it settled
+    are dropped, and the ratings are worked out once every pair has settled, from the games in a fixed order.
+    '''
+    def __init__(self, configs, workers=None, seed=SEED):
+        '''
+        Initializes a tournament.
+
+        :param configs: list - The BotConfigs taking part. Their names must be unique.
+        :param workers: int - How many worker processes to play on. Defaults to one per CPU.
+        :param seed: int - Seeds every pair's games, and through them the standings.
+        '''
+        if len({config.name for config in configs}) != len(configs):
+            raise ValueError("Every bot in a tournament must have a different name.")
+
+        self.configs = configs
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+        self.ratings = [ELO_START] * len(configs)
+        self.games = [0] * len(configs)
+        self.wins = [0] * len(configs)
+
+        self.pairs = list(itertools.combinations(range(len(configs)), 2))
+        self.pairRngs = [random.Random(f"{seed}/pair {pair}") for pair in range(len(self.pairs))] # Seeds each pair's tasks, in order
+        self.pairGames = [0] * len(self.pairs)
+        self.pairWins = [0] * len(self.pairs) # Wins for the first bot of each pair
+        self.pairTasks = [0] * len(self.pairs) # Tasks of each pair scheduled so far
+        self.pairResults = [[] for _ in self.pairs] # Each counted task's results (see play_match), in the order they were scheduled
+        self.waiting = [{} for _ in self.pairs] # Maps a task's number to its results, when it finished before a task scheduled earlier
+        self.settled = [False] * len(self.pairs)
+
+    def isSettled(self, pair):
+        '''
+        Returns whether a pair has played enough: its win rate is clearly off even, or known to within PAIR_TOLERANCE,
+        or it has played MAX_PAIR_GAMES.
+        '''
+        games = self.pairGames[pair]
+        if games >= MAX_PAIR_GAMES:
+            return True
+        if games < MIN_PAIR_GAMES:
+            return False
+
+        winRate = self.pairWins[pair] / games
+        margin = CONFIDENCE_Z * math.sqrt(max(winRate * (1 - winRate), 0.01) / games) # Never fully sure, even at 0 or 100%
+        return abs(winRate - 0.5) > margin or margin < PAIR_TOLERANCE
+
+    def nextPair(self):
+        '''
+        Returns the unsettled pair that has played (and is playing) the fewest games, or None if every pair is settled or busy.
+        '''
+        bestPair = None
+        bestGames = None
+        for pair in range(len(self.pairs)):
+            if self.settled[pair]:
+                continue
+            games = self.pairTasks[pair] * GAMES_PER_TASK
+            if games >= MAX_PAIR_GAMES:
+                continue # Enough games are already on their way to settle it
+            if bestGames is None or games < bestGames:
+                bestPair = pair
+                bestGames = games
+        return bestPair
+
+    def finishTask(self, pair, task, results):
+        '''
+        Takes a finished task's results, and counts every task of the pair whose turn has come, in the order they were scheduled.
+        Once the pair settles, the tasks after that point are dropped, so how many games a pair counts never depends on timing.
+        '''
+        waiting = self.waiting[pair]
+        waiting[task] = results
+        while not self.settled[pair] and len(self.pairResults[pair]) in waiting:
+            self.recordGames(pair, waiting.pop(len(self.pairResults[pair])))
+        if self.settled[pair]:
+            waiting.clear()
+
+    def recordGames(self, pair, results):
+        '''
+        Counts a task's games for a pair, and settles the pair if it has played enough.
+        '''
+        first, second = self.pairs[pair]
+        games = len(results)
+        wins = sum(results)
+        self.pairResults[pair].append(results)
+        self.pairGames[pair] += games
+        self.pairWins[pair] += wins
+        self.games[first] += games
+        self.games[second] += games
+        self.wins[first] += wins
+        self.wins[second] += games - wins
+        self.settled[pair] = self.isSettled(pair)
+
+    def rate(self):
+        '''
+        Works out the Elo ratings from every counted game, one game at a time: each pair's first task in pair order,
+        then each pair's second task, and so on.
+        '''
+        self.ratings = [ELO_START] * len(self.configs)
+        for task in range(max((len(results) for results in self.pairResults), default=0)):
+            for pair, (first, second) in enumerate(self.pairs):
+                if task >= len(self.pairResults[pair]):
+                    continue
+                for won in self.pairResults[pair][task]:
+                    expected = 1 / (1 + 10 ** ((self.ratings[second] - self.ratings[first]) / 400))
+                    score = 1.0 if won else 0.0
+                    self.ratings[first] += ELO_K * (score - expected)
+                    self.ratings[second] -= ELO_K * (score - expected)
+
+    def run(self):
+        '''
+        Plays the tournament until every pair is settled, and returns the standings (see standings).
+        '''
+        with concurrent.futures.ProcessPoolExecutor(self.workers) as executor:
+            running = {}
+            while True:
+                while len(running) < self.workers * 2: # Keep a task queued for each worker while it plays one
+                    pair = self.nextPair()
+                    if pair is None:
+                        break
+                    first, second = self.pairs[pair]
+                    configs = (self.configs[first], self.configs[second])
+                    future = executor.submit(play_match, configs, self.pairRngs[pair].randrange(2**31), GAMES_PER_TASK)
+                    running[future] = (pair, self.pairTasks[pair])
+                    self.pairTasks[pair] += 1
+
+                if not running:
+                    self.rate()
+                    return self.standings()
+
+                done, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    pair, task = running.pop(future)
+                    self.finishTask(pair, task, future.result())
+
+    def standings(self):
+        '''
+        Returns a list of (name, rating, games, wins) for every bot, best rated first.
+        '''
+        rows = [(config.name, self.ratings[index], self.games[index], self.wins[index]) for index, config in enumerate(self.configs)]
+        return sorted(rows, key=lambda row: row[1], reverse=True)
+
+
+
+class SequentialTest:
+    '''
+    A Sequential Probability Ratio Test on the first bot's wins, game by game: did it win winRate1 of its games (it's better),
+    or only winRate0 (it's no better)? It decides as soon as the log likelihood ratio crosses a bound set by the error rates,
+    which for bots that are clearly apart is a small fraction of the games a fixed size test would play.
+
+    Duplicate deals make the two games of a deal less alike than independent games, never more, so treating them as independent
+    only makes the test more careful than its error rates say.
+    '''
+    def __init__(self, winRate0=SPRT_WIN_RATE0, winRate1=SPRT_WIN_RATE1, alpha=SPRT_ALPHA, beta=SPRT_BETA):
+        '''
+        Initializes a sequential test.
+
+        :param winRate0: float - The first bot's win rate if they're even.
+        :param winRate1: float - Its win rate if it's better.
+        :param alpha: float - The chance of deciding it's better when they're even.
+        :param beta: float - The chance of deciding it's no better when it is.
+        '''
+        if not 0 < winRate0 < winRate1 < 1:
+            raise ValueError("The win rates must be between 0 and 1, with winRate0 below winRate1.")
+
+        self.winRate0 = winRate0
+        self.winRate1 = winRate1
+        self.winScore = math.log(winRate1 / winRate0) # What a win adds to the log likelihood ratio
+        self.lossScore = math.log((1 - winRate1) / (1 - winRate0)) # And a loss
+        self.lower = math.log(beta / (1 - alpha)) # At or below this, the first bot is no better
+        self.upper = math.log((1 - beta) / alpha) # At or above this, the first bot is better
+        self.ratio = 0.0 # The log likelihood ratio so far
+        self.games = 0
+        self.decision = None # "better" or "not better", once the test has decided
+
+    def addGames(self, wins, games):
+        '''
+        Adds games the first bot won wins of, and decides if the ratio has crossed a bound. Games after a decision are ignored.
+        '''
+        if self.decision is not None:
+            return
+
+        self.ratio += wins * self.winScore + (games - wins) * self.lossScore
+        self.games += games
+        if self.ratio >= self.upper:
+            self.decision = "better"
+        elif self.ratio <= self.lower:
+            self.decision = "not better"
+
+
+
+class Comparison:
+    '''
+    Compares two bots over pairs of games on a pool of worker processes, and reports the paired differences.
+
+    Each deal is played twice, with the bots in either seat. In duplicate mode both games have the same shuffled decks and the same
+    random choices in each seat, so the luck of the deal mostly cancels out, and a deal's difference (the first bot's wins, minus one)
+    is mostly down to the bots. That takes far fewer games to tell two bots apart than independent games do.
+    '''
+    def __init__(self, configs, deals=COMPARISON_DEALS, duplicate=True, workers=None, seed=SEED, test=None):
+        '''
+        Initializes a comparison.
+
+        :param configs: tuple - The two BotConfigs to compare.
+        :param deals: int - How many deals to play, or the most to play with a test. Each one is two games.
+        :param duplicate: bool - Whether to replay each deal for both seatings, or play independent games.
+        :param workers: int - How many worker processes to play on. Defaults to one per CPU.
+        :param seed: int - Seeds the deals.
+        :param test: SequentialTest object - If given, the comparison stops as soon as the test decides, deal by deal.
+        '''
+        self.configs = tuple(configs)
+        self.deals = deals
+        self.duplicate = duplicate
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+        self.rng = random.Random(seed)
+        self.results = [] # The first bot's wins in each counted deal, in the order the deals were dealt
+        self.test = test
+        self.tasks = 0 # Tasks submitted so far
+        self.counted = 0 # Tasks counted so far, which are always the first ones submitted
+        self.waiting = {} # Maps a task's number to its results, when it finished before a task submitted earlier
+
+    def submit(self, executor, deals):
+        '''
+        Gives a worker a task of deals to play, and returns its future.
+        '''
+        seeds = [self.rng.randrange(2**31) for _ in range(deals)]
+        return executor.submit(play_deals, self.configs, seeds, self.duplicate)
+
+    def isDecided(self):
+        '''
+        Returns whether the test (if there is one) has decided.
+        '''
+        return self.test is not None and self.test.decision is not None
+
+    def finishTask(self, task, results):
+        '''
+        Takes a finished task's results, and counts every task whose turn has come, in the order they were submitted, a deal at a
+        time. Once the test decides, the deals after that point are dropped, so what's counted never depends on timing.
+        '''
+        self.waiting[task] = results
+        while not self.isDecided() and self.counted in self.waiting:
+            for wins in self.waiting.pop(self.counted):
+                self.results.append(wins)
+                if self.test is not None:
+                    self.test.addGames(wins, 2)
+                    if self.test.decision is not None:
+                        break # Decided on this deal, so the rest of the task is dropped
+            self.counted += 1
+        if self.isDecided():
+            self.waiting.clear()
+
+    def run(self):
+        '''
+        Plays every deal, and returns the summary (see summary).
+        '''
+        with concurrent.futures.ProcessPoolExecutor(self.workers) as executor:
+            running = {}
+            submitted = 0
+            while submitted < self.deals or running:
+                while submitted < self.deals and len(running) < self.workers * 2: # Keep a task queued for each worker while it plays one
+                    deals = min(DEALS_PER_TASK, self.deals - submitted)
+                    running[self.submit(executor, deals)] = self.tasks
+                    self.tasks += 1
+                    submitted += deals
+
+                done, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    self.finishTask(running.pop(future), future.result())
+
+                if self.isDecided():
+                    # Decided, so drop every task that hasn't started. The ones being played are left to finish, and ignored.
+                    for future in running:
+                        future.cancel()
+                    break
+        return self.summary()
+
+    def summary(self):
+        '''
+        Returns a dict of what the deals so far say: how many deals and games were played, the first bot's win rate, and the mean
+        paired difference with its standard error and 95% confidence interval. "gamesSaved" is how many times more games
+        independent games would need for the same standard error. With a test, "decision" is its decision ("better", "not better",
+        or None if it ran out of deals first).
+        '''
+        deals = len(self.results)
+        differences = [wins - 1 for wins in self.results]
+        mean = sum(differences) / deals if deals else 0.0
+        variance = sum((difference - mean) ** 2 for difference in differences) / (deals - 1) if deals > 1 else 0.0
+        standardError = math.sqrt(variance / deals) if deals else 0.0
+
+        # What the standard error of the mean difference would be with every game independent: twice that of the win rate.
+        winRate = sum(self.results) / (2 * deals) if deals else 0.5
+        independentError = 2 * math.sqrt(winRate * (1 - winRate) / (2 * deals)) if deals else 0.0
+
+        return {
+            "deals": deals,
+            "games": 2 * deals,
+            "winRate": winRate,
+            "meanDifference": mean,
+            "standardError": standardError,
+            "interval": (mean - CONFIDENCE_Z * standardError, mean + CONFIDENCE_Z * standardError),
+            "gamesSaved": (independentError / standardError) ** 2 if standardError > 0 else float("inf"),
+            "decision": self.test.decision if self.test is not None else None,
+        }
+
+
+
+def default_pool():
+    '''
+    Returns the bots main ranks: random play, and choosing by the odds with a few wild saving penalties, with and without endgame search.
+    '''
+    configs = [BotConfig("random")]
+    for penalty in [0.0, 0.25, 0.5]:
+        configs.append(BotConfig(f"odds {penalty}", playsOdds=True, wildSavingPenalty=penalty))
+    configs.append(BotConfig("odds 0.25 + endgame", playsOdds=True, searchesEndgames=True))
+    return configs
+
+
+
+def print_standings(standings):
+    '''
+    Prints a table of tournament standings.
+
+    Parameters:
+        standings (list): (name, rating, games, wins) tuples, from Tournament.run.
+    '''
+    print(f"{'bot':<24}{'rating':>8}{'games':>8}{'win %':>8}")
+    for name, rating, games, wins in standings:
+        print(f"{name:<24}{rating:>8.0f}{games:>8}{100 * wins / max(games, 1):>8.1f}")
+
+
+
+def print_comparison(comparison, summary):
+    '''
+    Prints the summary of a comparison.
+
+    Parameters:
+        comparison (Comparison): The comparison.
+        summary (dict): From Comparison.run.
+    '''
+    configs = comparison.configs
+    low, high = summary["interval"]
+    print(f"{configs[0].name} vs {configs[1].name}: {summary['deals']} deals, {summary['games']} games")
+    print(f"{configs[0].name} won {100 * summary['winRate']:.1f}% of games")
+    print(f"mean paired difference {summary['meanDifference']:+.4f} (standard error {summary['standardError']:.4f}, 95% {low:+.4f} to {high:+.4f})")
+    print(f"independent games would need {summary['gamesSaved']:.1f}x as many games for the same standard error")
+    if comparison.test is not None:
+        test = comparison.test
+        if summary["decision"] is None:
+            print(f"the sequential test didn't decide in {summary['games']} games")
+        else:
+            verdict = f"{configs[0].name} is better" if summary["decision"] == "better" else f"{configs[0].name} is no better"
+            print(f"the sequential test decided {verdict} (win rate {test.winRate1} over {test.winRate0}) after {summary['games']} games")
+
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank the default bots by Elo, or compare two of them.")
+    parser.add_argument("--compare", nargs=2, metavar="BOT", help="compare two bots from the default pool instead, by name")
+    parser.add_argument("--deals", type=int, default=None, help=f"deals to play in a comparison, each twice (defaults to {COMPARISON_DEALS}, "
+                        f"or at most {SPRT_MAX_DEALS} with --sprt)")
+    parser.add_argument("--sprt", action="store_true", help="stop the comparison as soon as a sequential probability ratio test decides")
+    parser.add_argument("--win-rate0", type=float, default=SPRT_WIN_RATE0, help="the test's win rate for the first bot if they're even")
+    parser.add_argument("--win-rate1", type=float, default=SPRT_WIN_RATE1, help="the test's win rate for the first bot if it's better")
+    parser.add_argument("--alpha", type=float, default=SPRT_ALPHA, help="the test's chance of calling the first bot better when they're even")
+    parser.add_argument("--beta", type=float, default=SPRT_BETA, help="the test's chance of calling the first bot no better when it is")
+    parser.add_argument("--independent", action="store_true", help="compare with independent games instead of duplicate deals")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (defaults to one per CPU)")
+    args = parser.parse_args()
+
+    pool = {config.name: config for config in default_pool()}
+    if args.compare:
+        for name in args.compare:
+            if name not in pool:
+                parser.error(f"There's no bot called {name!r}. The bots are: {', '.join(pool)}")
+        configs = (pool[args.compare[0]], pool[args.compare[1]])
+        test = SequentialTest(args.win_rate0, args.win_rate1, args.alpha, args.beta) if args.sprt else None
+        deals = args.deals if args.deals is not None else SPRT_MAX_DEALS if args.sprt else COMPARISON_DEALS
+        comparison = Comparison(configs, deals, not args.independent, args.workers, test=test)
+        print_comparison(comparison, comparison.run())
+        return 0
+
+    tournament = Tournament(list(pool.values()), args.workers)
+    print_standings(tournament.run())
+    print(f"{sum(tournament.pairGames)} games, {sum(tournament.settled)} of {len(tournament.pairs)} pairs settled")
+    return 0
+
+
+
+if __name__ == "__main__":
+    sys.exit(main())
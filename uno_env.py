@@ -0,0 +1,286 @@
+import random
+
+import numpy as np
+
+import objects as obj
+import game_logic as gl
+import shuffle_pool as sp
+from card_types import COLORS, COLOR_INDEX, WILD_TYPE, WILD_DRAW_FOUR_TYPE, CARD_TYPES, card_type
+
+# Actions 0 to 51 play a colored card of that card type. Then come a Wild as each color, a Wild Draw Four as each color, and drawing.
+WILD_ACTION = WILD_TYPE # 52 to 55
+WILD_DRAW_FOUR_ACTION = WILD_ACTION + len(COLORS) # 56 to 59
+DRAW_ACTION = WILD_DRAW_FOUR_ACTION + len(COLORS) # 60
+NUM_ACTIONS = DRAW_ACTION + 1 # 61
+
+MAX_PLAYERS = 10 # As many players as the new game menu allows
+
+# Where each part of an observation starts. Observations are float32 vectors of OBSERVATION_SIZE.
+HAND_OFFSET = 0 # How many of each card type are in our hand
+TOP_CARD_OFFSET = HAND_OFFSET + CARD_TYPES # The top card's type, one hot
+COLOR_OFFSET = TOP_CARD_OFFSET + CARD_TYPES # The top card's color (the declared color, for wild cards), one hot
+OPPONENTS_OFFSET = COLOR_OFFSET + len(COLORS) # Each opponent's hand size, starting from the seat after ours. Empty seats are 0
+DIRECTION_OFFSET = OPPONENTS_OFFSET + MAX_PLAYERS - 1 # The direction of play, +1 or -1
+OBSERVATION_SIZE = DIRECTION_OFFSET + 1
+
+MAX_EPISODE_TURNS = 1000 # Turns (by anyone) before an episode is cut short. Very rarely, nobody can play or draw
+
+
+
+class UnoEnv:
+    '''
+    A reset()/step(action) environment for one round of UNO, played by an agent against computer players.
+
+    The agent sits in seat 0. Every step plays the agent's action, then the computer players' turns, until it's the agent's turn again.
+    An episode is a single round, with a reward of 1 if the agent wins it, -1 if someone else does, and 0 otherwise.
+
+    Observations and the legal action mask are written into the same NumPy arrays every step, so nothing is allocated for them.
+    Those arrays can also be given to the environment (see UnoVectorEnv), so many environments can write into rows of one buffer.
+    The engine's randomness (shuffling, and the computer players' choices) comes from Python's random module.
+    '''
+    def __init__(self, numPlayers=4, observation=None, actionMask=None):
+        '''
+        Initializes an environment.
+
+        :param numPlayers: int - How many players, including the agent. From 2 to MAX_PLAYERS.
+        :param observation: numpy.ndarray - A float32 array of OBSERVATION_SIZE to write observations into. Made if None.
+        :param actionMask: numpy.ndarray - A bool array of NUM_ACTIONS to write the legal actions into. Made if None.
+        '''
+        if not 2 <= numPlayers <= MAX_PLAYERS:
+            raise ValueError(f"An environment needs between 2 and {MAX_PLAYERS} players.")
+
+        self.observation = np.zeros(OBSERVATION_SIZE, dtype=np.float32) if observation is None else observation
+        self.actionMask = np.zeros(NUM_ACTIONS, dtype=bool) if actionMask is None else actionMask
+
+        self.gameState = obj.GameState(gl.create_deck())
+        self.gameState.verbose = False
+        self.shuffles = sp.ShufflePool() # Episodes are dealt over and over, so the shuffles are made in bulk
+        self.gameState.drawPile.rng = self.shuffles
+        self.agent = obj.Player("Agent")
+        self.gameState.addPlayer(self.agent)
+        for seat in range(1, numPlayers):
+            self.gameState.addPlayer(obj.ComputerPlayer(f"Computer {seat}"))
+
+        self.turns = 0 # Turns taken this episode, by anyone
+        self.done = True # Whether the episode is over, and .reset needs to be called
+
+    def reset(self, seed=None):
+        '''
+        Starts a new round with a new dealer, and plays until it's the agent's turn. Returns the observation.
+
+        :param seed: int - Seeds Python's random module (and so the whole engine) and the shuffles first, if given.
+        '''
+        if seed is not None:
+            random.seed(seed)
+            self.shuffles.seed(seed)
+
+        gameState = self.gameState
+
+        # Every card goes back into the draw pile, and wild cards forget the color they were played as.
+        for player in gameState.players:
+            player.resetHand(gameState.drawPile)
+        gameState.drawPile.cards += gameState.discardPile.removeAllCards()
+        gameState.drawPile.forgetWildColors()
+
+        gameState.direction = 1
+        gameState.roundWon = False
+        gameState.roundWinner = None
+        gameState.currentPlayerIndex = random.randrange(len(gameState.players)) # The dealer. Play starts to their left
+        gameState.drawPile.shuffleInitial()
+        gameState.dealCards()
+        gameState.setTopCard()
+
+        self.turns = 0
+        self.done = False
+        self.playComputerTurns()
+        self.encode()
+        return self.observation
+
+    def step(self, action):
+        '''
+        Plays the agent's action, then the computer players' turns. Returns (observation, reward, terminated, truncated).
+
+        Terminated means the round was won, and truncated means it ran past MAX_EPISODE_TURNS. Either way, call .reset next.
+
+        :param action: int - An action from 0 to NUM_ACTIONS - 1. It must be allowed by .actionMask.
+        '''
+        if self.done:
+            raise RuntimeError("The episode is over. Call reset() to start a new one.")
+        if not self.actionMask[action]:
+            raise ValueError(f"Action {action} is not legal right now.")
+
+        gameState = self.gameState
+        agent = self.agent
+
+        if action == DRAW_ACTION:
+            # Like a computer player, the agent plays a drawn card if it can.
+            drawnCard = gameState.drawForTurn(agent)
+            if drawnCard is not None and gameState.isCardPlayable(drawnCard):
+                color = None
+                if drawnCard.action == "Wild" or drawnCard.action == "Wild Draw Four":
+                    color = self.handColor()
+                gameState.playCard(agent, drawnCard, color=color)
+            else:
+                gameState.nextPlayer()
+        else:
+            card, color = self.actionCard(action)
+            gameState.playCard(agent, card, color=color)
+        self.turns += 1
+
+        if agent.hand.isEmpty():
+            return self.finish(1.0, terminated=True)
+
+        self.playComputerTurns()
+        if gameState.roundWon:
+            return self.finish(-1.0, terminated=True)
+        if self.turns >= MAX_EPISODE_TURNS:
+            return self.finish(0.0, terminated=False)
+
+        self.encode()
+        return self.observation, 0.0, False, False
+
+    def finish(self, reward, terminated):
+        '''
+        Ends the episode, and returns the last step's (observation, reward, terminated, truncated).
+        '''
+        self.done = True
+        self.encode()
+        return self.observation, reward, terminated, not terminated
+
+    def playComputerTurns(self):
+        '''
+        Plays computer players' turns until it's the agent's turn, someone wins the round, or the episode runs out of turns.
+        '''
+        gameState = self.gameState
+        while gameState.currentPlayerIndex != 0 and self.turns < MAX_EPISODE_TURNS:
+            player = gameState.players[gameState.currentPlayerIndex]
+            gl.take_turn(player, gameState)
+            self.turns += 1
+            if player.hand.isEmpty():
+                gameState.roundWinner = player
+                gameState.roundWon = True
+                return
+
+    def actionCard(self, action):
+        '''
+        Returns the (card, color) in the agent's hand an action plays. Color is None unless the card is a wild card.
+        '''
+        if action < WILD_ACTION:
+            wantedType, color = action, None
+        elif action < WILD_DRAW_FOUR_ACTION:
+            wantedType, color = WILD_TYPE, COLORS[action - WILD_ACTION]
+        else:
+            wantedType, color = WILD_DRAW_FOUR_TYPE, COLORS[action - WILD_DRAW_FOUR_ACTION]
+
+        for card in self.agent.hand.cards:
+            if card_type(card) == wantedType:
+                return card, color
+
+    def handColor(self):
+        '''
+        Returns a color for a wild card the agent drew and played, chosen the same way as a computer player would.
+        '''
+        colors = [card.color for card in self.agent.hand.cards if card.color is not None]
+        if len(colors) > 0:
+            return random.choice(colors)
+        return random.choice(COLORS)
+
+    def encode(self):
+        '''
+        Writes the current observation and legal action mask into .observation and .actionMask.
+        '''
+        gameState = self.gameState
+        observation = self.observation
+        actionMask = self.actionMask
+        observation.fill(0.0)
+        actionMask.fill(False)
+
+        for card in self.agent.hand.cards:
+            cardType = card_type(card)
+            observation[HAND_OFFSET + cardType] += 1.0
+            if gameState.isCardPlayable(card):
+                if cardType == WILD_TYPE:
+                    actionMask[WILD_ACTION:WILD_ACTION + len(COLORS)] = True
+                elif cardType == WILD_DRAW_FOUR_TYPE:
+                    actionMask[WILD_DRAW_FOUR_ACTION:WILD_DRAW_FOUR_ACTION + len(COLORS)] = True
+                else:
+                    actionMask[cardType] = True
+        actionMask[DRAW_ACTION] = True
+
+        topCard = gameState.discardPile.topCard
+        observation[TOP_CARD_OFFSET + card_type(topCard)] = 1.0
+        if topCard.color is not None:
+            observation[COLOR_OFFSET + COLOR_INDEX[topCard.color]] = 1.0
+
+        players = gameState.players
+        for seat in range(1, len(players)):
+            observation[OPPONENTS_OFFSET + seat - 1] = len(players[seat].hand.cards)
+
+        observation[DIRECTION_OFFSET] = gameState.direction
+
+
+
+class UnoVectorEnv:
+    '''
+    Steps numEnvs UnoEnvs at once, writing every observation, mask, reward and done flag into preallocated NumPy buffers.
+
+    Finished environments are reset straight away, so the observation returned for them is the first one of their next episode.
+    The same buffers are returned every step, so copy anything you want to keep past the next step.
+    '''
+    def __init__(self, numEnvs, numPlayers=4, observations=None, actionMasks=None, rewards=None, terminated=None, truncated=None):
+        '''
+        Initializes a vector of environments. Any buffer that isn't given is made here.
+
+        :param numEnvs: int - How many environments to step at once.
+        :param numPlayers: int - How many players each environment has, including the agent.
+        :param observations: numpy.ndarray - A (numEnvs, OBSERVATION_SIZE) float32 buffer for the observations.
+        :param actionMasks: numpy.ndarray - A (numEnvs, NUM_ACTIONS) bool buffer for the legal action masks.
+        :param rewards: numpy.ndarray - A (numEnvs,) float32 buffer for the rewards.
+        :param terminated: numpy.ndarray - A (numEnvs,) bool buffer for whether each episode was won.
+        :param truncated: numpy.ndarray - A (numEnvs,) bool buffer for whether each episode was cut short.
+        '''
+        self.observations = np.zeros((numEnvs, OBSERVATION_SIZE), dtype=np.float32) if observations is None else observations
+        self.actionMasks = np.zeros((numEnvs, NUM_ACTIONS), dtype=bool) if actionMasks is None else actionMasks
+        self.rewards = np.zeros(numEnvs, dtype=np.float32) if rewards is None else rewards
+        self.terminated = np.zeros(numEnvs, dtype=bool) if terminated is None else terminated
+        self.truncated = np.zeros(numEnvs, dtype=bool) if truncated is None else truncated
+
+        # Each environment writes straight into its own row of the buffers.
+        self.envs = [UnoEnv(numPlayers, self.observations[index], self.actionMasks[index]) for index in range(numEnvs)]
+
+    def reset(self, seed=None):
+        '''
+        Resets every environment, and returns the observations.
+
+        :param seed: int - Seeds Python's random module, and each environment's shuffles (differently for each one), first, if given.
+        '''
+        if seed is not None:
+            random.seed(seed)
+            for index, env in enumerate(self.envs):
+                env.shuffles.seed([seed, index])
+        for env in self.envs:
+            env.reset()
+        self.rewards.fill(0.0)
+        self.terminated.fill(False)
+        self.truncated.fill(False)
+        return self.observations
+
+    def step(self, actions):
+        '''
+        Steps every environment with its action. Returns (observations, rewards, terminated, truncated), and the masks are in .actionMasks.
+
+        :param actions: sequence of int - One action per environment, each allowed by its row of .actionMasks.
+        '''
+        rewards = self.rewards
+        terminated = self.terminated
+        truncated = self.truncated
+
+        for index, env in enumerate(self.envs):
+            observation, reward, isTerminated, isTruncated = env.step(int(actions[index]))
+            rewards[index] = reward
+            terminated[index] = isTerminated
+            truncated[index] = isTruncated
+            if isTerminated or isTruncated:
+                env.reset()
+
+        return self.observations, rewards, terminated, truncated
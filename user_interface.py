@@ -23,7 +23,7 @@ This .mainMenu method is guaranteed to return a list of players, either A.I or H
 
 You can also use some of Menu's methods manually. Do note they expect to be able to return to another menu. These list:
     .newGameMenu, which prompts for a new game, returning a list of players. However, it can also return -1, leaving the menu.
-    .settingsMenu, which prompts for screen changes either manual, or full screen. It only returns nothing, leaving the menu.
+    .settingsMenu, which prompts for screen changes either manual, or full screen, and for house rules and extra computer players. It only returns nothing, leaving the menu.
 
 
 The UserInterface object requires a PygameWrapper, DiscardPile, and DrawPile, which handles what the interface a user has each turn.
@@ -61,10 +61,13 @@ To TLDR even further:
 
 
 import pygame
-import threading # This is just for cooldowns on clicking!
 import sys # For force shutdown if the user clicks the windows close button.
+import time # For timing frames and input with perf_counter, which is much finer than pygame's milliseconds
+from collections import OrderedDict # For the text cache, which forgets the text it used the longest ago
+from collections import deque # For the performance overlay, which only keeps the last few seconds of frames
 
 from objects import ComputerPlayer, Player
+import rules # For the house rules picked in the settings menu
 
 CARD_WIDTH = 48 # Cards are 48 pixels wide
 CARD_HEIGHT = 72 # Cards are 72 pixels high
@@ -74,6 +77,25 @@ BAR_WIDTH = 512 # Menu bars are 512 pixels wide, and 72 high.
 MIN_SCREEN_WIDTH = 640
 MIN_SCREEN_HEIGHT = 360
 
+# Every menu loop is ticked by the same frame clock, so input is read at a steady rate.
+FRAME_RATE = 60
+CLICK_COOLDOWN = 250 # Milliseconds a cooldown lasts. Counted off the frame clock, so no threads are needed!
+
+HAND_PREFETCH = 4 # How many cards past each side of the visible hand we keep clickables ready for
+
+MAX_EXTRA_COMPUTERS = 190 # Computer players the settings menu can add on top of the 10 picked in the new game menu, for big tables
+HUD_LINES = 3 # Lines kept free at the bottom of the table view, for the spectator readout
+
+TEXT_CACHE_SIZE = 256 # How many rendered strings the TextRenderer keeps around
+
+PERF_FRAMES = 240 # How many frames the performance overlay keeps numbers for (4 seconds at 60 fps)
+PERF_BUCKET_MS = 4 # Each bar of the overlay's frame time histogram covers this many milliseconds
+PERF_BUCKETS = 10 # How many bars the histogram has. The last one also counts every slower frame
+PERF_TOGGLE_KEY = pygame.K_F3 # Shows or hides the performance overlay, on any screen
+
+MOUSE_EVENTS = (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP)
+INPUT_EVENTS = (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.KEYDOWN) # Input we measure the latency of, and start a frame early for
+
 
 
 ''' PygameWrapper
@@ -84,37 +106,60 @@ MIN_SCREEN_HEIGHT = 360
         .getType and .getColor to retrieve the proper textures for a cards type and color
         .typingPrompt to allow a simple console like prompt, and user input via typing
         .textPopUp to display a list of strings on the screen.
+        .present to show a rendered frame. PygameWrapper.screen is a fixed size canvas, which .present scales into the window.
+    Pressing F3 on any screen toggles .perfOverlay, which shows frame times and the like on top of the screen.
 '''
 class PygameWrapper:
 
     ''' __init__
         PygameWrappers init takes a width and height to make the pygame window. 
+        That width and height is also the size of the canvas we render to, which never changes, even if the window does.
         It then loads every single texture we ever use; definitely questionable logic, but good enough!
     '''
     def __init__(self, screenWidth, screenHeight):
         # We cannot allow width or height to be above the minimum 360p
-        if screenWidth < MIN_SCREEN_WIDTH:
-            self.screenWidth = MIN_SCREEN_WIDTH
-        else:
-            self.screenWidth = screenWidth
-            self.lastWidth = screenWidth # lastWidth and lastHeight are embarresingly only used for fullscreen logic. Oh well!
-        
-        if screenHeight < MIN_SCREEN_HEIGHT:
-            self.screenHeight = MIN_SCREEN_HEIGHT
-            self.lastHeight = screenHeight
-        else:
-            self.screenHeight = screenHeight
+        self.screenWidth = max(screenWidth, MIN_SCREEN_WIDTH)
+        self.screenHeight = max(screenHeight, MIN_SCREEN_HEIGHT)
 
         # Initialize general pygame stuff
         pygame.init()
-        self.screen = pygame.display.set_mode((screenWidth, screenHeight))
         pygame.display.set_caption("UNO")
         self.fullscreen = False
 
+        # The window, and its size. This is what changes with the resolution and fullscreen settings!
+        self.windowWidth = self.screenWidth
+        self.windowHeight = self.screenHeight
+        self.lastWidth = self.screenWidth # The windowed size, so we can go back to it after fullscreen
+        self.lastHeight = self.screenHeight
+        self.window = pygame.display.set_mode((self.windowWidth, self.windowHeight))
+        self.windowWidth, self.windowHeight = self.window.get_size()
+
+        # The logical canvas. Everything renders to this at screenWidth by screenHeight, so layouts are always the same.
+        # Then .present scales it into the window once a frame.
+        self.screen = pygame.Surface((self.screenWidth, self.screenHeight)).convert()
+        self.updateScaleTarget()
+
+        # The frame clock and mouse state. These are all updated once a frame by .updateInput, on the main thread.
+        self.frameLength = 1 / FRAME_RATE # Seconds a frame should take
+        self.frameStart = time.perf_counter() # When the current frame started, in perf_counter seconds
+        self.frameTime = pygame.time.get_ticks() # The time (in milliseconds) the current frame started at
+        self.windowMousePos = (0, 0) # Where the last mouse event put the mouse, in window coordinates
+        self.heldMouseEvents = [] # Mouse events (with when they arrived) held back for the next frame. See .readMouse
+        self.inputArrivals = [] # When each input shown by the next .present arrived, and if that's exact (see .waitForEvents)
+        self.mousePos = (0, 0)
+        self.mouseButtons = (False, False, False) # Buttons currently held down
+        self.mousePressed = (False, False, False) # Buttons that went down this frame
+        self.mouseReleased = (False, False, False) # Buttons that went up this frame
+
         pygame.font.init()
         # This is the font we use to render graphics. 
         # It's this old one just because I like ASCII games, and grabbing from a users system files sounds scary.
         self.font = pygame.font.Font('graphics/Perfect DOS VGA 437.ttf', 12)
+        self.textRenderer = TextRenderer(self.font) # Use this to render text! It caches, so the same text is only rendered once.
+
+        # Surfaces we've made outside the TextRenderer, which counts its own. Only used for the performance overlay.
+        self.surfacesAllocated = 0
+        self.perfOverlay = PerfOverlay(self) # Toggled with PERF_TOGGLE_KEY, and drawn by .present
 
 
         # All the graphics!!!
@@ -235,6 +280,176 @@ class PygameWrapper:
                 return self.wildCardImage
 
 
+    ''' updateScaleTarget
+        This works out where the canvas goes in the window, keeping its shape with bars on the sides if needed.
+        The result is cached as a subsurface of the window, so it only changes when the window changes.
+    '''
+    def updateScaleTarget(self):
+        scale = min(self.windowWidth / self.screenWidth, self.windowHeight / self.screenHeight)
+        scaledWidth = int(self.screenWidth * scale)
+        scaledHeight = int(self.screenHeight * scale)
+        self.scaleRect = pygame.Rect((self.windowWidth - scaledWidth) // 2, (self.windowHeight - scaledHeight) // 2, scaledWidth, scaledHeight)
+
+        if self.scaleRect.size == (self.screenWidth, self.screenHeight):
+            self.scaleTarget = None # Same size as the canvas, so we can just blit it!
+        else:
+            self.scaleTarget = self.window.subsurface(self.scaleRect)
+        self.window.fill((0, 0, 0)) # The bars around the canvas, if there are any. They never change, so they're only filled here.
+
+
+    ''' setWindowSize
+        Takes a new width and height for the window. Only the window and scale target change; the canvas and every layout stay the same.
+    '''
+    def setWindowSize(self, width, height):
+        self.fullscreen = False
+        self.lastWidth = width
+        self.lastHeight = height
+        self.window = pygame.display.set_mode((width, height))
+        self.windowWidth, self.windowHeight = self.window.get_size() # The operating system may not give us exactly what we asked for!
+        self.updateScaleTarget()
+
+
+    ''' toggleFullscreen
+        Switches between fullscreen and the last windowed size. Like .setWindowSize, this only changes the scale target.
+    '''
+    def toggleFullscreen(self):
+        if self.fullscreen is not True:
+            self.fullscreen = True # If it's not fullscreen, make it full screen!
+            self.window = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+            self.windowWidth, self.windowHeight = self.window.get_size()
+        else: # If it's not-not fullscreen, then it must be fullscreen!
+            self.fullscreen = False # That means we should make it not fullscreen anymore.
+            self.window = pygame.display.set_mode((self.lastWidth, self.lastHeight))
+            self.windowWidth, self.windowHeight = self.window.get_size()
+        self.updateScaleTarget()
+
+
+    ''' present
+        Shows the frame we've rendered on the canvas, by scaling it into the window. Call this instead of pygame.display.flip()!
+    '''
+    def present(self):
+        if self.perfOverlay.enabled:
+            self.perfOverlay.render() # Drawn last, so it's on top of whatever screen we're on
+        if self.scaleTarget is None:
+            self.window.blit(self.screen, self.scaleRect)
+        else:
+            pygame.transform.scale(self.screen, self.scaleRect.size, self.scaleTarget) # Scales straight into the cached target
+        pygame.display.flip()
+
+        # Everything the user did since the last frame is now on screen, so this is when their input was answered.
+        shownAt = time.perf_counter()
+        for arrived, exact in self.inputArrivals:
+            self.perfOverlay.recordLatency(shownAt - arrived, exact)
+        self.inputArrivals = []
+
+
+    ''' toCanvas
+        Takes a position in the window (like the mouse's), and returns where that is on the canvas.
+    '''
+    def toCanvas(self, windowPos):
+        x = (windowPos[0] - self.scaleRect.x) * self.screenWidth / self.scaleRect.width
+        y = (windowPos[1] - self.scaleRect.y) * self.screenHeight / self.scaleRect.height
+        return (int(x), int(y))
+
+
+    ''' updateInput
+        This is called once at the start of every frame. It waits out the rest of the last frame, handles the window's X button, and reads the mouse.
+        The mouse is read from its events, not polled, so a click that's over between two frames still counts (see .readMouse).
+        It returns the events it drained, in case the caller wants keys or the like.
+    '''
+    def updateInput(self):
+        busyTime = time.perf_counter() - self.frameStart # How long the last frame took, before we started waiting
+        arrivals = self.waitForEvents()
+
+        frameStart = time.perf_counter()
+        lastFrameLength = frameStart - self.frameStart
+        self.frameStart = frameStart
+        self.frameTime = pygame.time.get_ticks()
+
+        events = [event for event, arrival in arrivals]
+        self.perfOverlay.recordFrame(lastFrameLength * 1000, busyTime * 1000, len(events))
+        for event, arrival in arrivals:
+            if event.type == pygame.QUIT: # pygame.QUIT is a windows exit / X button
+                pygame.quit() # Clicking it should instantly shut down the game.
+                sys.exit() # It's just much easier this way. Python shouldn't care; it has a garbage collector!
+            if event.type == pygame.KEYDOWN:
+                self.inputArrivals.append(arrival)
+                if event.key == PERF_TOGGLE_KEY:
+                    self.perfOverlay.enabled = not self.perfOverlay.enabled
+
+        self.readMouse([(event, arrival) for event, arrival in arrivals if event.type in MOUSE_EVENTS])
+
+        return events
+
+
+    ''' waitForEvents
+        Waits on pygame's event queue until the current frame is over, and returns every event with when it arrived.
+        A click or key press doesn't wait for the frame to end: we start the next frame right away, so it's answered as soon as possible.
+        Each arrival is a (perf_counter seconds, exact) tuple. pygame's events don't say when SDL queued them, so we can only time
+        the ones we're waiting for. Anything already queued came in while the last frame was being made, so it gets the frame's
+        start, which makes its latency an upper bound, and exact is False.
+    '''
+    def waitForEvents(self):
+        backlogArrival = (self.frameStart, False)
+        arrivals = [(event, backlogArrival) for event in pygame.event.get()] # Everything that came in while we were busy
+        deadline = self.frameStart + self.frameLength
+        if any(event.type in INPUT_EVENTS for event, arrival in arrivals):
+            deadline = 0 # Input is already waiting, so we answer it right away
+
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining < 0.001:
+                break # pygame waits in whole milliseconds, and a wait of 0 would wait forever!
+
+            event = pygame.event.wait(int(remaining * 1000))
+            if event.type == pygame.NOEVENT:
+                continue # The wait ran out, so we check how much of the frame is left
+
+            arrivals.append((event, (time.perf_counter(), True)))
+            if event.type in INPUT_EVENTS:
+                break
+
+        arrived = (time.perf_counter(), True)
+        arrivals += [(event, arrived) for event in pygame.event.get()] # Anything that came in right behind the last one
+        return arrivals
+
+
+    ''' readMouse
+        Takes this frame's mouse events (with when they arrived), and works out the mouse's position and buttons from them, in order.
+        A button that goes down and back up within a single frame still shows as pressed (and held) this frame, and released the next.
+        To do that, once a button changes a second time, that event and every mouse event after it is held back for the next frame.
+    '''
+    def readMouse(self, mouseEvents):
+        mouseEvents = self.heldMouseEvents + mouseEvents
+        self.heldMouseEvents = []
+
+        buttons = list(self.mouseButtons)
+        pressed = [False, False, False]
+        released = [False, False, False]
+
+        for index, (event, arrival) in enumerate(mouseEvents):
+            if event.type != pygame.MOUSEMOTION and event.button <= 3: # Buttons 4 and up are the scroll wheel, and the like
+                button = event.button - 1
+                isDown = event.type == pygame.MOUSEBUTTONDOWN
+                if (isDown and released[button]) or (not isDown and pressed[button]):
+                    self.heldMouseEvents = mouseEvents[index:] # This button already changed this frame
+                    break
+
+                buttons[button] = isDown
+                if isDown:
+                    pressed[button] = True
+                else:
+                    released[button] = True
+                self.inputArrivals.append(arrival)
+
+            self.windowMousePos = event.pos
+
+        self.mousePos = self.toCanvas(self.windowMousePos) # The mouse is in window coordinates, but everything else is on the canvas
+        self.mouseButtons = tuple(buttons)
+        self.mousePressed = tuple(pressed)
+        self.mouseReleased = tuple(released)
+
+
     ''' typingPrompt
         This takes a string, and then makes the user type a string. After typing, it returns the new string
     '''
@@ -243,11 +458,7 @@ class PygameWrapper:
         while True:
             
             # This is how we get keys from pygame! 
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT: # pygame.QUIT is a windows exit / X button
-                    pygame.quit() # Clicking it should instantly shut down the game.
-                    sys.exit() # It's just much easier this way. Python shouldn't care; it has a garbage collector!
-
+            for event in self.updateInput():
                 # After grabbing events, we must divide them, or else we get a huge stinkin' if chain.
                 # Though, I don't think it matters in this program...
                 if event.type == pygame.KEYDOWN: # This detects if its a key
@@ -265,49 +476,241 @@ class PygameWrapper:
             
             self.screen.fill((173, 216, 230)) # Reset the screen to a light blue
 
-            promptSurface = self.font.render(prompt, self.font, (0,0,0)) # Render the prompt
+            promptSurface = self.textRenderer.render(prompt) # Render the prompt
             self.screen.blit(promptSurface, (0, self.screenHeight/2-18)) # We put this just a bit above the middle
                              
-            textSurface = self.font.render(inputText, self.font, (0,0,0)) # Render the currently typed text
+            textSurface = self.textRenderer.render(inputText) # Render the currently typed text
             self.screen.blit(textSurface, (0, self.screenHeight/2)) # We put this in the middle
             
-            pygame.display.flip() # Shows the frame we've rendered.
+            self.present() # Shows the frame we've rendered.
     
 
     ''' textPopUp
         This takes a list of strings, and renders them all on screen. 
     '''
     def textPopUp(self, prompts):
-        self.screen.fill((173, 216, 230)) # We first set the color to a light blue
-
-        currentPrompt = 0 # Used for currentPrompt*12 to place each prompt below the last
-        for prompt in prompts:
-            newTextSurface = self.font.render(prompt, self.font, (0,0,0)) # Render the prompt
-            self.screen.blit(newTextSurface, (0, currentPrompt*12)) # Place the prompt in it's place
-            currentPrompt += 1
-
         # This is makes a manual bounding box for an exit button the user clicks to leave the prompt.
         exitButton = pygame.Surface((BAR_WIDTH, CARD_HEIGHT), pygame.SRCALPHA) # Creates the surface to render the texture on
+        self.surfacesAllocated += 1
         exitButton.blit(self.exitImage, (0,0)) # Renders the texture onto the surface
         exitRectangle = exitButton.get_rect() # Now we make a rectangle that the surface is actually on
         exitRectangle.center = (self.screenWidth/2, self.screenHeight - CARD_HEIGHT/2) # We put this rectangle at the bottom of the screen
 
-        self.screen.blit(exitButton, exitRectangle) # This finally renders the exit button in its place.
+        while True:
+            self.updateInput() # Ticks the clock, and gets the mouse's coordinates and buttons
 
-        pygame.display.flip() # We now finally render everything to the screen. This doesn't need to update each frame, so it doesn't.
+            # This checks if the mouse is currently over the exit button, and if mouse 1 button has just been clicked.
+            if exitRectangle.collidepoint(self.mousePos) and self.mousePressed[0]:
+                return # If so, we're done here!
 
-        while True:
-            mousePos = pygame.mouse.get_pos() # Gets the mouse's coordinates
-            mouseButtons = pygame.mouse.get_pressed() # Checks the mouse's buttons
+            # The popup is redrawn every frame, so anything drawn over it (like the performance overlay) stays up to date.
+            self.screen.fill((173, 216, 230)) # We first set the color to a light blue
 
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT: # pygame.QUIT is a windows exit / X button
-                    pygame.quit() # Clicking it should instantly shut down the game.
-                    sys.exit() # It's just much easier this way. Python shouldn't care; it has a garbage collector!
+            currentPrompt = 0 # Used for currentPrompt*12 to place each prompt below the last
+            for prompt in prompts:
+                newTextSurface = self.textRenderer.render(prompt) # Render the prompt
+                self.screen.blit(newTextSurface, (0, currentPrompt*12)) # Place the prompt in it's place
+                currentPrompt += 1
 
-            # This checks if the mouse is currently over the exit button, and if mouse 1 button has been clicked.
-            if exitRectangle.collidepoint(mousePos) and mouseButtons[0]:
-                return # If so, we're done here!
+            self.screen.blit(exitButton, exitRectangle) # This finally renders the exit button in its place.
+
+            self.present() # We now finally render everything to the screen.
+
+
+
+''' TextRenderer
+    This renders text with our font, but remembers what it rendered, so showing the same text again is just a blit.
+    Perfect DOS VGA 437 is fixed width, so each letter (a glyph) is rendered once and then new text is built by placing glyphs side by side.
+    Only the TEXT_CACHE_SIZE most recently used strings are kept, so a lot of different popups can't use up all our memory.
+'''
+class TextRenderer:
+    ''' __init__
+        TextRenderer's init takes the (fixed width!) font to render with, and how many strings to cache.
+    '''
+    def __init__(self, font, cacheSize=TEXT_CACHE_SIZE):
+        self.font = font
+        self.cacheSize = cacheSize
+        self.glyphWidth, self.glyphHeight = font.size("W") # Every glyph is the same size, so any letter works here
+        self.glyphs = {} # Maps a (letter, color) to its rendered glyph
+        self.cache = OrderedDict() # Maps a (text, color) to its rendered surface, with the most recently used last
+        self.surfacesAllocated = 0 # Glyphs and strings rendered so far, for the performance overlay
+
+
+    ''' getGlyph
+        Takes a single letter and a color, and returns its rendered glyph, rendering it the first time it's asked for.
+    '''
+    def getGlyph(self, letter, color):
+        glyph = self.glyphs.get((letter, color))
+        if glyph is None:
+            glyph = self.font.render(letter, True, color)
+            self.surfacesAllocated += 1
+            self.glyphs[(letter, color)] = glyph
+        return glyph
+
+
+    ''' render
+        Takes text and a color (black by default), and returns a surface with the text on it.
+        Text we've recently rendered comes straight from the cache. Otherwise, it's built from glyphs and then cached.
+    '''
+    def render(self, text, color=(0, 0, 0)):
+        key = (text, color)
+        surface = self.cache.get(key)
+        if surface is not None:
+            self.cache.move_to_end(key) # It was just used, so it should be the last to be forgotten
+            return surface
+
+        surface = pygame.Surface((len(text) * self.glyphWidth, self.glyphHeight), pygame.SRCALPHA)
+        self.surfacesAllocated += 1
+        x = 0
+        for letter in text:
+            if letter != " ":
+                # Glyphs never overlap, so taking the max of each pixel just copies the glyph, alpha and all.
+                surface.blit(self.getGlyph(letter, color), (x, 0), special_flags=pygame.BLEND_RGBA_MAX)
+            x += self.glyphWidth
+
+        self.cache[key] = surface
+        if len(self.cache) > self.cacheSize:
+            self.cache.popitem(last=False) # Forget the text we used the longest ago
+        return surface
+
+
+''' PerfOverlay
+    This shows how well the game is running, on top of whatever screen we're on. Press PERF_TOGGLE_KEY (F3) to show or hide it.
+    The PygameWrapper records every frame with .recordFrame, even while it's hidden, so turning it on shows the last few seconds right away.
+    It shows the frames per second, frame time percentiles and a histogram of them, how long the game's engine and the renderer took,
+    how many surfaces were made, and how many events were waiting each frame. All of it is over the last PERF_FRAMES frames.
+'''
+class PerfOverlay:
+    ''' __init__
+        PerfOverlay's init takes the pygameWrapper it draws on, and how many frames to keep numbers for.
+    '''
+    def __init__(self, pygameWrapper, frames=PERF_FRAMES):
+        self.pygameWrapper = pygameWrapper
+        self.enabled = False
+
+        # One entry per frame, oldest first. Once full, each new frame pushes the oldest one out.
+        self.frameLengths = deque(maxlen=frames) # Milliseconds from one frame to the next
+        self.renderTimes = deque(maxlen=frames) # Milliseconds the main thread was busy (not waiting for the frame to end)
+        self.engineTimes = deque(maxlen=frames) # Milliseconds the game's engine worked, if it runs on its own thread
+        self.allocations = deque(maxlen=frames) # Surfaces made
+        self.eventDepths = deque(maxlen=frames) # Events waiting in pygame's queue
+        self.latencies = deque(maxlen=frames) # Milliseconds from a click or key press arriving to the frame showing it
+        self.latencyBounds = deque(maxlen=frames) # Whether each of those is only an upper bound (see PygameWrapper.waitForEvents)
+
+        self.engineTotal = 0.0 # Seconds the engine has worked in total, as last reported
+        self.lastEngineTotal = 0.0
+        self.lastAllocated = pygameWrapper.surfacesAllocated + pygameWrapper.textRenderer.surfacesAllocated # Only count surfaces made from now on
+
+
+    ''' recordFrame
+        Called by PygameWrapper.updateInput every frame, with the frame's length, how long we were busy, and how many events there were.
+    '''
+    def recordFrame(self, frameLength, busyTime, eventDepth):
+        allocated = self.pygameWrapper.surfacesAllocated + self.pygameWrapper.textRenderer.surfacesAllocated
+
+        self.frameLengths.append(frameLength)
+        self.renderTimes.append(busyTime)
+        self.engineTimes.append((self.engineTotal - self.lastEngineTotal) * 1000)
+        self.allocations.append(allocated - self.lastAllocated)
+        self.eventDepths.append(eventDepth)
+
+        self.lastEngineTotal = self.engineTotal
+        self.lastAllocated = allocated
+
+
+    ''' recordLatency
+        Called by PygameWrapper.present with how many seconds ago a click or key press it just showed arrived,
+        and whether that's exact, or only an upper bound because it came in while a frame was being made.
+    '''
+    def recordLatency(self, latency, exact=True):
+        self.latencies.append(latency * 1000)
+        self.latencyBounds.append(not exact)
+
+
+    ''' latencyStats
+        Returns a dictionary of input latency numbers over the last few seconds of input, all in milliseconds:
+        how many samples there are, the p50, p95 and p99 latency, the worst one, and the length of a frame to compare them with.
+        "upperBounds" says how many of the samples are only upper bounds, for input that came in while a frame was being made.
+    '''
+    def latencyStats(self):
+        stats = {"samples": len(self.latencies), "upperBounds": sum(self.latencyBounds), "frame": 1000 / FRAME_RATE}
+        if not self.latencies:
+            return stats
+
+        sortedLatencies = sorted(self.latencies)
+        stats["p50"] = self.percentile(sortedLatencies, 50)
+        stats["p95"] = self.percentile(sortedLatencies, 95)
+        stats["p99"] = self.percentile(sortedLatencies, 99)
+        stats["max"] = sortedLatencies[-1]
+        return stats
+
+
+    ''' reportEngineTime
+        Takes the total seconds the game's engine has worked, which the engine's thread sends along with its snapshots.
+    '''
+    def reportEngineTime(self, engineTotal):
+        self.engineTotal = engineTotal
+
+
+    ''' percentile
+        Takes a sorted list of numbers and a percent, and returns the number that percent of the list is at or under.
+    '''
+    def percentile(self, values, percent):
+        index = min(len(values) - 1, int(len(values) * percent / 100))
+        return values[index]
+
+
+    ''' render
+        Draws the overlay in the top right corner of the screen. PygameWrapper.present calls this when the overlay is on.
+    '''
+    def render(self):
+        if not self.frameLengths:
+            return # No frames yet, so no numbers!
+
+        screen = self.pygameWrapper.screen
+        textRenderer = self.pygameWrapper.textRenderer
+        frames = len(self.frameLengths)
+
+        sortedLengths = sorted(self.frameLengths)
+        averageLength = sum(sortedLengths) / frames
+        fps = 1000 / averageLength if averageLength > 0 else 0
+
+        lines = [
+            f"{fps:5.1f} fps over {frames} frames",
+            f"p50 {self.percentile(sortedLengths, 50):.1f} ms  p95 {self.percentile(sortedLengths, 95):.1f} ms  p99 {self.percentile(sortedLengths, 99):.1f} ms",
+            f"engine {sum(self.engineTimes) / frames:5.2f} ms  render {sum(self.renderTimes) / frames:5.2f} ms",
+            f"surfaces {sum(self.allocations) / frames:5.2f}/frame  events {max(self.eventDepths)} max",
+        ]
+        latency = self.latencyStats()
+        if latency["samples"] > 0:
+            lines.append(f"input p50 {latency['p50']:.1f} ms  p99 {latency['p99']:.1f} ms  max {latency['max']:.1f} ms")
+            if latency["upperBounds"]:
+                lines.append(f"  {latency['upperBounds']} of {latency['samples']} came in mid-frame: at most this long")
+
+        # The frame time histogram goes under the text, one bar per bucket, scaled so the tallest bar fills the space.
+        buckets = [0] * PERF_BUCKETS
+        for length in self.frameLengths:
+            buckets[min(PERF_BUCKETS - 1, int(length // PERF_BUCKET_MS))] += 1
+
+        lineHeight = textRenderer.glyphHeight
+        width = max(len(line) for line in lines) * textRenderer.glyphWidth
+        histogramHeight = 4 * lineHeight
+        x = self.pygameWrapper.screenWidth - width
+        panel = pygame.Rect(x, 0, width, len(lines) * lineHeight + histogramHeight)
+        pygame.draw.rect(screen, (255, 255, 255), panel) # A solid background, so it's readable on any screen
+
+        y = 0
+        for line in lines:
+            screen.blit(textRenderer.render(line), (x, y))
+            y += lineHeight
+
+        barWidth = width // PERF_BUCKETS
+        tallest = max(buckets)
+        for bucket, count in enumerate(buckets):
+            barHeight = histogramHeight * count // tallest
+            bar = pygame.Rect(x + bucket * barWidth, y + histogramHeight - barHeight, barWidth - 1, barHeight)
+            color = (0, 160, 0) if bucket * PERF_BUCKET_MS <= 1000 / FRAME_RATE else (200, 0, 0) # Red means slower than our frame rate
+            pygame.draw.rect(screen, color, bar)
 
 
 
@@ -334,13 +737,15 @@ class Clickable:
 
         self.hoverTexture = hoverTexture # A texture used when we're hovering over the object
         self.canHover = True # 
+        self.hovered = False # Whether we are currently showing the hover image
         
-        # This defines the base surface of the card which we then layer any graphics to
-        # You will want to use Clickable.image.blit(graphics, (x, y)) to add a layer.
-        # To refresh a clickable, you will want to reset it by running the below line again: self.image = pygame.Surface 
-        self.image = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-
+        # This defines the base surface of the card which we then layer any graphics to.
+        # You will want to use Clickable.addGraphic(graphics) to add a layer, and Clickable.clearGraphics() to start over.
+        # We keep a prebuilt normal image and hover image, and self.image just points at whichever one we're showing.
+        # That way hovering only swaps which surface we blit, instead of making and layering a new surface every frame.
         self.graphics = [] # This list is used for the graphics put onto the image in order: #2 is layered ontop of #1!
+        self.hoverImage = None # Only made if we have a hoverTexture
+        self.resetImage() # This makes self.normalImage, self.hoverImage, and points self.image at the right one
         
         # This is how we move the image around. You can set the position via card.rectangle.center(x, y) and a bunch of other functions like .move(x, y)
         # Then we can send it to be rendered via screen.blit(card.image, card.rectangle)
@@ -349,22 +754,54 @@ class Clickable:
 
     ''' addGraphic
         This adds a graphic to the clickable, and is used when defining a clickables graphics.
-        It simply appends it to our graphics list, and then renders it onto the clickable's current image.
+        It simply appends it to our graphics list, and then renders it onto the clickable's normal and hover images.
     '''
     def addGraphic(self, graphic):
         self.graphics.append(graphic)
-        self.image.blit(graphic, (0, 0)) # Renders the new graphic to the clickable's current image
+        self.normalImage.blit(graphic, (0, 0)) # Renders the new graphic to the clickable's normal image
+        if self.hoverImage is not None:
+            # The hover texture sits on top of everything, so the hover image is just rebuilt from the normal one.
+            self.hoverImage = self.normalImage.copy()
+            self.pygameWrapper.surfacesAllocated += 1
+            self.hoverImage.blit(self.hoverTexture, (0, 0))
+            if self.hovered:
+                self.image = self.hoverImage
+
+
+    ''' clearGraphics
+        This removes every graphic from the clickable, so you can give it brand new ones with .addGraphic.
+    '''
+    def clearGraphics(self):
+        self.graphics = []
+        self.resetImage()
 
 
     ''' resetImage
-        This removes any graphics that we did not define inherently to the clickables graphics.
-        This is mainly for the clickable's own hover texture, 
-        But it was also once used when playing around with it for menu stuff!!! Though, that didn't come to fruition
+        This rebuilds the clickable's normal and hover images from scratch, using only the graphics in self.graphics.
+        It's only needed when the graphics change; hovering never calls it.
     '''
     def resetImage(self):
-        self.image = pygame.Surface((self.width, self.height), pygame.SRCALPHA) # Reset the clickable's current image / surface
+        self.normalImage = pygame.Surface((self.width, self.height), pygame.SRCALPHA) # Reset the clickable's normal image / surface
+        self.pygameWrapper.surfacesAllocated += 1
         for graphic in self.graphics:
-            self.image.blit(graphic, (0, 0)) # Render all the textures to the surface
+            self.normalImage.blit(graphic, (0, 0)) # Render all the textures to the surface
+
+        if self.hoverTexture is not None:
+            self.hoverImage = self.normalImage.copy()
+            self.pygameWrapper.surfacesAllocated += 1
+            self.hoverImage.blit(self.hoverTexture, (0, 0))
+
+        self.image = self.hoverImage if self.hovered and self.hoverImage is not None else self.normalImage
+
+
+    ''' setHovered
+        This swaps between the normal and hover image, but only when the hover state actually changes.
+    '''
+    def setHovered(self, hovered):
+        if hovered == self.hovered:
+            return # Nothing changed, so there's nothing to do!
+        self.hovered = hovered
+        self.image = self.hoverImage if hovered and self.hoverImage is not None else self.normalImage
 
 
     ''' display:
@@ -391,15 +828,9 @@ class Clickable:
         Takes a mouse position (an X and Y tuple), and checks if it's inside of the clickable.
     '''
     def isHovered(self, mousePos):
-        if self.rectangle.collidepoint(mousePos) and self.canHover is True: # Check if the mousePos is over the rectangle
-            if self.hoverTexture is not None: 
-                self.image.blit(self.hoverTexture, (0,0)) # If it is, then it's hovered, and we show that with a hoverTexture
-            return True
-        else:
-            # If it's not being hovered over, we remove a hoverTexture removing the hoverTexture
-            # Very inefficient, but you may be suprised how much that does not matter at all.
-            self.resetImage()
-            return False
+        hovered = self.rectangle.collidepoint(mousePos) and self.canHover is True # Check if the mousePos is over the rectangle
+        self.setHovered(hovered) # If it is, then it's hovered, and we show that with the hover image
+        return hovered
     
 
     ''' isClicked
@@ -407,11 +838,159 @@ class Clickable:
         With this, it checks if the clickable is hovered over, and the mouseButton's mouse 1 is down.
     '''
     def isClicked(self, mouseButtons, mousePos):
+        # We always check the hover first, so the hover image stays up to date even when nothing is clicked.
+        hovered = self.isHovered(mousePos)
         # Return if the clickable is hovered, and the mouse has clicked mouse1.
-        return (mouseButtons[0] and self.isHovered(mousePos))
+        return (mouseButtons[0] and hovered)
     
 
 
+''' HitGrid
+    This answers "what clickable is under the mouse?" without checking every single clickable, every single frame.
+    Clickables are put into a uniform grid of square cells, in the order they're drawn (their z-order), when the layout changes.
+    Then each frame, we only look at the one cell the mouse is in, and .update tells us everything under the mouse, topmost first.
+    It also handles hover images, so only the topmost clickable is shown as hovered.
+'''
+class HitGrid:
+    ''' __init__
+        HitGrid's init takes the size of each cell in pixels. A card wide is a good size, since most clickables are about that big.
+    '''
+    def __init__(self, cellSize=CARD_WIDTH):
+        self.cellSize = cellSize
+        self.cells = {} # Maps an (x, y) cell to the clickables that overlap it, bottom to top.
+        self.hits = [] # Everything under the mouse as of the last .update, topmost first
+        self.hovered = None # The topmost clickable under the mouse as of the last .update
+
+
+    ''' rebuild
+        Takes a list of clickables in the order they're drawn (so the last one is on top), and puts them into the grid.
+        Only call this when the layout changes! Like when clickables move, appear, or disappear.
+    '''
+    def rebuild(self, clickables):
+        self.cells = {}
+        for clickable in clickables:
+            rectangle = clickable.rectangle
+            # Every cell the rectangle overlaps gets the clickable.
+            for cellX in range(rectangle.left // self.cellSize, (rectangle.right - 1) // self.cellSize + 1):
+                for cellY in range(rectangle.top // self.cellSize, (rectangle.bottom - 1) // self.cellSize + 1):
+                    self.cells.setdefault((cellX, cellY), []).append(clickable)
+
+        if self.hovered is not None and self.hovered not in clickables:
+            self.hovered.setHovered(False) # It's gone, so it shouldn't stay hovered.
+            self.hovered = None
+
+
+    ''' query
+        Takes a mouse position, and returns every clickable under it, topmost first.
+        A clickable passed as exclude is skipped, which is how we look under something being dragged.
+    '''
+    def query(self, mousePos, exclude=None):
+        cell = self.cells.get((int(mousePos[0]) // self.cellSize, int(mousePos[1]) // self.cellSize))
+        if cell is None:
+            return []
+        return [clickable for clickable in reversed(cell) if clickable is not exclude and clickable.rectangle.collidepoint(mousePos)]
+
+
+    ''' update
+        This is the once a frame query. It finds everything under the mouse, and updates which clickable shows its hover image.
+        It returns the topmost clickable under the mouse, or None.
+    '''
+    def update(self, mousePos, exclude=None):
+        self.hits = self.query(mousePos, exclude)
+        topmost = self.hits[0] if self.hits else None
+
+        if topmost is not self.hovered:
+            if self.hovered is not None:
+                self.hovered.setHovered(False)
+            self.hovered = topmost
+        if topmost is not None:
+            topmost.setHovered(topmost.canHover is True) # Clickables on cooldown don't show that they're hovered.
+
+        return topmost
+
+
+    ''' isUnder
+        Takes a clickable, and returns if it was under the mouse as of the last .update. Used for drag and drop targets.
+    '''
+    def isUnder(self, clickable):
+        return clickable in self.hits
+
+
+''' HandView
+    This keeps card clickables for a hand, but only for the cards we can actually see, plus a few on either side.
+    A hand of 60+ cards only ever has about a screen's worth of clickables, so hand size doesn't change how long a frame takes.
+    Clickables are kept per card, so when a card is drawn or played we only make or drop that one card's clickable.
+'''
+class HandView:
+    ''' __init__
+        HandView's init takes a pygameWrapper, and how many cards past each side of the visible window we keep clickables for.
+    '''
+    def __init__(self, pygameWrapper, prefetch=HAND_PREFETCH):
+        self.pygameWrapper = pygameWrapper
+        self.prefetch = prefetch
+
+        self.hand = None # The hand we are showing
+        self.handVersion = -1 # The hand's version when we last synced, so we know if it changed
+        self.firstCard = 0
+        self.lastCard = 0
+        self.clickables = {} # Maps each card we keep a clickable for to its clickable.
+
+
+    ''' makeClickable
+        Makes a clickable for a single card, with its color and rank.
+    '''
+    def makeClickable(self, card):
+        newCard = Clickable(CARD_WIDTH, CARD_HEIGHT, card, self.pygameWrapper.purpleBorder, self.pygameWrapper)
+        newCard.addGraphic(self.pygameWrapper.getColor(card.color))
+        newCard.addGraphic(self.pygameWrapper.getType(card.rank))
+        return newCard
+
+
+    ''' sync
+        Takes a hand and the firstCard to lastCard window we're showing, and makes sure we have clickables for just that window.
+        If neither the hand nor the window changed, this does nothing at all.
+    '''
+    def sync(self, hand, firstCard, lastCard):
+        if hand is self.hand and hand.version == self.handVersion and firstCard == self.firstCard and lastCard == self.lastCard:
+            return
+
+        if hand is not self.hand:
+            self.clickables = {} # A different hand shares no cards with the old one.
+
+        self.hand = hand
+        self.handVersion = hand.version
+        self.firstCard = firstCard
+        self.lastCard = lastCard
+
+        # The cards we want clickables for: the visible window, plus the prefetch margin.
+        start = max(0, firstCard - self.prefetch)
+        end = min(len(hand.cards), lastCard + self.prefetch)
+        wanted = hand.cards[start:end]
+
+        # Diff it against what we already have. New cards get a clickable, and cards that left get dropped.
+        keptClickables = {}
+        for card in wanted:
+            clickable = self.clickables.get(card)
+            if clickable is None:
+                clickable = self.makeClickable(card)
+            keptClickables[card] = clickable
+        self.clickables = keptClickables
+
+
+    ''' visible
+        Returns the clickables for the firstCard to lastCard window, in order from left to right.
+    '''
+    def visible(self):
+        return [self.clickables[card] for card in self.hand.cards[self.firstCard:self.lastCard]]
+
+
+    ''' isCard
+        Takes a clickable, and returns if it is one of this hand's card clickables.
+    '''
+    def isCard(self, clickable):
+        return clickable is not None and self.clickables.get(clickable.clickedObject) is clickable
+
+
 ''' Menu
     This class takes a pygameWrapper, and then handles all of the main menu stuff.
     It's main use is it's .mainMenu method for a main menu, which then returns a valid list of players for a new game.
@@ -425,9 +1004,10 @@ class Menu:
     def __init__(self, pygameWrapper):
         self.pygameWrapper = pygameWrapper
 
-        # This is used so that you don't click some buttons multiple times a frame.
-        # Of particular note, is the escape / back buttons, and the full screen button.
+        # Buttons only react to the mouse going down, so you can't click them multiple times a frame.
+        # But the full screen button also gets a cooldown, since toggling fullscreen is slow for the operating system.
         self.clickCooldown = False 
+        self.clickCooldownEnd = 0 # The frame time the cooldown ends at
 
         # literally just the logo we show at the top of the main menu. It's a clickable, but you can never actually click it!
         self.logo = Clickable(CARD_HEIGHT * 3, CARD_HEIGHT * 2, None, None, self.pygameWrapper)
@@ -452,6 +1032,16 @@ class Menu:
         self.fullscreenButton = Clickable(BAR_WIDTH, CARD_HEIGHT, None, None, self.pygameWrapper)
         self.fullscreenButton.addGraphic(self.pygameWrapper.fullscreenImage)
 
+        # There's no image for house rules, so its button is just text. The rules picked here are what the next game is played by.
+        self.houseRules = rules.DEFAULT_RULES
+        self.houseRulesButton = Clickable(BAR_WIDTH, CARD_HEIGHT, None, None, self.pygameWrapper)
+        self.updateHouseRulesButton()
+
+        # Big tables: how many unnamed computer players join the next game, besides the players picked in the new game menu.
+        self.extraComputers = 0
+        self.extraComputersButton = Clickable(BAR_WIDTH, CARD_HEIGHT, None, None, self.pygameWrapper)
+        self.updateExtraComputersButton()
+
 
         self.players = []
         for i in range(10): # These players are essentially cards that you can later see in the UserInterface object
@@ -470,22 +1060,117 @@ class Menu:
         self.resetChoice = Clickable(CARD_WIDTH, CARD_HEIGHT, None, None, self.pygameWrapper)
         self.resetChoice.addGraphic(self.pygameWrapper.resetChoiceImage)
 
+        # The hit grid we use to find what's under the mouse in .newGameMenu, and the clickables in it.
+        self.hitGrid = HitGrid()
+        self.newGameClickables = []
+
+        # Every menu's layout is worked out once, here. The canvas never changes size, so neither do they!
+        self.layoutMenus()
+
+
+    ''' layoutMenus
+        This works out where every clickable in every menu goes, as a list of (clickable, center) pairs per menu.
+        Some clickables (like the back button) are in more than one menu, so a menu applies its layout with .applyLayout when it opens.
+    '''
+    def layoutMenus(self):
+        screenWidth = self.pygameWrapper.screenWidth
+        screenHeight = self.pygameWrapper.screenHeight
+
+        self.mainMenuLayout = [
+            (self.logo, (screenWidth/2, screenHeight/5)),
+            (self.startNewGame, (screenWidth/2, screenHeight/5 * 2.5)),
+            (self.settingsButton, (screenWidth/2, screenHeight/5 * 3.5)),
+            (self.exitButton, (screenWidth/2, screenHeight/5 * 4.5)),
+        ]
+
+        self.settingsMenuLayout = [
+            (self.resolutionButton, (screenWidth/2, screenHeight/10)),
+            (self.fullscreenButton, (screenWidth/2, screenHeight/3)),
+            (self.houseRulesButton, (screenWidth/2, screenHeight/5 * 3)),
+            (self.extraComputersButton, (screenWidth/2, screenHeight/5 * 4)),
+            (self.backButton, (CARD_HEIGHT/2, screenHeight - CARD_HEIGHT/2)),
+        ]
+
+        self.newGameMenuLayout = [
+            # We show the start new game button at the top, but not directly at the top
+            (self.startNewGame, (screenWidth/2, screenHeight/10)),
+            # The three choices in the middle: player, robot, or none.
+            (self.resetChoice, (screenWidth/2, screenHeight/5 * 2)),
+            (self.playerChoice, (screenWidth/2 * 1.5, screenHeight/5 * 2)),
+            (self.robotChoice, (screenWidth/2 * 0.5, screenHeight/5 * 2)),
+            # And a back button at the bottom left.
+            (self.backButton, (CARD_HEIGHT/2, screenHeight - CARD_HEIGHT/2)),
+        ]
+        currentPlayer = 0
+        for player in self.players: # And the players go along the bottom, drawn last so they're on top.
+            self.newGameMenuLayout.append((player, ((currentPlayer) * 64 + 32, screenHeight - (CARD_HEIGHT * 1.5))))
+            currentPlayer += 1
+
+
+    ''' drawTextButton
+        Menu bars without an image are drawn as two lines of text instead: what the setting is, and what it's set to.
+    '''
+    def drawTextButton(self, clickable, title, value):
+        graphic = pygame.Surface((BAR_WIDTH, CARD_HEIGHT), pygame.SRCALPHA)
+        self.pygameWrapper.surfacesAllocated += 1
+        graphic.fill((255, 255, 255)) # A white border, like the other menu bars
+        graphic.fill((0, 0, 0), graphic.get_rect().inflate(-8, -8))
+        textRenderer = self.pygameWrapper.textRenderer
+        graphic.blit(textRenderer.render(title, (255, 0, 0)), (16, 18))
+        graphic.blit(textRenderer.render(value, (255, 0, 0)), (16, 40)) # The second line goes under the first
+
+        clickable.clearGraphics()
+        clickable.addGraphic(graphic)
+
+
+    ''' updateHouseRulesButton
+        This redraws the house rules button's text, so it always says which house rules are on.
+    '''
+    def updateHouseRulesButton(self):
+        self.drawTextButton(self.houseRulesButton, "House rules:", self.houseRules.describe())
+
+
+    ''' updateExtraComputersButton
+        This redraws the extra computers button's text, so it always says how many join the next game.
+    '''
+    def updateExtraComputersButton(self):
+        self.drawTextButton(self.extraComputersButton, "Extra computer players:", str(self.extraComputers))
+
+
+    ''' applyLayout
+        Takes a layout from .layoutMenus, and puts each of its clickables in place. Dragged clickables are left where they are.
+        It returns the clickables, in the order they should be drawn.
+    '''
+    def applyLayout(self, layout):
+        clickables = []
+        for clickable, center in layout:
+            if not clickable.clicked:
+                clickable.rectangle.center = center
+            clickables.append(clickable)
+        return clickables
+
 
     ''' turnOffClickCooldown
-        This handles the turning off of clickCooldown! It's called as a thread after turning the cooldown on, so it'll turn off.
+        This handles the turning off of clickCooldown! It's called by .updateClickCooldown once the cooldown has run out.
     '''
     def turnOffClickCooldown(self):
         self.clickCooldown = False
 
 
     ''' turnOnClickCooldown
-        This is how we handle the turning on of clickCooldown! Oh, and the logic of making sure it turns off eventually.
+        This is how we handle the turning on of clickCooldown! We just remember when it should end on the frame clock.
     '''
     def turnOnClickCooldown(self):
         self.clickCooldown = True
-        
-        # We just make a thread that waits 0.5 seconds to turnOffClickCooldown
-        threading.Timer(0.5, self.turnOffClickCooldown).start()
+        self.clickCooldownEnd = self.pygameWrapper.frameTime + CLICK_COOLDOWN
+
+
+    ''' updateClickCooldown
+        This is called every frame, right after .updateInput. If the cooldown has run out on the frame clock, it turns off.
+    '''
+    def updateClickCooldown(self):
+        if self.clickCooldown and self.pygameWrapper.frameTime >= self.clickCooldownEnd:
+            self.turnOffClickCooldown()
 
     
     ''' newGamePrompts
@@ -512,6 +1197,11 @@ class Menu:
             if player.clickedObject is not None:
                 currentPlayer += 1 # If the player was something we actually prompted for, then we add one and go to the next player.
 
+        # Then the extra computers from the settings menu. There can be lots of them, so they're just numbered instead of named.
+        for _ in range(self.extraComputers):
+            returnValue.append(ComputerPlayer(f"Computer {currentPlayer}"))
+            currentPlayer += 1
+
         playerNum = len(returnValue)
         prompt = f"You have {playerNum} players. Please enter the player who should be the dealer: "
         chosenPlayer = self.pygameWrapper.typingPrompt(prompt) # Choose a player to be a dealer!
@@ -527,82 +1217,81 @@ class Menu:
         return returnValue
     
 
+    ''' layoutNewGameMenu
+        This puts every clickable in .newGameMenu in its place, and then rebuilds the hit grid to match.
+        It's only called when something moves, so we aren't redoing any work every frame.
+    '''
+    def layoutNewGameMenu(self):
+        self.newGameClickables = self.applyLayout(self.newGameMenuLayout)
+        self.hitGrid.rebuild(self.newGameClickables)
+
+
     ''' newGameMenu
         This handles the selection of players: are they A.I, or a hotseat user?
     '''
     def newGameMenu(self):
+        selected = None # The player we are currently dragging
+        self.layoutNewGameMenu()
+
         while True:
-            mousePos = pygame.mouse.get_pos()
-            mouseButtons = pygame.mouse.get_pressed()
-            selected = None
+            self.pygameWrapper.updateInput() # Tick the frame clock and read the mouse
+            self.updateClickCooldown()
+            mousePos = self.pygameWrapper.mousePos
+            mouseButtons = self.pygameWrapper.mouseButtons # Held buttons, used for dragging
+            mousePressed = self.pygameWrapper.mousePressed # Buttons that just went down, used for clicking
 
-            self.pygameWrapper.screen.fill((173, 216, 230)) # Reset the screen to blue
+            # If we let go of a player, it goes back to its spot. That's a layout change!
+            if selected is not None and not mouseButtons[0]:
+                selected.clicked = False
+                selected = None
+                self.layoutNewGameMenu()
 
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT: # pygame.QUIT is a windows exit / X button
-                    pygame.quit() # Clicking it should instantly shut down the game.
-                    sys.exit() # It's just much easier this way. Python shouldn't care; it has a garbage collect
+            # One query a frame tells us what's under the mouse. A dragged player is skipped, so we can see what it's dropped on.
+            hovered = self.hitGrid.update(mousePos, selected)
 
-            # We show the start new game button at the top, but not directly at the top
-            self.startNewGame.displayAtCoords(self.pygameWrapper.screenWidth/2, self.pygameWrapper.screenHeight/10)
+            if mousePressed[0] and hovered in self.players and selected is None: # This is drag and drop, and not selection.
+                selected = hovered
+                selected.clicked = True
 
-            # The three choices in the middle: player, robot, or none.
-            self.resetChoice.displayAtCoords(self.pygameWrapper.screenWidth/2, self.pygameWrapper.screenHeight/5 * 2)
-            self.playerChoice.displayAtCoords(self.pygameWrapper.screenWidth/2 * 1.5, self.pygameWrapper.screenHeight/5 * 2)
-            self.robotChoice.displayAtCoords(self.pygameWrapper.screenWidth/2 * 0.5, self.pygameWrapper.screenHeight/5 * 2)
+            if selected is not None:
+                selected.rectangle.center = mousePos # A dragged player follows the mouse
 
-            # And a back button at the bottom left.
-            self.backButton.displayAtCoords(CARD_HEIGHT/2, self.pygameWrapper.screenHeight - CARD_HEIGHT/2)
+            self.pygameWrapper.screen.fill((173, 216, 230)) # Reset the screen to blue
 
-            currentPlayer = 0
-            for player in self.players: # We go through all of our clickable players
-                if not player.clicked: # If they aren't currently being clicked, we display them where they should be
-                    player.displayAtCoords((currentPlayer) * 64 + 32, self.pygameWrapper.screenHeight - (CARD_HEIGHT * 1.5))
-                else: # But if they are clicked, as in, being drag and dropped, then we display them where they currently are.
-                    player.display()
-                currentPlayer += 1
+            for clickable in self.newGameClickables:
+                if clickable is not selected:
+                    clickable.display()
+            if selected is not None:
+                selected.display() # The dragged player is displayed last, so it's on top of everything.
 
-            pygame.display.flip() # Update the displays render!
+            self.pygameWrapper.present() # Update the displays render!
 
 
-            if self.backButton.isClicked(mouseButtons, mousePos): # If we click the bottom left back button, leave
-                self.turnOnClickCooldown()
+            if mousePressed[0] and hovered is self.backButton: # If we click the bottom left back button, leave
                 return -1
 
-            for player in self.players:
-                if player.isClicked(mouseButtons, mousePos) and selected is None: # This is drag and drop, and not selection.
-                    selected = player
-                    player.clicked = True
-                    player.rectangle.center = mousePos
-                # This elif is to give it another change to keep following if the mouse moves too fast.
-                elif player.isClicked(mouseButtons, mousePos) and selected is None: 
-                    player.rectangle.center = mousePos
-                    selected = player
-                else:
-                    player.clicked = False # This is so it's drag and drop, and not selection. Otherwise, it'd be very awkward!
-
             # If we have something selected (a player) and then we also hover over / click playerChoice, then we make the player a player
-            if self.playerChoice.isClicked(mouseButtons, mousePos) and selected is not None:
-                selected.graphics = []
+            if selected is not None and hovered is self.playerChoice and selected.clickedObject != "Player":
+                selected.clearGraphics()
                 selected.addGraphic(self.pygameWrapper.wildCardImage)
                 selected.addGraphic(self.pygameWrapper.playerImage)
                 selected.clickedObject = "Player"
             
             # If we have something selected (a player) and then we also hover over / click playerChoice, then we make the player a !ROBOT!            
-            if self.robotChoice.isClicked(mouseButtons, mousePos) and selected is not None:
-                selected.graphics = []
+            if selected is not None and hovered is self.robotChoice and selected.clickedObject != "AI":
+                selected.clearGraphics()
                 selected.addGraphic(self.pygameWrapper.wildCardImage)
                 selected.addGraphic(self.pygameWrapper.robotImage)
                 selected.clickedObject = "AI"
             
             # If we have something selected (a player) and then we also hover over / click playerChoice, then we make the player... Nothin'
-            if self.resetChoice.isClicked(mouseButtons, mousePos) and selected is not None:
-                selected.graphics = []
+            if selected is not None and hovered is self.resetChoice and selected.clickedObject is not None:
+                selected.clearGraphics()
                 selected.addGraphic(self.pygameWrapper.wildCardImage)
                 selected.clickedObject = None
 
             # This starts a new game, by prompting for player info, and returning the now complete list of players.
-            if self.startNewGame.isClicked(mouseButtons, mousePos):
+            if mousePressed[0] and hovered is self.startNewGame:
                 returnValue = self.newGamePrompts()
                 return returnValue
     
@@ -612,26 +1301,23 @@ class Menu:
         You can change the resolution manually, or you can toggle fullscreen.
     '''
     def settingsMenu(self):
+        clickables = self.applyLayout(self.settingsMenuLayout)
         while True:
-            mousePos = pygame.mouse.get_pos()
-            mouseButtons = pygame.mouse.get_pressed()
+            self.pygameWrapper.updateInput() # Tick the frame clock and read the mouse
+            self.updateClickCooldown()
+            mousePos = self.pygameWrapper.mousePos
+            mousePressed = self.pygameWrapper.mousePressed # Buttons that just went down, used for clicking
 
             self.pygameWrapper.screen.fill((173, 216, 230))
 
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT: # pygame.QUIT is a windows exit / X button
-                    pygame.quit() # Clicking it should instantly shut down the game.
-                    sys.exit() # It's just much easier this way. Python shouldn't care; it has a garbage collect
-
             # Display all the buttons
-            self.resolutionButton.displayAtCoords(self.pygameWrapper.screenWidth/2, self.pygameWrapper.screenHeight/10)
-            self.fullscreenButton.displayAtCoords(self.pygameWrapper.screenWidth/2, self.pygameWrapper.screenHeight/3)
-            self.backButton.displayAtCoords(CARD_HEIGHT/2, self.pygameWrapper.screenHeight - CARD_HEIGHT/2)
+            for clickable in clickables:
+                clickable.display()
 
-            pygame.display.flip() # Render all the buttons
+            self.pygameWrapper.present() # Render all the buttons
 
             # If the resolution button is clicked, we prompt for the new resolution
-            if self.resolutionButton.isClicked(mouseButtons, mousePos): 
+            if self.resolutionButton.isClicked(mousePressed, mousePos): 
                 
                 # Enter a width
                 newWidth = self.pygameWrapper.typingPrompt("Please choose your new screen width: ")
@@ -645,40 +1331,35 @@ class Menu:
                     prompt = f"The minimum screen height is {MIN_SCREEN_HEIGHT}! Please enter a valid screen height: "
                     newHeight = self.pygameWrapper.typingPrompt(prompt)
                 
-                # And now, we update for the resolution!
-                self.pygameWrapper.screenWidth = int(newWidth)
-                self.pygameWrapper.screenHeight = int(newHeight)
-                self.pygameWrapper.screen = pygame.display.set_mode((self.pygameWrapper.screenWidth, self.pygameWrapper.screenHeight))
+                # And now, we update for the resolution! Only the window changes; we keep rendering to the same canvas.
+                self.pygameWrapper.setWindowSize(int(newWidth), int(newHeight))
             
             # If the fullscreen Button is clicked, we make it fullscreen, or make it not fullscreen
-            if self.fullscreenButton.isClicked(mouseButtons, mousePos) and self.clickCooldown is False: 
-                if self.pygameWrapper.fullscreen is not True:
-                    self.pygameWrapper.fullscreen = True # If it's not fullscreen, make it full screen!               
-                    self.pygameWrapper.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-
-                    # Sve the old non-fullscreen size.
-                    self.pygameWrapper.lastWidth = self.pygameWrapper.screenWidth
-                    self.pygameWrapper.lastHeight = self.pygameWrapper.screenHeight
-                    
-                    # And add the new fullscreen size as the "official" size, since we often use it for formatting clickables.
-                    screenInfo = pygame.display.Info()
-                    self.pygameWrapper.screenWidth = screenInfo.current_w
-                    self.pygameWrapper.screenHeight = screenInfo.current_h
-
-                else: # If it's not-not fullscreen, then it must be fullscreen!
-                    self.pygameWrapper.fullscreen = False # That means we should make it not fullscreen anymore.
-                    self.pygameWrapper.screenWidth = self.pygameWrapper.lastWidth
-                    self.pygameWrapper.screenHeight = self.pygameWrapper.lastHeight
-
-                    self.pygameWrapper.screen = pygame.display.set_mode((self.pygameWrapper.screenWidth, self.pygameWrapper.screenHeight))
+            if self.fullscreenButton.isClicked(mousePressed, mousePos) and self.clickCooldown is False: 
+                self.pygameWrapper.toggleFullscreen()
                 
                 # We turn on the cooldown since otherwise we spam fullscreen stuff, and an operating systems API really does not like that!!!
                 # Trust me; personal experience.
                 self.turnOnClickCooldown()
             
-            if self.backButton.isClicked(mouseButtons, mousePos):
-                self.turnOnClickCooldown() # If exit buttons been clicked, we exit.
-                return
+            # If the house rules button is clicked, we ask which house rules to play with, as letters.
+            if self.houseRulesButton.isClicked(mousePressed, mousePos):
+                prompt = "House rules? s: stacking, 7: 7-0, j: jump-in, d: draw to match. Empty for none: "
+                self.houseRules = rules.RuleSet.fromLetters(self.pygameWrapper.typingPrompt(prompt))
+                self.updateHouseRulesButton()
+
+            # If the extra computers button is clicked, we ask how many computer players to add to the next game.
+            if self.extraComputersButton.isClicked(mousePressed, mousePos):
+                prompt = f"How many extra computer players? Up to {MAX_EXTRA_COMPUTERS}: "
+                extraComputers = self.pygameWrapper.typingPrompt(prompt)
+                while not extraComputers.isdigit() or int(extraComputers) > MAX_EXTRA_COMPUTERS: # That's too many, even for us!
+                    prompt = f"That was not a correct value! Please enter a number from 0 to {MAX_EXTRA_COMPUTERS}: "
+                    extraComputers = self.pygameWrapper.typingPrompt(prompt)
+                self.extraComputers = int(extraComputers)
+                self.updateExtraComputersButton()
+
+            if self.backButton.isClicked(mousePressed, mousePos):
+                return # If exit buttons been clicked, we exit.
     
 
     ''' mainMenu
@@ -687,34 +1368,31 @@ class Menu:
         Oh, and it also returns a list of players when a new game is made. Very important!
     '''
     def mainMenu(self):
+        clickables = self.applyLayout(self.mainMenuLayout)
         while True:
-            mousePos = pygame.mouse.get_pos()
-            mouseButtons = pygame.mouse.get_pressed()
+            self.pygameWrapper.updateInput() # Tick the frame clock and read the mouse
+            self.updateClickCooldown()
+            mousePos = self.pygameWrapper.mousePos
+            mousePressed = self.pygameWrapper.mousePressed # Buttons that just went down, used for clicking
 
             self.pygameWrapper.screen.fill((173, 216, 230)) # Classic good ole blue! 
 
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT: # pygame.QUIT is a windows exit / X button
-                    pygame.quit() # Clicking it should instantly shut down the game.
-                    sys.exit() # It's just much easier this way. Python shouldn't care; it has a garbage collect
-
             # Display all the buttons... And the logo.
-            self.logo.displayAtCoords(self.pygameWrapper.screenWidth/2, self.pygameWrapper.screenHeight/5)
-            self.startNewGame.displayAtCoords(self.pygameWrapper.screenWidth/2, self.pygameWrapper.screenHeight/5 * 2.5)
-            self.settingsButton.displayAtCoords(self.pygameWrapper.screenWidth/2, self.pygameWrapper.screenHeight/5 * 3.5)
-            self.exitButton.displayAtCoords(self.pygameWrapper.screenWidth/2, self.pygameWrapper.screenHeight/5 * 4.5)
+            for clickable in clickables:
+                clickable.display()
 
-            pygame.display.flip() # This updates the display
+            self.pygameWrapper.present() # This updates the display
 
-            if self.startNewGame.isClicked(mouseButtons, mousePos): 
+            if self.startNewGame.isClicked(mousePressed, mousePos): 
                 returnValue = self.newGameMenu() # If the newGame is clicked, we go and do the stuff to make a new game!
                 if returnValue != -1:
                     return returnValue # If that turns out not to be an exit value, we return the expected list of players.
+                clickables = self.applyLayout(self.mainMenuLayout) # The new game menu moved the start new game button, so put it back.
             
-            if self.settingsButton.isClicked(mouseButtons, mousePos): 
+            if self.settingsButton.isClicked(mousePressed, mousePos): 
                 self.settingsMenu() # If the settings button is clicked, we go to the settings menu!
             
-            if self.exitButton.isClicked(mouseButtons, mousePos) and self.clickCooldown is False:
+            if self.exitButton.isClicked(mousePressed, mousePos):
                 pygame.quit() # If the exit button is clicked, we're out of here!!!
                 sys.exit()
 
@@ -737,13 +1415,16 @@ class UserInterface:
         
         self.currentUser = None # Later to be used for a player class.
 
-        # This is used so that you don't click some buttons multiple times a frame.
-        # Of particular note is the arrow keys.
+        # Buttons only react to the mouse going down, so you can't click them multiple times a frame.
+        # Drawing a card also gets a cooldown, so a double click doesn't accidentally draw twice.
         self.clickCooldown = False
+        self.clickCooldownEnd = 0 # The frame time the cooldown ends at
 
         # Clickables!
         self.discardPile = discardPile # Discard pile clickable. Used for dragging and dropping cards onto it
         self.discardClick = Clickable(CARD_WIDTH, CARD_HEIGHT, discardPile, None, self.pygameWrapper)
+        self.discardCard = None # The top card the discardClick texture was made for, and its color (wild cards change color!)
+        self.discardColor = None
         
         self.drawPile = drawPile # drawPile clickable! Honestly, there's no real reason for it having a drawPile object haha.
         self.drawClick = Clickable(CARD_WIDTH, CARD_HEIGHT, drawPile, None, self.pygameWrapper)
@@ -766,11 +1447,72 @@ class UserInterface:
         # This card stuff is neded to render the players cards
         self.firstCard = 0 # First card is the card the furthest to the left we will render
         self.lastCard = 0 # Last card is the card the furthest to the right we will render
-        self.cards = [] # And this is the list of card clickables we will make.
+        self.handSize = 0 # How many cards are in the hand we're showing
+        self.handView = HandView(self.pygameWrapper) # And this keeps the card clickables for just the cards we can see.
+        self.cards = [] # The card clickables we're currently showing, from firstCard to lastCard.
+
+        # The hit grid we use to find what's under the mouse, and everything we lay out for the turn.
+        self.hitGrid = HitGrid()
+        self.turnClickables = []
+        self.layoutChanged = True # Set whenever the layout needs to be redone before the next frame
+        self.selected = None # The card we are currently dragging
+
+        # The yes and no options, and the caption for .promptPlayCard
+        self.yesButton = Clickable(CARD_HEIGHT, CARD_WIDTH, None, None, self.pygameWrapper)
+        self.yesButton.addGraphic(self.pygameWrapper.yesImage)
+
+        self.noButton = Clickable(CARD_HEIGHT, CARD_WIDTH, None, None, self.pygameWrapper)
+        self.noButton.addGraphic(self.pygameWrapper.noImage)
+
+        self.playCardCaption = Clickable(BAR_WIDTH, CARD_HEIGHT, None, None, self.pygameWrapper)
+        self.playCardCaption.addGraphic(self.pygameWrapper.playCardImage)
+
+        # The four colors for .chooseColor, with borders because I'm nice!
+        self.colorChoices = []
+        for color, image in [('Red', self.pygameWrapper.redCardImage), ('Green', self.pygameWrapper.greenCardImage),
+                             ('Blue', self.pygameWrapper.blueCardImage), ('Yellow', self.pygameWrapper.yellowCardImage)]:
+            colorChoice = Clickable(CARD_WIDTH, CARD_HEIGHT, color, self.pygameWrapper.purpleBorder, self.pygameWrapper)
+            colorChoice.addGraphic(image)
+            self.colorChoices.append(colorChoice)
+
+        # Where everything goes is worked out once. The canvas never changes size, so neither does the layout!
+        self.layoutScreen()
+
+
+    ''' layoutScreen
+        This works out where all of the user interface's clickables go on the canvas.
+        Things that never move are just put in place, and the spots for cards in the hand are saved for .layoutTurn.
+    '''
+    def layoutScreen(self):
+        screenWidth = self.pygameWrapper.screenWidth
+        screenHeight = self.pygameWrapper.screenHeight
+
+        self.rightArrow.rectangle.center = (screenWidth-CARD_HEIGHT/2, screenHeight-CARD_HEIGHT/2)
+        self.leftArrow.rectangle.center = (CARD_HEIGHT/2, screenHeight-CARD_HEIGHT/2)
+        self.discardClick.rectangle.center = (screenWidth/2 + CARD_WIDTH, screenHeight/4)
+        self.drawClick.rectangle.center = (screenWidth/2 - CARD_WIDTH, screenHeight/4)
+        self.unoButton.rectangle.center = (CARD_HEIGHT/2, CARD_WIDTH/2)
+
+        # Cards are 48 pixels but we want parts in between. We also want 2 places for arrows
+        self.cardsPerRender = int((screenWidth/64) - 2)
+        # Though the list starts at 0, the "physical" cards start at 1. There is no "0th" card in our 2D space.
+        # We add one so we have room for the left arrow
+        self.cardSlots = [((currentCard+1) * 64, screenHeight - CARD_HEIGHT/2) for currentCard in range(1, self.cardsPerRender + 1)]
+
+        self.playableCardCenter = (screenWidth/2, screenHeight/2)
+        self.yesButton.rectangle.center = (screenWidth/4, screenHeight/5 * 4)
+        self.noButton.rectangle.center = (screenWidth/4*3, screenHeight/5 * 4)
+        self.playCardCaption.rectangle.center = (screenWidth/2, screenHeight/2 - CARD_HEIGHT)
+
+        currentColor = 1
+        for colorChoice in self.colorChoices:
+            colorChoice.rectangle.center = (screenWidth/5 * currentColor, screenHeight/2)
+            currentColor += 1
+        self.colorPromptY = screenHeight/2 - CARD_HEIGHT
 
 
     ''' turnOffClickCooldown
-        This handles the turning off of clickCooldown! It's called as a thread after turning the cooldown on, so it'll turn off.
+        This handles the turning off of clickCooldown! It's called by .updateClickCooldown once the cooldown has run out.
     '''
     def turnOffClickCooldown(self):
         self.clickCooldown = False
@@ -782,30 +1524,32 @@ class UserInterface:
         self.drawClick.canHover = True
 
     ''' turnOnClickCooldown
-        This is how we handle the turning on of clickCooldown! Oh, and the logic of making sure it turns off eventually.
+        This is how we handle the turning on of clickCooldown! We just remember when it should end on the frame clock.
     '''
     def turnOnClickCooldown(self):
         self.clickCooldown = True
+        self.clickCooldownEnd = self.pygameWrapper.frameTime + CLICK_COOLDOWN
         
         self.rightArrow.canHover = False
         self.leftArrow.canHover = False
         self.drawClick.canHover = False
-        
-        # We just make a thread that waits 0.5 seconds to turnOffClickCooldown
-        threading.Timer(0.5, self.turnOffClickCooldown).start()
+
+
+    ''' updateClickCooldown
+        This is called every frame, right after .updateInput. If the cooldown has run out on the frame clock, it turns off.
+    '''
+    def updateClickCooldown(self):
+        if self.clickCooldown and self.pygameWrapper.frameTime >= self.clickCooldownEnd:
+            self.turnOffClickCooldown()
 
 
     ''' updateCards
-        This function updates self.cards by taking a player, looking through their cards, and making clickables of them all.
+        This function updates self.cards by taking a player, and syncing the hand view to the window of cards we can see.
+        Only cards that came into view (or were drawn) get new clickables; the rest are reused.
     '''
     def updateCards(self, player):
-        self.cards = [] # Reset the current cards
-        for card in player.hand.cards:
-            # For each card make a clickable of it, add its respective color and rank, and then add it to our list of card clickables.
-            newCard = Clickable(CARD_WIDTH, CARD_HEIGHT, card, self.pygameWrapper.purpleBorder, self.pygameWrapper)
-            newCard.addGraphic(self.pygameWrapper.getColor(card.color))
-            newCard.addGraphic(self.pygameWrapper.getType(card.rank))
-            self.cards.append(newCard)
+        self.handView.sync(player.hand, self.firstCard, self.lastCard)
+        self.cards = self.handView.visible()
     
 
     ''' updateLastCard
@@ -813,10 +1557,13 @@ class UserInterface:
         That's done by just calculating the amount of them, and then size of each one.
     '''
     def updateLastCard(self, player):
-        cardsPerRender = int((self.pygameWrapper.screenWidth/64) - 2) # Cards are 48 pixels but we want parts in between. We also want 2 places for arrows
-        self.lastCard = self.firstCard + (cardsPerRender - 1) # cardsPerDisplay - 1, because the firstCard counts, and we start at 0.
+        if self.firstCard >= len(player.hand.cards): # If the hand shrank since last turn, don't start past the end of it
+            self.firstCard = max(0, len(player.hand.cards) - 1)
+
+        self.lastCard = self.firstCard + (self.cardsPerRender - 1) # cardsPerDisplay - 1, because the firstCard counts, and we start at 0.
         if self.lastCard > len(player.hand.cards): 
             self.lastCard = len(player.hand.cards)
+        self.handSize = len(player.hand.cards)
 
 
     ''' updateUserState
@@ -825,37 +1572,55 @@ class UserInterface:
     def updateUserState(self, player):
         self.updateLastCard(player)
         self.updateCards(player)
+        self.selected = None
+        self.layoutChanged = True
+
+        topCard = self.discardPile.cards[-1]
+        if topCard is not self.discardCard or topCard.color != self.discardColor: # Only redo the texture if the top card changed
+            self.discardCard = topCard
+            self.discardColor = topCard.color
+            self.discardClick.clearGraphics() # Reset what graphics the discard currently is graphics
+            self.discardClick.addGraphic(self.pygameWrapper.getColor(topCard.color)) # Make the texture match its top card
+            self.discardClick.addGraphic(self.pygameWrapper.getType(topCard.rank))
+
+
+    ''' layoutTurn
+        This picks which clickables are shown for the turn, puts the cards in their spots, and then rebuilds the hit grid to match.
+        It's only called when the layout changes: a new turn, scrolling through the hand, or letting go of a dragged card.
+    '''
+    def layoutTurn(self):
+        self.turnClickables = [] # Everything we show this turn, in the order it's drawn.
+
+        # We lay out our buttons first, so cards can then be displayed ontop of them.
+        if self.handSize > self.lastCard: # If there are more cards then the last we are rendering,
+            self.turnClickables.append(self.rightArrow) # Show the right arrow, so we can go right and make a new last card!
+        if 1 < self.firstCard: # If there are more cards then the first we are rendering
+            self.turnClickables.append(self.leftArrow) # Show the left arrow, so we can go left and make a new first card!
+
+        self.turnClickables += [self.discardClick, self.drawClick, self.unoButton]
 
-        self.discardClick.graphics = [] # Reset what graphics the discard currently is graphics
-        self.discardClick.addGraphic(self.pygameWrapper.getColor(self.discardPile.cards[-1].color)) # Make the texture match its top card
-        self.discardClick.addGraphic(self.pygameWrapper.getType(self.discardPile.cards[-1].rank))
+        for card, slot in zip(self.cards, self.cardSlots):
+            if not card.clicked: # If the card is not clicked / dragged, then it goes in its spot
+                card.rectangle.center = slot
+            self.turnClickables.append(card)
+
+        self.hitGrid.rebuild(self.turnClickables)
+        self.layoutChanged = False
 
 
     ''' renderTurn
         This function renders the turn we have in interfaceUser.
-        Unlike other objects rendering, this deserves it's own function due to semi-tricky hand rendering logic.
+        Everything is already in place thanks to .layoutTurn, so this just displays it all, with a dragged card on top.
     '''
     def renderTurn(self):
-        # We display our buttons first, so cards can then be displayed ontop of them.
-        if len(self.cards) > self.lastCard: # If there are more cards then the last we are rendering,
-            # Show the right arrow, so we can go right and make a new last card!
-            self.rightArrow.displayAtCoords(self.pygameWrapper.screenWidth-CARD_HEIGHT/2, self.pygameWrapper.screenHeight-CARD_HEIGHT/2)
-        if 1 < self.firstCard: # If there are more cards then the first we are rendering
-            # Show the left arrow, so we can go left and make a new first card!
-            self.leftArrow.displayAtCoords(CARD_HEIGHT/2, self.pygameWrapper.screenHeight-CARD_HEIGHT/2)
+        if self.layoutChanged:
+            self.layoutTurn()
 
-        self.discardClick.displayAtCoords(self.pygameWrapper.screenWidth/2 + CARD_WIDTH, self.pygameWrapper.screenHeight/4)
-        self.drawClick.displayAtCoords(self.pygameWrapper.screenWidth/2 - CARD_WIDTH, self.pygameWrapper.screenHeight/4)
-        self.unoButton.displayAtCoords(CARD_HEIGHT/2, CARD_WIDTH/2)
-
-        currentCard = 1 # Though the list starts at 0, the "physical" cards start at 1. There is no "0th" card in our 2D space.
-        for i in range(self.firstCard, self.lastCard):
-            card = self.cards[i]
-            if not card.clicked: # If the card is not clicked / dragged, then we just display at its proper coordinates
-                card.displayAtCoords((currentCard+1) * 64,  self.pygameWrapper.screenHeight - CARD_HEIGHT/2) # We add one so we have room for the left arrow
-            else: # But if it is being dragged, then display it where it currently is.
-                card.display()
-            currentCard += 1
+        for clickable in self.turnClickables:
+            if not clickable.clicked:
+                clickable.display()
+        if self.selected is not None:
+            self.selected.display() # But if a card is being dragged, then display it last where it currently is.
 
 
     ''' interfaceUser
@@ -867,60 +1632,66 @@ class UserInterface:
         self.updateUserState(player)
 
         while True:
-            mousePos = pygame.mouse.get_pos()
-            mouseButtons = pygame.mouse.get_pressed()
-            selected = None
+            self.pygameWrapper.updateInput() # Tick the frame clock and read the mouse
+            self.updateClickCooldown()
+            mousePos = self.pygameWrapper.mousePos
+            mouseButtons = self.pygameWrapper.mouseButtons # Held buttons, used for dragging
+            mousePressed = self.pygameWrapper.mousePressed # Buttons that just went down, used for clicking
+
+            # If we let go of a card, it goes back into the hand. That's a layout change!
+            if self.selected is not None and not mouseButtons[0]:
+                self.selected.clicked = False
+                self.selected = None
+                self.layoutChanged = True
+
+            if self.layoutChanged:
+                self.layoutTurn()
+
+            # One query a frame tells us what's under the mouse. A dragged card is skipped, so we can see what it's dropped on.
+            hovered = self.hitGrid.update(mousePos, self.selected)
+
+            if mousePressed[0] and self.handView.isCard(hovered) and self.selected is None: # This is drag and drop, and not selection.
+                self.selected = hovered
+                self.selected.clicked = True
 
-            for event in pygame.event.get(): # This is for external interactions, like movement or keys.
-                if event.type == pygame.QUIT: # pygame.QUIT is a windows exit / X button
-                    pygame.quit() # Clicking it should instantly shut down the game.
-                    sys.exit() # It's just much easier this way. Python shouldn't care; it has a garbage collect
+            if self.selected is not None:
+                self.selected.rectangle.center = mousePos # A dragged card follows the mouse
 
             # This sets a nice light blue background. We do this each frame to basically reset the screen.
             self.pygameWrapper.screen.fill((173, 216, 230))
             self.renderTurn() # This renders the display
-            pygame.display.flip() # This actually updates the display
-
-            # Yes, we do just go over all clickables and check O(n) for if they're selected. 
-            # This is fine! We don't have enough to care. More sophisticated mouse tracking would be a lot of unnecessary work. 
-            for i in range(self.firstCard, self.lastCard):
-                card = self.cards[i]
-                if card.isClicked(mouseButtons, mousePos) and selected is None: # This is drag and drop, and not selection.
-                    selected = card
-                    card.clicked = True
-                    card.rectangle.center = mousePos
-                # This elif is to give it another change to keep following if the mouse moves too fast.
-                elif card.isClicked(mouseButtons, mousePos) and selected is None: 
-                    card.rectangle.center = mousePos
-                    selected = card
-                else:
-                    card.clicked = False # This is so it's drag and drop, and not selection. Otherwise, it'd be very awkward!
+            self.pygameWrapper.present() # This actually updates the display
 
-            # This 'and not self.clickCooldown' logic isn't pretty, but we need it due to isClicked logic.
-            if self.leftArrow.isClicked(mouseButtons, mousePos) and not self.clickCooldown: 
-                self.firstCard -= int((self.pygameWrapper.screenWidth/64) - 2)
+            # The arrows go one page per click, since they only react to the mouse going down.
+            if mousePressed[0] and hovered is self.leftArrow: 
+                self.firstCard -= self.cardsPerRender
                 if self.firstCard < 0: 
                     self.firstCard = 0
                 self.updateLastCard(player)
-                self.turnOnClickCooldown()
+                self.updateCards(player)
+                self.layoutChanged = True
 
-            if self.rightArrow.isClicked(mouseButtons, mousePos) and not self.clickCooldown:
-                self.firstCard += int((self.pygameWrapper.screenWidth/64) - 2)
-                if self.firstCard >= len(self.cards): 
-                    self.firstCard = len(self.cards) - 1
+            if mousePressed[0] and hovered is self.rightArrow:
+                self.firstCard += self.cardsPerRender
+                if self.firstCard >= self.handSize: 
+                    self.firstCard = self.handSize - 1
                 self.updateLastCard(player)
-                self.turnOnClickCooldown()
+                self.updateCards(player)
+                self.layoutChanged = True
 
-            if self.unoButton.isClicked(mouseButtons, mousePos) and not self.clickCooldown: 
+            if mousePressed[0] and hovered is self.unoButton: 
                 return 0
             
-            if self.drawClick.isClicked(mouseButtons, mousePos) and not self.clickCooldown: 
+            if mousePressed[0] and hovered is self.drawClick and not self.clickCooldown: 
                 self.turnOnClickCooldown()
                 return 1
             
-            # If the discard pile is clicked, whilst a card is dragged on it, return the dragged card.
-            if self.discardClick.isClicked(mouseButtons, mousePos) and selected is not None:
-                return selected.clickedObject
+            # If the discard pile is under a dragged card, return the dragged card. The drop target comes out of the same query.
+            if self.selected is not None and self.hitGrid.isUnder(self.discardClick):
+                playedCard = self.selected.clickedObject
+                self.selected.clicked = False
+                self.selected = None
+                return playedCard
     
 
     ''' promptPlayCard
@@ -930,100 +1701,148 @@ class UserInterface:
         self.pygameWrapper.screen.fill((173, 216, 230)) # Baby blue :-)
 
         # The Card
-        playableCard = Clickable(CARD_WIDTH, CARD_HEIGHT, card, self.pygameWrapper.purpleBorder, self.pygameWrapper)
-        playableCard.addGraphic(self.pygameWrapper.getColor(card.color))
-        playableCard.addGraphic(self.pygameWrapper.getType(card.rank))
-        playableCard.displayAtCoords(self.pygameWrapper.screenWidth/2, self.pygameWrapper.screenHeight/2)
-
-        # The yes option
-        yes = Clickable(CARD_HEIGHT, CARD_WIDTH, None, None, self.pygameWrapper)
-        yes.addGraphic(self.pygameWrapper.yesImage)
-        yes.displayAtCoords(self.pygameWrapper.screenWidth/4, self.pygameWrapper.screenHeight/5 * 4)
-
-        # The no option
-        no = Clickable(CARD_HEIGHT, CARD_WIDTH, None, None, self.pygameWrapper)
-        no.addGraphic(self.pygameWrapper.noImage)
-        no.displayAtCoords(self.pygameWrapper.screenWidth/4*3, self.pygameWrapper.screenHeight/5 * 4)
-
-        # The caption asking "WOULD YOU LIKE TO PLAY THIS CARD?"
-        playCard = Clickable(BAR_WIDTH, CARD_HEIGHT, None, None, self.pygameWrapper)
-        playCard.addGraphic(self.pygameWrapper.playCardImage)
-        playCard.displayAtCoords(self.pygameWrapper.screenWidth/2, self.pygameWrapper.screenHeight/2 - CARD_HEIGHT)
-
-        pygame.display.flip() # Render it all nce, since we don't need to update it.
+        playableCard = self.handView.makeClickable(card)
+        playableCard.rectangle.center = self.playableCardCenter
+        playableCard.display()
+
+        # The yes option, the no option, and the caption asking "WOULD YOU LIKE TO PLAY THIS CARD?"
+        self.yesButton.display()
+        self.noButton.display()
+        self.playCardCaption.display()
+
+        self.pygameWrapper.present() # Render it all nce, since we don't need to update it.
         
         while True:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT: # pygame.QUIT is a windows exit / X button
-                    pygame.quit() # Clicking it should instantly shut down the game.
-                    sys.exit() # It's just much easier this way. Python shouldn't care; it has a garbage collect
-        
-            mousePos = pygame.mouse.get_pos()
-            mouseButtons = pygame.mouse.get_pressed()
+            self.pygameWrapper.updateInput() # Tick the frame clock and read the mouse
+            mousePos = self.pygameWrapper.mousePos
+            mousePressed = self.pygameWrapper.mousePressed
 
-            if yes.isClicked(mouseButtons, mousePos):
+            if self.yesButton.isClicked(mousePressed, mousePos):
                 return True # If yes is clicked, then we return yes (True)
 
-            if no.isClicked(mouseButtons, mousePos):
+            if self.noButton.isClicked(mousePressed, mousePos):
                 return False # If no is clicked, then we return no (False)
 
 
+    ''' choosePlayer
+        This asks the user to pick a player by typing their number, like choosing the dealer. It's used by house rules like 7-0.
+        It takes a prompt and the players' names, and returns the index of the name they picked.
+    '''
+    def choosePlayer(self, prompt, names):
+        choices = ", ".join(f"{index + 1}: {name}" for index, name in enumerate(names))
+        chosenPlayer = self.pygameWrapper.typingPrompt(f"{prompt} {choices} ")
+
+        # Keep asking until they type one of the numbers. No sneaking out of it!
+        while not chosenPlayer.isdigit() or not 1 <= int(chosenPlayer) <= len(names):
+            chosenPlayer = self.pygameWrapper.typingPrompt(f"Please type a number between 1 and {len(names)}. {choices} ")
+
+        return int(chosenPlayer) - 1
+
+
     ''' chooseColor
         This function shows the four colors of UNO, and asks the user to select one.
         It takes a prompt, as there are many reasons we may want the user to select a color.
     '''
     def chooseColor(self, prompt):
         # The prompt
-        promptSurface = self.pygameWrapper.font.render(prompt, self.pygameWrapper.font, (0,0,0))
-
-
-        # The four colors with borders because I'm nice!
-        redChoice = Clickable(CARD_WIDTH, CARD_HEIGHT, None, self.pygameWrapper.purpleBorder, self.pygameWrapper)
-        redChoice.addGraphic(self.pygameWrapper.redCardImage)
-        
-        greenChoice = Clickable(CARD_WIDTH, CARD_HEIGHT, None, self.pygameWrapper.purpleBorder, self.pygameWrapper)
-        greenChoice.addGraphic(self.pygameWrapper.greenCardImage)
-
-        blueChoice = Clickable(CARD_WIDTH, CARD_HEIGHT, None, self.pygameWrapper.purpleBorder, self.pygameWrapper)
-        blueChoice.addGraphic(self.pygameWrapper.blueCardImage)
-
-        yellowChoice = Clickable(CARD_WIDTH, CARD_HEIGHT, None, self.pygameWrapper.purpleBorder, self.pygameWrapper)
-        yellowChoice.addGraphic(self.pygameWrapper.yellowCardImage)
+        promptSurface = self.pygameWrapper.textRenderer.render(prompt)
+        promptPos = (self.pygameWrapper.screenWidth/2 - len(prompt)*4, self.colorPromptY)
 
         while True:
             self.pygameWrapper.screen.fill((173, 216, 230)) # Light blue, otherwise known as ral 6207, apparently.
 
             # Display the font
-            self.pygameWrapper.screen.blit(promptSurface, (self.pygameWrapper.screenWidth/2 - len(prompt)*4, self.pygameWrapper.screenHeight/2-CARD_HEIGHT))
+            self.pygameWrapper.screen.blit(promptSurface, promptPos)
             
             # Display the four colors!
-            redChoice.displayAtCoords(self.pygameWrapper.screenWidth/5, self.pygameWrapper.screenHeight/2)
-            greenChoice.displayAtCoords(self.pygameWrapper.screenWidth/5 * 2, self.pygameWrapper.screenHeight/2)
-            blueChoice.displayAtCoords(self.pygameWrapper.screenWidth/5 * 3, self.pygameWrapper.screenHeight/2)
-            yellowChoice.displayAtCoords(self.pygameWrapper.screenWidth/5 * 4, self.pygameWrapper.screenHeight/2)
+            for colorChoice in self.colorChoices:
+                colorChoice.display()
 
-            mousePos = pygame.mouse.get_pos()
-            mouseButtons = pygame.mouse.get_pressed()
-
-            for event in pygame.event.get(): # This is for external interactions, like movement or keys.
-                if event.type == pygame.QUIT: # pygame.QUIT is a windows exit / X button
-                    pygame.quit() # Clicking it should instantly shut down the game.
-                    sys.exit() # It's just much easier this way. Python shouldn't care; it has a garbage collect
+            self.pygameWrapper.updateInput() # Tick the frame clock and read the mouse
+            mousePos = self.pygameWrapper.mousePos
+            mousePressed = self.pygameWrapper.mousePressed
 
             # If the user selects a color, return that color!
-            if redChoice.isClicked(mouseButtons, mousePos):
-                return 'Red'
-
-            if greenChoice.isClicked(mouseButtons, mousePos):
-                return 'Green'
+            for colorChoice in self.colorChoices:
+                if colorChoice.isClicked(mousePressed, mousePos):
+                    return colorChoice.clickedObject
 
-            if blueChoice.isClicked(mouseButtons, mousePos):
-                return 'Blue'
+            self.pygameWrapper.present()
 
-            if yellowChoice.isClicked(mouseButtons, mousePos):
-                return 'Yellow' 
 
-            pygame.display.flip()
+    ''' renderState
+        This renders a snapshot of the game (from GameState.snapshot) as a view of the table: the piles, and every player's hand size.
+        It's what we show in between the user's turns, like while the A.I's are playing.
+        Big tables don't fit on the screen, so we only show as many players as fit, around the current player.
+    '''
+    def renderState(self, snapshot):
+        self.pygameWrapper.screen.fill((173, 216, 230)) # Our trusty light blue
+
+        if snapshot is None:
+            return # Nothing has happened yet, so there's nothing to show!
+
+        # The top card of the discard pile, and the draw pile, right where they are in a turn.
+        if snapshot["topCard"] is not None:
+            color, rank = snapshot["topCard"]
+            self.pygameWrapper.screen.blit(self.pygameWrapper.getColor(color), self.discardClick.rectangle)
+            self.pygameWrapper.screen.blit(self.pygameWrapper.getType(rank), self.discardClick.rectangle)
+        if snapshot["drawPileSize"] > 0:
+            self.pygameWrapper.screen.blit(self.pygameWrapper.cardTopImage, self.drawClick.rectangle)
+
+        # Then a line for the round, and a line for each player. The current player gets an arrow.
+        textRenderer = self.pygameWrapper.textRenderer
+        direction = "clockwise" if snapshot["direction"] == 1 else "counter-clockwise"
+        self.pygameWrapper.screen.blit(textRenderer.render(f"Round {snapshot['round']}, play goes {direction}"), (0, 0))
+
+        players = snapshot["players"]
+        firstSeat = snapshot["firstSeat"]
+        fits = self.pygameWrapper.screenHeight // textRenderer.glyphHeight - 2 - HUD_LINES # Lines left under the round line
+        if len(players) > fits:
+            # Not even the snapshot's players fit, so cut it down to the ones around the current player.
+            start = max(0, min(snapshot["currentPlayerIndex"] - firstSeat - fits // 2, len(players) - fits))
+            players = players[start:start + fits]
+            firstSeat += start
+        if len(players) < snapshot["numPlayers"]:
+            line = f"Seats {firstSeat + 1} to {firstSeat + len(players)} of {snapshot['numPlayers']}"
+            self.pygameWrapper.screen.blit(textRenderer.render(line), (0, textRenderer.glyphHeight))
+
+        currentLine = 2
+        currentPlayer = firstSeat
+        for name, handSize, points in players:
+            marker = ">" if currentPlayer == snapshot["currentPlayerIndex"] else " "
+            line = f"{marker} {name}: {handSize} cards, {points} points"
+            self.pygameWrapper.screen.blit(textRenderer.render(line), (0, currentLine * textRenderer.glyphHeight))
+            currentLine += 1
+            currentPlayer += 1
+
+
+    ''' renderSpectatorHud
+        Draws the spectator readout along the bottom of the screen: the speed, how fast games are going, and the last message.
+        Call it after .renderState, since that clears the screen.
+    '''
+    def renderSpectatorHud(self, speedLabel, turnsPerSecond, gamesPerSecond, gamesPlayed, message):
+        textRenderer = self.pygameWrapper.textRenderer
+        lines = [
+            f"Speed: {speedLabel} (Left/Right to change, Esc to stop)",
+            f"{turnsPerSecond:.1f} turns/s, {gamesPerSecond:.2f} games/s, {gamesPlayed} games played",
+        ]
+        if message:
+            lines.insert(0, message)
+
+        # Lines go from the bottom up, so the readout never covers the players.
+        y = self.pygameWrapper.screenHeight - len(lines) * textRenderer.glyphHeight
+        for line in lines:
+            self.pygameWrapper.screen.blit(textRenderer.render(line), (0, y))
+            y += textRenderer.glyphHeight
+
+
+    ''' showState
+        Takes the game state, and shows a single frame of it with .renderState. The game calls this after every turn.
+    '''
+    def showState(self, gameState):
+        self.pygameWrapper.updateInput() # Keeps the window responding while the game runs
+        self.renderState(gameState.snapshot())
+        self.pygameWrapper.present()
 
 
 